@@ -0,0 +1,167 @@
+"""
+Client side of the DentaSys server
+use_server() swaps each operation in api.protocol.OPERATIONS for a call to
+the server, so the GUI keeps using the models as before while the database
+stays with the server process. Anything not in OPERATIONS that would open
+the database raises instead of quietly touching a local file
+"""
+import http.client
+import os
+import select
+import socket
+import threading
+from urllib.parse import urlsplit
+
+from api import protocol
+from database import connection
+
+SERVER_ENV = 'DENTASYS_SERVER'
+TOKEN_ENV = 'DENTASYS_TOKEN'
+
+
+class RemoteError(Exception):
+    """An unexpected error raised by the server while running an operation"""
+
+    def __init__(self, kind, message):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+
+
+class ApiClient:
+    """Calls operations on a DentaSys server; one keep-alive connection per thread"""
+
+    def __init__(self, url, token=None, timeout=60):
+        parts = urlsplit(url if '://' in url else f"http://{url}")
+        if parts.scheme != 'http':
+            raise ValueError(f"Unsupported server address: {url}")
+        self.url = f"http://{parts.hostname}:{parts.port or protocol.DEFAULT_PORT}"
+        self.host = parts.hostname
+        self.port = parts.port or protocol.DEFAULT_PORT
+        self.token = token
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None and closed_by_server(conn):
+            self.close()
+            conn = None
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def request(self, method, path, body=b'', retry=False, resend=True):
+        """(status, decoded body), reconnecting once if the connection breaks.
+
+        A request that could not be sent is always sent again on a new
+        connection. One that was sent but got no answer is only sent again
+        with retry set, since the server may already have run it.
+        """
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        sent = False
+        try:
+            conn = self.connection()
+            conn.request(method, path, body=body, headers=headers)
+            sent = True
+            response = conn.getresponse()
+            data = response.read()
+        except (ConnectionError, http.client.HTTPException):
+            self.close()
+            if not resend or (sent and not retry):
+                raise
+            return self.request(method, path, body, resend=False)
+        return response.status, protocol.loads(data) if data else {}
+
+    def health(self):
+        status, data = self.request('GET', '/health', retry=True)
+        if status != 200:
+            raise RemoteError('HttpError', data.get('error', {}).get('message', status))
+        return data
+
+    def call(self, name, args=(), kwargs=None, target=None):
+        """Run an operation; returns (result, state of target after the call)"""
+        payload = {'args': list(args), 'kwargs': kwargs or {}}
+        if target is not None:
+            payload['self'] = target
+        # Only reads are resent: a write may have run before the connection broke
+        status, data = self.request('POST', f"/api/{name}", protocol.dumps(payload),
+                                    retry=protocol.OPERATIONS[name][2] == protocol.READ)
+        if status != 200:
+            error = data.get('error', {})
+            if error.get('type') == 'ValueError':
+                raise ValueError(error.get('message'))
+            raise RemoteError(error.get('type', f"HTTP {status}"), error.get('message', ''))
+        return data.get('result'), data.get('self')
+
+
+def closed_by_server(conn):
+    """True if the server has closed this idle kept-alive connection (a restart, say)"""
+    if conn.sock is None:
+        return False
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+        # Nothing is pending on an idle connection; readable means end of stream or a reset
+        return bool(readable) and conn.sock.recv(1, socket.MSG_PEEK) == b''
+    except OSError:
+        return True
+
+
+_client = None
+_originals = {}
+
+
+def _stub(client, name, instance):
+    if instance:
+        def method(self, *args, **kwargs):
+            result, state = client.call(name, args, kwargs, target=self)
+            self.__dict__.update(state or {})
+            return result
+        return method
+
+    def function(*args, **kwargs):
+        return client.call(name, args, kwargs)[0]
+    return function
+
+
+def use_server(url=None, token=None):
+    """Send every model operation to the server at url and stop opening the database file"""
+    global _client
+    url = url or os.environ.get(SERVER_ENV)
+    if not url:
+        raise ValueError("No server address given")
+    client = ApiClient(url, token or os.environ.get(TOKEN_ENV))
+    client.health()  # fail now, not on the first click
+
+    disconnect()
+    for name in protocol.OPERATIONS:
+        owner, attribute, instance = protocol.resolve(name)
+        original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+        _originals[name] = (owner, attribute, original)
+        stub = _stub(client, name, instance)
+        if isinstance(owner, type) and not instance:
+            stub = classmethod(lambda cls, *args, _stub=stub, **kwargs: _stub(*args, **kwargs))
+        setattr(owner, attribute, stub)
+    connection.REMOTE = client.url
+    _client = client
+    return client
+
+
+def disconnect():
+    """Go back to opening the database directly"""
+    global _client
+    for owner, attribute, original in _originals.values():
+        setattr(owner, attribute, original)
+    _originals.clear()
+    connection.REMOTE = None
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -0,0 +1,167 @@
+"""
+Wire protocol shared by the DentaSys server and its clients
+Every operation the server offers is listed in OPERATIONS with whether it
+reads or writes. Arguments and results travel as JSON; money, dates and the
+model objects are tagged so each side gets back the same Python types
+"""
+import importlib
+import inspect
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from models.money import Money
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+READ = 'read'
+WRITE = 'write'
+
+# name: (module, attribute path, kind). Instance methods are sent with the
+# object they are called on and the server returns it as the call left it.
+OPERATIONS = {
+    'Doctor.create': ('models.doctor', 'Doctor.create', WRITE),
+    'Doctor.update': ('models.doctor', 'Doctor.update', WRITE),
+    'Doctor.delete': ('models.doctor', 'Doctor.delete', WRITE),
+    'Doctor.soft_delete': ('models.doctor', 'Doctor.soft_delete', WRITE),
+    'Doctor.get_by_id': ('models.doctor', 'Doctor.get_by_id', READ),
+    'Doctor.get_all': ('models.doctor', 'Doctor.get_all', READ),
+    'Doctor.get_by_phone': ('models.doctor', 'Doctor.get_by_phone', READ),
+    'Doctor.search': ('models.doctor', 'Doctor.search', READ),
+    'Doctor.search_prefix': ('models.doctor', 'Doctor.search_prefix', READ),
+    'Doctor.doctor_has_records': ('models.doctor', 'Doctor.doctor_has_records', READ),
+    'Doctor.records': ('models.doctor', 'Doctor.records', READ),
+    'Doctor.treatments': ('models.doctor', 'Doctor.treatments', READ),
+    'Doctor.payments': ('models.doctor', 'Doctor.payments', READ),
+
+    'Patient.create': ('models.patient', 'Patient.create', WRITE),
+    'Patient.update': ('models.patient', 'Patient.update', WRITE),
+    'Patient.delete': ('models.patient', 'Patient.delete', WRITE),
+    'Patient.soft_delete': ('models.patient', 'Patient.soft_delete', WRITE),
+    'Patient.get_by_id': ('models.patient', 'Patient.get_by_id', READ),
+    'Patient.get_all': ('models.patient', 'Patient.get_all', READ),
+    'Patient.get_by_phone': ('models.patient', 'Patient.get_by_phone', READ),
+    'Patient.search': ('models.patient', 'Patient.search', READ),
+    'Patient.search_prefix': ('models.patient', 'Patient.search_prefix', READ),
+    'Patient.find_duplicates': ('models.patient', 'Patient.find_duplicates', READ),
+    'Patient.patient_has_records': ('models.patient', 'Patient.patient_has_records', READ),
+    'Patient.records': ('models.patient', 'Patient.records', READ),
+    'Patient.treatments': ('models.patient', 'Patient.treatments', READ),
+    'Patient.payments': ('models.patient', 'Patient.payments', READ),
+
+    'Record.create': ('models.record', 'Record.create', WRITE),
+    'Record.delete': ('models.record', 'Record.delete', WRITE),
+    'Record.get_by_id': ('models.record', 'Record.get_by_id', READ),
+    'Record.get_all': ('models.record', 'Record.get_all', READ),
+    'Record.get_archived': ('models.record', 'Record.get_archived', READ),
+    'Record.get_by_doctor': ('models.record', 'Record.get_by_doctor', READ),
+    'Record.get_by_patient': ('models.record', 'Record.get_by_patient', READ),
+    'Record.record_has_payments': ('models.record', 'Record.record_has_payments', READ),
+    'Record.record_has_treatments': ('models.record', 'Record.record_has_treatments', READ),
+    'Record.treatments': ('models.record', 'Record.treatments', READ),
+    'Record.payments': ('models.record', 'Record.payments', READ),
+    'Record._sum': ('models.record', 'Record._sum', READ),
+
+    'Treatment.create': ('models.treatment', 'Treatment.create', WRITE),
+    'Treatment.update': ('models.treatment', 'Treatment.update', WRITE),
+    'Treatment.delete': ('models.treatment', 'Treatment.delete', WRITE),
+    'Treatment.get_by_id': ('models.treatment', 'Treatment.get_by_id', READ),
+    'Treatment.get_by_record': ('models.treatment', 'Treatment.get_by_record', READ),
+
+    'Payment.create': ('models.payment', 'Payment.create', WRITE),
+    'Payment.update': ('models.payment', 'Payment.update', WRITE),
+    'Payment.delete': ('models.payment', 'Payment.delete', WRITE),
+    'Payment.get_by_id': ('models.payment', 'Payment.get_by_id', READ),
+    'Payment.get_by_record': ('models.payment', 'Payment.get_by_record', READ),
+
+    'RecordSnapshot.load': ('models.record_snapshot', 'RecordSnapshot.load', READ),
+    'RecordSnapshot.load_summary': ('models.record_snapshot', 'RecordSnapshot.load_summary', READ),
+    'RecordSnapshot._fetch_page': ('models.record_snapshot', 'RecordSnapshot._fetch_page', READ),
+    'Ledger.load': ('models.ledger', 'Ledger.load', READ),
+    'Ledger.fetch': ('models.ledger', 'Ledger.fetch', READ),
+
+    'financial.revenue': ('reports.financial', 'revenue', READ),
+    'financial.summary': ('reports.financial', 'summary', READ),
+    'financial.rebuild': ('reports.financial', 'rebuild', WRITE),
+    'aging.aging': ('reports.aging', 'aging', READ),
+    'aging.summary': ('reports.aging', 'summary', READ),
+    'batch_export.select_records': ('reports.batch_export', 'select_records', READ),
+    'batch_export.prefetch': ('reports.batch_export', 'prefetch', READ),
+}
+
+# Classes whose objects may cross the wire, by name
+TYPES = {
+    'Doctor': 'models.doctor',
+    'Patient': 'models.patient',
+    'Record': 'models.record',
+    'Treatment': 'models.treatment',
+    'Payment': 'models.payment',
+    'RecordSnapshot': 'models.record_snapshot',
+    'Ledger': 'models.ledger',
+    'LedgerEntry': 'models.ledger',
+    'RevenueRow': 'reports.financial',
+    'AgingRow': 'reports.aging',
+    'AgingSummary': 'reports.aging',
+}
+
+
+def resolve(name):
+    """(owner, attribute name, is instance method) for an operation"""
+    module_name, path, kind = OPERATIONS[name]
+    owner = importlib.import_module(module_name)
+    *parents, attribute = path.split('.')
+    for parent in parents:
+        owner = getattr(owner, parent)
+    method = inspect.getattr_static(owner, attribute)
+    return owner, attribute, inspect.isclass(owner) and inspect.isfunction(method)
+
+
+def _type(name):
+    if name not in TYPES:
+        raise ValueError(f"Unknown type on the wire: {name}")
+    return getattr(importlib.import_module(TYPES[name]), name)
+
+
+def _default(value):
+    if isinstance(value, Money):
+        return {'$money': value.cents}
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'$decimal': str(value)}
+    if isinstance(value, type) and value.__name__ in TYPES and value is _type(value.__name__):
+        return {'$class': value.__name__}
+    name = type(value).__name__
+    if name in TYPES and type(value) is _type(name):
+        return {'$object': name, 'state': vars(value)}
+    raise TypeError(f"{name} cannot be sent to the server")
+
+
+def _object_hook(data):
+    if '$money' in data:
+        return Money(data['$money'])
+    if '$datetime' in data:
+        return datetime.fromisoformat(data['$datetime'])
+    if '$date' in data:
+        return date.fromisoformat(data['$date'])
+    if '$decimal' in data:
+        return Decimal(data['$decimal'])
+    if '$class' in data:
+        return _type(data['$class'])
+    if '$object' in data:
+        cls = _type(data['$object'])
+        obj = cls.__new__(cls)
+        obj.__dict__.update(data['state'])
+        return obj
+    return data
+
+
+def dumps(value):
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    return json.loads(data, object_hook=_object_hook)
@@ -0,0 +1,236 @@
+"""
+DentaSys database server
+One process owns the clinic database and serves the model operations over
+HTTP/JSON, so several front-desk PCs can work at once without sharing the
+SQLite file over the network. Reads run on a small pool of threads; writes
+go through a single queue and run one at a time on one thread, so clients
+never contend for the write lock. Started with "cli.py serve"
+"""
+import asyncio
+import hmac
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+from api import protocol
+
+MAX_BODY = 16 * 1024 * 1024
+MAX_HEADERS = 100
+
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    def __init__(self, method, path, headers, body):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self):
+        return self.headers.get('connection', '').lower() != 'close'
+
+
+async def read_request(reader):
+    """Next request on the connection, or None when the client has closed it"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HttpError(400, "Too many headers")
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HttpError(400, "Bad Content-Length")
+    if length > MAX_BODY:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b''
+    return Request(method, unquote(target.split('?', 1)[0]), headers, body)
+
+
+def write_response(writer, status, body, keep_alive=True):
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+    )
+
+
+def error_body(error):
+    return protocol.dumps({'error': {'type': type(error).__name__, 'message': str(error)}})
+
+
+def execute(name, body):
+    """Run one operation from a request body; returns the encoded response body"""
+    owner, attribute, instance = protocol.resolve(name)
+    payload = protocol.loads(body) if body else {}
+    args = payload.get('args', [])
+    kwargs = payload.get('kwargs', {})
+    if instance:
+        target = payload.get('self')
+        if not isinstance(target, owner):
+            raise ValueError(f"{name} needs the {owner.__name__} it is called on")
+        result = getattr(target, attribute)(*args, **kwargs)
+        return protocol.dumps({'result': result, 'self': vars(target)})
+    return protocol.dumps({'result': getattr(owner, attribute)(*args, **kwargs)})
+
+
+class ApiServer:
+    """HTTP/JSON front end for the operations in api.protocol.OPERATIONS"""
+
+    def __init__(self, host=protocol.DEFAULT_HOST, port=protocol.DEFAULT_PORT, readers=4, token=None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='dentasys-read')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dentasys-write')
+        self.write_queue = None
+        self.writer_task = None
+        self.server = None
+
+    async def start(self):
+        self.write_queue = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self.write_loop())
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.writer_task:
+            self.writer_task.cancel()
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"DentaSys server listening on http://{self.host}:{self.port}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def write_loop(self):
+        """Run queued writes one after another on the writer thread"""
+        loop = asyncio.get_running_loop()
+        while True:
+            call, future = await self.write_queue.get()
+            result = await loop.run_in_executor(self.writer, call)
+            if not future.done():
+                future.set_result(result)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as e:
+                    write_response(writer, e.status, error_body(e), keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                status, body = await self.dispatch(request)
+                write_response(writer, status, body, request.keep_alive)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def authorized(self, request):
+        if not self.token:
+            return True
+        return hmac.compare_digest(request.headers.get('authorization', ''), f"Bearer {self.token}")
+
+    async def dispatch(self, request):
+        """(status, body) for a request"""
+        if not self.authorized(request):
+            return 401, error_body(HttpError(401, "Missing or wrong token"))
+        if request.path == '/health':
+            return 200, protocol.dumps({'status': 'ok'})
+
+        prefix = '/api/'
+        name = request.path[len(prefix):] if request.path.startswith(prefix) else None
+        if name not in protocol.OPERATIONS:
+            return 404, error_body(HttpError(404, f"Unknown operation: {request.path}"))
+        if request.method != 'POST':
+            return 405, error_body(HttpError(405, "Operations are called with POST"))
+
+        def call():
+            # Errors become responses on the thread that raised them. Passed on
+            # through the futures, the traceback would keep the failed cursor, and
+            # with it the write lock, alive until the next garbage collection.
+            try:
+                return 200, execute(name, request.body)
+            except ValueError as e:
+                # What the models raise for bad input; the client raises it again as is
+                return 400, error_body(e)
+            except Exception as e:
+                traceback.print_exc()
+                return 500, error_body(e)
+
+        loop = asyncio.get_running_loop()
+        if protocol.OPERATIONS[name][2] == protocol.WRITE:
+            future = loop.create_future()
+            await self.write_queue.put((call, future))
+            return await future
+        return await loop.run_in_executor(self.readers, call)
+
+
+def prepare_database():
+    """Bring the database up to date and switch it to WAL, so reads never wait on the writer"""
+    from database import connection
+    from database.schema import create_schema
+    from models.helper import register_converters
+
+    register_converters()
+    create_schema()
+    conn = connection.get_db_connection()
+    try:
+        conn.execute("PRAGMA journal_mode = wal")
+    finally:
+        conn.close()
+
+
+def run_server(host=protocol.DEFAULT_HOST, port=protocol.DEFAULT_PORT, readers=4, token=None, backups=True):
+    """Serve until interrupted; takes the scheduled backups the GUI would otherwise take"""
+    from database.backup import BackupScheduler
+
+    prepare_database()
+    scheduler = BackupScheduler() if backups else None
+    if scheduler:
+        scheduler.start()
+    try:
+        asyncio.run(ApiServer(host, port, readers, token).serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if scheduler:
+            scheduler.stop()
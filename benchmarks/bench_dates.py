@@ -0,0 +1,117 @@
+"""
+Date parsing micro-benchmark for DentaSys
+Compares the strptime-based helpers with the fromisoformat + memo layer in
+models.helper, both on plain strings and on rows read through sqlite3 converters
+"""
+import argparse
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from models import helper
+
+
+def strptime_date_time(value):
+    """The original handle_date_time parser, kept here as the baseline"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    except (ValueError, TypeError):
+        return None
+
+
+def strptime_date(value):
+    """The original handle_date parser, kept here as the baseline"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return None
+
+
+def generate_values(rows, seed=42, days=3 * 365):
+    """Date and timestamp strings shaped like a clinic's treatments table"""
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1, 8, 0, 0)
+    dates = []
+    timestamps = []
+    for _ in range(rows):
+        moment = start + timedelta(days=rng.randrange(days), seconds=rng.randrange(10 * 3600))
+        dates.append(moment.date().isoformat())
+        timestamps.append(moment.isoformat(" "))
+    return dates, timestamps
+
+
+def timed(label, func, values):
+    helper.parse_date.cache_clear()
+    t0 = time.perf_counter()
+    parsed = sum(1 for value in values if func(value) is not None)
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:<38} {elapsed:8.3f}s  {len(values) / elapsed:12,.0f} rows/s  ({parsed:,} parsed)")
+    return elapsed
+
+
+def bench_strings(dates, timestamps):
+    print("Parsing strings")
+    results = {
+        'strptime date': timed('strptime date', strptime_date, dates),
+        'fromisoformat date': timed('fromisoformat date', helper.parse_date.__wrapped__, dates),
+        'handle_date (memoized)': timed('handle_date (memoized)', helper.handle_date, dates),
+        'strptime datetime': timed('strptime datetime', strptime_date_time, timestamps),
+        'fromisoformat datetime': timed('fromisoformat datetime', helper.parse_date_time, timestamps),
+        'handle_date_time': timed('handle_date_time', helper.handle_date_time, timestamps),
+    }
+    print(f"  date speedup:     {results['strptime date'] / results['handle_date (memoized)']:.1f}x")
+    print(f"  datetime speedup: {results['strptime datetime'] / results['handle_date_time']:.1f}x")
+
+    # Variants the strptime helpers rejected
+    for value in ("2024-03-05T10:15:00", "2024-03-05 10:15:00.123456", "2024-03-05 10:15:00"):
+        print(f"  {value!r:<32} strptime={strptime_date(value)!s:<10} handle_date={helper.handle_date(value)}")
+
+
+def bench_rows(dates, timestamps):
+    print("Reading rows through sqlite3")
+    helper.register_converters()
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE sample (d DATE, ts DATETIME)")
+    conn.executemany("INSERT INTO sample VALUES (?, ?)", zip(dates, timestamps))
+    conn.commit()
+
+    t0 = time.perf_counter()
+    for d, ts in conn.execute("SELECT d, ts FROM sample"):
+        strptime_date(d)
+        strptime_date_time(ts)
+    untyped = time.perf_counter() - t0
+    print(f"  {'text rows + strptime':<38} {untyped:8.3f}s")
+    conn.close()
+
+    # A second connection on the same data, this time with converters enabled
+    typed_conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+    typed_conn.execute("CREATE TABLE sample (d DATE, ts DATETIME)")
+    typed_conn.executemany("INSERT INTO sample VALUES (?, ?)", zip(dates, timestamps))
+    typed_conn.commit()
+    helper.parse_date.cache_clear()
+
+    t0 = time.perf_counter()
+    for d, ts in typed_conn.execute("SELECT d, ts FROM sample"):
+        helper.handle_date(d)
+        helper.handle_date_time(ts)
+    typed = time.perf_counter() - t0
+    print(f"  {'typed rows (registered converters)':<38} {typed:8.3f}s  ({untyped / typed:.1f}x)")
+    typed_conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DentaSys date parsing")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Number of generated rows")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    dates, timestamps = generate_values(args.rows, args.seed)
+    print(f"{args.rows:,} rows, {len(set(dates)):,} distinct dates, {len(set(timestamps)):,} distinct timestamps")
+    bench_strings(dates, timestamps)
+    bench_rows(dates, timestamps)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
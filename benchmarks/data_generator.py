@@ -0,0 +1,288 @@
+"""
+Synthetic data generator for DentaSys benchmarks
+Builds reproducible databases with English and Arabic names, phones, records,
+treatments and payments at 1k/10k/100k/1M patient scale
+"""
+import argparse
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from database.migrations import LATEST_VERSION, migrate, set_version
+from database.schema import POST_MIGRATION_SQL, SCHEMA_SQL
+from models.helper import normalize_phone
+
+DATA_DIR = Path(__file__).parent / "data"
+
+SCALES = {
+    '1k': 1_000,
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+ENGLISH_FIRST_NAMES = [
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda',
+    'William', 'Elizabeth', 'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+    'Thomas', 'Sarah', 'Charles', 'Karen', 'Daniel', 'Nancy', 'Matthew', 'Lisa',
+    'Anthony', 'Betty', 'Mark', 'Margaret', 'Steven', 'Sandra', 'Paul', 'Ashley',
+    'Andrew', 'Emily', 'Joshua', 'Donna', 'Kevin', 'Michelle', 'Brian', 'Carol',
+]
+ENGLISH_LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+    'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Thomas',
+    'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Thompson', 'White', 'Harris',
+    'Clark', 'Lewis', 'Robinson', 'Walker', 'Young', 'Allen', 'King', 'Wright',
+    'Scott', 'Green', 'Baker', 'Adams', 'Nelson', 'Hill', 'Campbell', 'Mitchell', 'Carter',
+]
+ARABIC_FIRST_NAMES = [
+    'محمد', 'أحمد', 'علي', 'عمر', 'خالد', 'يوسف', 'إبراهيم', 'حسن', 'حسين', 'سامر',
+    'فاطمة', 'عائشة', 'مريم', 'زينب', 'نور', 'سارة', 'ليلى', 'هدى', 'رنا', 'ريم',
+    'عبدالله', 'مصطفى', 'طارق', 'ماجد', 'وليد', 'بشار', 'نادر', 'رامي', 'كريم', 'فراس',
+    'سلمى', 'دينا', 'لمى', 'جنى', 'هبة', 'رهف', 'تسنيم', 'آية', 'بتول', 'شهد',
+]
+ARABIC_LAST_NAMES = [
+    'الأحمد', 'الخطيب', 'النجار', 'الحداد', 'العلي', 'الحسن', 'السيد', 'الشامي',
+    'المصري', 'الحلبي', 'الزعبي', 'العمر', 'الخليل', 'القاسم', 'الحمصي', 'الدمشقي',
+    'الكردي', 'التركماني', 'الحسيني', 'العباسي', 'البيطار', 'الصباغ', 'الجابر', 'المحمد',
+    'الإبراهيم', 'الناصر', 'الرفاعي', 'الحموي', 'السعدي', 'الطويل', 'القادري', 'المالكي',
+    'الحكيم', 'الشريف', 'العطار', 'الفارس', 'الموسى', 'اليوسف', 'الحجار', 'الديري',
+]
+
+TREATMENTS = [
+    ('Cleaning', 40, 80), ('Filling', 60, 150), ('Root Canal', 250, 700),
+    ('Extraction', 50, 200), ('Crown', 400, 1200), ('Bridge', 800, 2500),
+    ('Implant', 1200, 3500), ('Whitening', 150, 400), ('Braces Adjustment', 60, 120),
+    ('X-Ray', 20, 60), ('Veneer', 500, 1300), ('Scaling', 50, 120),
+    ('تنظيف', 40, 80), ('حشوة', 60, 150), ('معالجة لبية', 250, 700),
+    ('قلع', 50, 200), ('تاج', 400, 1200), ('تقويم', 60, 120),
+]
+
+PHONE_FORMATS = [
+    "09{0:02d} {1:03d} {2:03d}",
+    "+963 9{0:02d} {1:03d} {2:03d}",
+    "09{0:02d}-{1:03d}-{2:03d}",
+    "(09{0:02d}) {1:03d}{2:03d}",
+    "09{0:02d}{1:03d}{2:03d}",
+]
+
+HISTORY_DAYS = 5 * 365
+
+
+def scale_size(scale):
+    """Resolve a scale name ('10k') or an integer string to a patient count"""
+    if str(scale).lower() in SCALES:
+        return SCALES[str(scale).lower()]
+    return int(scale)
+
+
+def default_path(scale):
+    """Default location of the generated database for a scale"""
+    return DATA_DIR / f"bench_{str(scale).lower()}.db"
+
+
+def unique_name(index, first_names, last_names):
+    """Build a deterministic unique 'first father last' name for an index"""
+    combos = len(first_names) * len(first_names) * len(last_names)
+    cycle, position = divmod(index, combos)
+    first = first_names[position % len(first_names)]
+    position //= len(first_names)
+    father = first_names[position % len(first_names)]
+    last = last_names[position // len(first_names)]
+    name = f"{first} {father} {last}"
+    if cycle:
+        name += f" {cycle + 1}"
+    return name
+
+
+def person_name(index):
+    """Alternate English and Arabic names"""
+    if index % 2:
+        return unique_name(index // 2, ARABIC_FIRST_NAMES, ARABIC_LAST_NAMES)
+    return unique_name(index // 2, ENGLISH_FIRST_NAMES, ENGLISH_LAST_NAMES)
+
+
+def phone_number(index, rng):
+    """Unique phone number for an index, written in one of several local formats"""
+    # Spread indexes over the number space so consecutive patients look unrelated
+    number = (index * 7_919_251 + 12_345) % 100_000_000
+    fmt = rng.choice(PHONE_FORMATS)
+    return fmt.format(number // 1_000_000, (number // 1_000) % 1_000, number % 1_000)
+
+
+def timestamp(start, rng, max_days=HISTORY_DAYS):
+    """Random DATETIME string within max_days after start"""
+    moment = start + timedelta(days=rng.randrange(max_days), seconds=rng.randrange(86_400))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def entry_date(opened, rng, today):
+    """Random DATE string within a year after opened, never later than today"""
+    return min((opened + timedelta(days=rng.randrange(365))).date(), today).strftime("%Y-%m-%d")
+
+
+def generate_database(path, scale, seed=42, records_per_patient=1.2,
+                      treatments_per_record=3, payments_per_record=2):
+    """Generate a benchmark database at path and return row counts"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+
+    rng = random.Random(seed)
+    patient_count = scale_size(scale)
+    doctor_count = max(5, patient_count // 200)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=HISTORY_DAYS)
+    today = start.date() + timedelta(days=HISTORY_DAYS)
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA_SQL)
+        set_version(conn, LATEST_VERSION)
+        conn.executescript(POST_MIGRATION_SQL)
+
+        def doctors():
+            for i in range(doctor_count):
+                phone = phone_number(patient_count + i, rng)
+                yield i + 1, f"Dr. {person_name(i)}", phone, normalize_phone(phone), timestamp(start, rng, 30)
+
+        conn.executemany(
+            "INSERT INTO doctors (id, name, phone, phone_normalized, created_at) VALUES (?, ?, ?, ?, ?)",
+            doctors()
+        )
+
+        def patients():
+            for i in range(patient_count):
+                birth = datetime(1940, 1, 1) + timedelta(days=rng.randrange(80 * 365))
+                phone = phone_number(i, rng)
+                yield (
+                    i + 1,
+                    person_name(i),
+                    phone,
+                    normalize_phone(phone),
+                    'Female' if rng.random() < 0.5 else 'Male',
+                    birth.strftime("%Y-%m-%d") if rng.random() < 0.8 else None,
+                    'Allergic to penicillin' if rng.random() < 0.05 else None,
+                    timestamp(start, rng),
+                )
+
+        conn.executemany(
+            """INSERT INTO patients (id, name, phone, phone_normalized, gender, birth_date, notes, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            patients()
+        )
+
+        record_count = int(patient_count * records_per_patient)
+        pairs = set()
+        records = []
+        while len(records) < record_count:
+            pair = (rng.randrange(doctor_count) + 1, rng.randrange(patient_count) + 1)
+            if pair in pairs:
+                continue
+            pairs.add(pair)
+            records.append((len(records) + 1, pair[0], pair[1], timestamp(start, rng)))
+        conn.executemany(
+            "INSERT INTO records (id, doctor_id, patient_id, created_at) VALUES (?, ?, ?, ?)",
+            records
+        )
+
+        totals = {'treatments': 0, 'payments': 0}
+
+        def treatments():
+            for record_id, _, _, created_at in records:
+                opened = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
+                for _ in range(rng.randint(0, treatments_per_record * 2)):
+                    name, low, high = rng.choice(TREATMENTS)
+                    totals['treatments'] += 1
+                    yield (
+                        record_id,
+                        name,
+                        round(rng.uniform(low, high) * 100),  # cents
+                        entry_date(opened, rng, today),
+                        None,
+                    )
+
+        conn.executemany(
+            "INSERT INTO treatments (record_id, name, cost, date, notes) VALUES (?, ?, ?, ?, ?)",
+            treatments()
+        )
+
+        def payments():
+            for record_id, _, _, created_at in records:
+                opened = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
+                for _ in range(rng.randint(0, payments_per_record * 2)):
+                    totals['payments'] += 1
+                    yield (
+                        record_id,
+                        round(rng.uniform(20, 800) * 100),  # cents
+                        entry_date(opened, rng, today),
+                        'Cash' if rng.random() < 0.7 else 'Card',
+                    )
+
+        conn.executemany(
+            "INSERT INTO payments (record_id, amount, date, notes) VALUES (?, ?, ?, ?)",
+            payments()
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'doctors': doctor_count,
+        'patients': patient_count,
+        'records': len(records),
+        'treatments': totals['treatments'],
+        'payments': totals['payments'],
+    }
+
+
+def has_future_dates(path):
+    """True for databases from older generator versions, which dated entries past today"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("""
+            SELECT EXISTS (SELECT 1 FROM treatments WHERE date > date('now', 'localtime'))
+                OR EXISTS (SELECT 1 FROM payments WHERE date > date('now', 'localtime'))
+        """).fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def ensure_database(scale, path=None, seed=42):
+    """Return the path of a generated database, generating it on first use"""
+    path = Path(path) if path else default_path(scale)
+    if not path.exists() or has_future_dates(path):
+        generate_database(path, scale, seed=seed)
+    else:
+        # Bring databases generated before a schema change up to date
+        conn = sqlite3.connect(path)
+        try:
+            migrate(conn)
+        finally:
+            conn.close()
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic DentaSys database")
+    parser.add_argument('--scale', default='10k', help="1k, 10k, 100k, 1m or a patient count")
+    parser.add_argument('--output', help="Database path (default: benchmarks/data/bench_<scale>.db)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    path = Path(args.output) if args.output else default_path(args.scale)
+    started = time.perf_counter()
+    counts = generate_database(path, args.scale, seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"Generated {path} in {elapsed:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:<11} {count:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Headless GUI rendering benchmarks for DentaSys
+Drives the page loaders on a generated database under a virtual X server and
+measures the time until each Treeview is populated and the event loop is idle
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import database.connection as connection
+from benchmarks.data_generator import ensure_database
+from benchmarks.model_benchmarks import (
+    BASELINE_DIR, measure, load_baseline, save_baseline, compare_with_baseline, scratch_database
+)
+
+
+class VirtualDisplay:
+    """Starts Xvfb on a free display number when no display is available"""
+
+    def __init__(self, width=1920, height=1080, depth=24):
+        self.size = f"{width}x{height}x{depth}"
+        self.process = None
+        self.previous_display = None
+
+    def __enter__(self):
+        if os.environ.get('DISPLAY'):
+            return self
+        if not shutil.which('Xvfb'):
+            raise RuntimeError("No DISPLAY set and Xvfb is not installed")
+
+        for number in range(99, 200):
+            if Path(f"/tmp/.X{number}-lock").exists():
+                continue
+            self.process = subprocess.Popen(
+                ['Xvfb', f':{number}', '-screen', '0', self.size, '-nolisten', 'tcp'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            # Give the server a moment to open its socket
+            for _ in range(50):
+                if Path(f"/tmp/.X11-unix/X{number}").exists():
+                    break
+                if self.process.poll() is not None:
+                    break
+                time.sleep(0.1)
+            if self.process.poll() is None:
+                self.previous_display = os.environ.get('DISPLAY')
+                os.environ['DISPLAY'] = f':{number}'
+                return self
+        raise RuntimeError("Could not start Xvfb")
+
+    def __exit__(self, *exc):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=5)
+            if self.previous_display is None:
+                os.environ.pop('DISPLAY', None)
+            else:
+                os.environ['DISPLAY'] = self.previous_display
+        return False
+
+
+@contextmanager
+def non_blocking_dialogs():
+    """Keep modal windows and message boxes from blocking the benchmark"""
+    import tkinter as tk
+    from tkinter import messagebox
+
+    errors = []
+    patched = {
+        (tk.Misc, 'wait_window'): lambda self, window=None: None,
+        (messagebox, 'showerror'): lambda title=None, message=None, **kw: errors.append(message),
+        (messagebox, 'showinfo'): lambda title=None, message=None, **kw: None,
+    }
+    originals = {key: getattr(*key) for key in patched}
+    for (owner, name), replacement in patched.items():
+        setattr(owner, name, replacement)
+    try:
+        yield errors
+    finally:
+        for (owner, name), original in originals.items():
+            setattr(owner, name, original)
+
+
+class GuiBenchmarks:
+    def __init__(self, db_path, time_budget=2.0, skip=(), memory=False):
+        self.db_path = Path(db_path)
+        self.time_budget = time_budget
+        self.skip = set(skip)
+        self.memory = memory
+
+    def run(self):
+        """Build each page on a scratch copy of the database and time its loader"""
+        import tkinter as tk
+        from tkinter import ttk
+        from gui.styles import apply_styles
+        from gui.pages.home_page import HomePage
+        from gui.pages.patients_page import PatientsPage
+        from gui.pages.records_page import RecordsPage
+        from gui.widgets.record_details import RecordDetailsWindow
+        from models import Record
+
+        with scratch_database(self.db_path, self.memory):
+            root = tk.Tk()
+            root.geometry("1600x1000")
+            try:
+                apply_styles(root)
+                notebook = ttk.Notebook(root)
+                notebook.pack(fill='both', expand=True)
+
+                def settle():
+                    # Treeview populated and all pending redraws flushed
+                    root.update_idletasks()
+                    root.update()
+
+                results = []
+                with non_blocking_dialogs() as errors:
+                    home_page = HomePage(notebook)
+                    patients_page = PatientsPage(notebook)
+                    records_page = RecordsPage(notebook)
+                    for page, label in ((home_page, 'Home'), (patients_page, 'Patients'), (records_page, 'Records')):
+                        notebook.add(page.frame, text=label)
+                    settle()
+
+                    record = Record.get_by_id(self.busiest_record_id())
+                    details = RecordDetailsWindow(root, record) if record else None
+                    settle()
+
+                    benchmarks = [
+                        ('HomePage.load_dashboard_stats', home_page.load_dashboard_stats),
+                        ('PatientsPage.load_patients', patients_page.load_patients),
+                        ('RecordsPage.load_records', records_page.load_records),
+                    ]
+                    if details:
+                        benchmarks.append(('RecordDetailsWindow.load_data', details.load_data))
+
+                    for name, loader in benchmarks:
+                        if name in self.skip:
+                            continue
+
+                        def run_once(loader=loader):
+                            loader()
+                            settle()
+
+                        result = measure(name, run_once, time_budget=self.time_budget)
+                        results.append(result)
+                        print(f"  {name:<32} {result.ops_per_sec:>8.2f} ops/s  "
+                              f"p50 {result.p50 * 1000:>10.2f} ms  p95 {result.p95 * 1000:>10.2f} ms")
+
+                for message in errors:
+                    print(f"  error reported by GUI: {message}")
+                return results
+            finally:
+                root.destroy()
+
+    def busiest_record_id(self):
+        """Record with the longest treatment history (worst case for the details window)"""
+        conn = connection.get_db_connection()
+        try:
+            row = conn.execute("""
+                SELECT record_id FROM treatments
+                GROUP BY record_id
+                ORDER BY COUNT(*) DESC
+                LIMIT 1
+            """).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DentaSys GUI rendering under Xvfb")
+    parser.add_argument('--scale', default='10k', help="1k, 10k, 100k, 1m or a patient count")
+    parser.add_argument('--db', help="Use an existing database instead of a generated one")
+    parser.add_argument('--baseline', help="Baseline file (default: benchmarks/baselines/gui_<scale>.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed p50 slowdown before failing")
+    parser.add_argument('--time-budget', type=float, default=2.0, help="Seconds spent per benchmark")
+    parser.add_argument('--skip', action='append', default=[], help="Benchmark name to skip (repeatable)")
+    parser.add_argument('--memory', action='store_true', help="Run on an in-memory copy of the database")
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db) if args.db else ensure_database(args.scale)
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"gui_{args.scale.lower()}.json"
+
+    print(f"Benchmarking GUI rendering against {db_path}")
+    with VirtualDisplay():
+        results = GuiBenchmarks(db_path, time_budget=args.time_budget, skip=args.skip,
+                                memory=args.memory).run()
+
+    if args.save_baseline:
+        save_baseline(baseline_path, args.scale, results)
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    return 1 if compare_with_baseline(results, baseline, args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
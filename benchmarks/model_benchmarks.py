@@ -0,0 +1,248 @@
+"""
+Model-layer benchmarks for DentaSys
+Times the models/ read and write paths against a generated database and compares
+the results with a stored baseline file
+"""
+import argparse
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import database.connection as connection
+from benchmarks.data_generator import ensure_database
+from database import config
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+class BenchmarkResult:
+    def __init__(self, name, samples):
+        self.name = name
+        self.samples = sorted(samples)
+
+    @property
+    def iterations(self):
+        return len(self.samples)
+
+    @property
+    def ops_per_sec(self):
+        total = sum(self.samples)
+        return self.iterations / total if total else float('inf')
+
+    @property
+    def p50(self):
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self):
+        index = max(0, int(round(0.95 * self.iterations)) - 1)
+        return self.samples[index]
+
+    def to_dict(self):
+        return {
+            'iterations': self.iterations,
+            'ops_per_sec': self.ops_per_sec,
+            'p50_ms': self.p50 * 1000,
+            'p95_ms': self.p95 * 1000,
+        }
+
+
+def measure(name, func, min_iterations=3, max_iterations=1000, time_budget=2.0):
+    """Call func repeatedly until the iteration count or time budget is reached"""
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_iterations:
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= min_iterations and time.perf_counter() - started >= time_budget:
+            break
+    return BenchmarkResult(name, samples)
+
+
+@contextmanager
+def scratch_database(db_path, memory=False):
+    """Point the models at a throwaway copy of db_path: a temp file, or RAM when memory is set.
+
+    In memory there are no fsyncs, so write timings show the query cost alone.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix='dentasys_bench_'))
+    try:
+        if memory:
+            with config.database_at(config.MEMORY):
+                config.load_file(db_path)
+                yield
+        else:
+            scratch = workdir / Path(db_path).name
+            shutil.copyfile(db_path, scratch)
+            with config.database_at(scratch):
+                yield
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class ModelBenchmarks:
+    def __init__(self, db_path, seed=42, time_budget=2.0, skip=(), memory=False):
+        self.db_path = Path(db_path)
+        self.rng = random.Random(seed)
+        self.time_budget = time_budget
+        self.skip = set(skip)
+        self.memory = memory
+
+    def run(self):
+        """Run every benchmark on a scratch copy of the database"""
+        from models import Doctor, Patient, Record, Treatment, Payment
+        from reports import aging
+
+        with scratch_database(self.db_path, self.memory):
+            conn = connection.get_db_connection()
+            try:
+                max_ids = {
+                    table: conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+                    for table in ('doctors', 'patients', 'records', 'treatments', 'payments')
+                }
+                search_terms = [row[0].split()[0] for row in conn.execute(
+                    "SELECT name FROM patients ORDER BY RANDOM() LIMIT 50"
+                )]
+            finally:
+                conn.close()
+
+            rng = self.rng
+            counter = iter(range(10 ** 9))
+
+            def record_with_financials():
+                record = Record.get_by_id(rng.randint(1, max_ids['records']))
+                if record:
+                    record.cost()
+                    record.amount()
+                    record.balance()
+
+            def create_doctor():
+                n = next(counter)
+                Doctor.create(f"Bench Doctor {n}", f"bench-d-{n}")
+
+            def create_patient():
+                n = next(counter)
+                Patient.create(f"Bench Patient {n}", f"bench-p-{n}", gender='Male', birth_date='1990-01-01')
+
+            def create_record():
+                n = next(counter)
+                patient = Patient.create(f"Bench Record Patient {n}", f"bench-r-{n}")
+                Record.create(rng.randint(1, max_ids['doctors']), patient.id)
+
+            benchmarks = [
+                ('Doctor.get_all', lambda: Doctor.get_all()),
+                ('Patient.search', lambda: Patient.search(rng.choice(search_terms))),
+                ('Record.get_all', lambda: Record.get_all()),
+                ('Record.get_by_id+financials', record_with_financials),
+                ('aging.aging', lambda: aging.aging()),
+                ('aging.summary', lambda: aging.summary()),
+                ('Doctor.create', create_doctor),
+                ('Doctor.update', lambda: Doctor.update(rng.randint(1, max_ids['doctors']),
+                                                        phone=f"bench-du-{next(counter)}")),
+                ('Patient.create', create_patient),
+                ('Patient.update', lambda: Patient.update(rng.randint(1, max_ids['patients']),
+                                                          notes=f"bench {next(counter)}")),
+                ('Record.create', create_record),
+                ('Treatment.create', lambda: Treatment.create(rng.randint(1, max_ids['records']),
+                                                              'Bench Filling', 99.5, '2024-01-15')),
+                ('Treatment.update', lambda: Treatment.update(rng.randint(1, max_ids['treatments']),
+                                                              cost=120.25)),
+                ('Payment.create', lambda: Payment.create(rng.randint(1, max_ids['records']),
+                                                          50.0, '2024-01-15')),
+                ('Payment.update', lambda: Payment.update(rng.randint(1, max_ids['payments']),
+                                                          amount=75.0)),
+            ]
+
+            results = []
+            for name, func in benchmarks:
+                if name in self.skip:
+                    continue
+                result = measure(name, func, time_budget=self.time_budget)
+                results.append(result)
+                print(f"  {name:<30} {result.ops_per_sec:>10.1f} ops/s  "
+                      f"p50 {result.p50 * 1000:>9.3f} ms  p95 {result.p95 * 1000:>9.3f} ms")
+            return results
+
+
+def load_baseline(path):
+    """Load a baseline file, or None if it does not exist"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, scale, results):
+    """Store benchmark results as the new baseline"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        'scale': scale,
+        'created_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'results': {result.name: result.to_dict() for result in results},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def compare_with_baseline(results, baseline, tolerance=0.2):
+    """Print p50 changes against the baseline and return the names that regressed"""
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    print(f"\nComparison with baseline from {baseline.get('created_at', 'unknown')} "
+          f"(tolerance {tolerance:.0%}):")
+    for result in results:
+        previous = baseline_results.get(result.name)
+        if not previous:
+            print(f"  {result.name:<30} (no baseline)")
+            continue
+        current_p50 = result.p50 * 1000
+        change = (current_p50 - previous['p50_ms']) / previous['p50_ms'] if previous['p50_ms'] else 0
+        status = 'REGRESSION' if change > tolerance else 'ok'
+        if change > tolerance:
+            regressions.append(result.name)
+        print(f"  {result.name:<30} p50 {previous['p50_ms']:>9.3f} -> {current_p50:>9.3f} ms "
+              f"({change:+.1%}) {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DentaSys model layer")
+    parser.add_argument('--scale', default='10k', help="1k, 10k, 100k, 1m or a patient count")
+    parser.add_argument('--db', help="Use an existing database instead of a generated one")
+    parser.add_argument('--baseline', help="Baseline file (default: benchmarks/baselines/models_<scale>.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed p50 slowdown before failing")
+    parser.add_argument('--time-budget', type=float, default=2.0, help="Seconds spent per benchmark")
+    parser.add_argument('--skip', action='append', default=[], help="Benchmark name to skip (repeatable)")
+    parser.add_argument('--memory', action='store_true', help="Run on an in-memory copy of the database")
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db) if args.db else ensure_database(args.scale)
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"models_{args.scale.lower()}.json"
+
+    print(f"Benchmarking models against {db_path}")
+    results = ModelBenchmarks(db_path, time_budget=args.time_budget, skip=args.skip,
+                              memory=args.memory).run()
+
+    if args.save_baseline:
+        save_baseline(baseline_path, args.scale, results)
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    return 1 if compare_with_baseline(results, baseline, args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+DentaSys command line
+Batch jobs for cron or Task Scheduler on the clinic server: import, export,
+backup, reports, integrity check, reindex, archive, benchmarks and PDF
+statements. It works on the models, database and reports layers and never
+imports the GUI. Each command imports what it needs only when it runs, so
+starting the program stays fast
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.config import ENV_VAR, configure
+
+
+class CommandError(Exception):
+    pass
+
+
+def require_database():
+    """Refuse to run on a missing file; sqlite3 would quietly create an empty one"""
+    from database import connection
+
+    if not connection.is_memory() and not Path(connection.DB_PATH).exists():
+        raise CommandError(f"No database at {connection.DB_PATH}")
+
+
+def open_database():
+    """Bring an existing database up to the current schema"""
+    from database.schema import create_schema
+    from models.helper import register_converters
+
+    register_converters()
+    create_schema()
+
+
+def parse_mapping(pairs, header, table):
+    """{field: column index} from FIELD=COLUMN pairs (a header name or 1-based number) over the guessed mapping"""
+    from dataio.importer import FIELDS, REQUIRED, guess_mapping
+
+    mapping = guess_mapping(header, table)
+    for pair in pairs:
+        field, _, column = pair.partition('=')
+        if field not in FIELDS[table] or not column:
+            raise CommandError(f"Bad --map {pair!r}; fields are {', '.join(FIELDS[table])}")
+        if column.isdigit():
+            index = int(column) - 1
+        elif column in header:
+            index = header.index(column)
+        else:
+            raise CommandError(f"No column {column!r} in the file")
+        if not 0 <= index < len(header):
+            raise CommandError(f"Column {column} is out of range")
+        mapping[field] = index
+    missing = [field for field in REQUIRED[table] if field not in mapping]
+    if missing:
+        raise CommandError(f"No column for {', '.join(missing)}; pass --map FIELD=COLUMN")
+    return mapping
+
+
+def cmd_import(args):
+    from dataio.importer import import_file, read_header, write_error_report
+
+    header = read_header(args.file)
+    mapping = parse_mapping(args.map, header, args.table)
+    summary = import_file(args.file, args.table, mapping)
+    print(f"Imported {summary.imported} of {summary.total} rows into {args.table}. Skipped: {summary.skipped}")
+    if summary.errors and args.report:
+        write_error_report(summary, args.report)
+        print(f"Skipped rows written to {args.report}")
+    elif summary.errors:
+        for line, error in summary.errors[:20]:
+            print(f"  line {line}: {error}")
+    return 1 if summary.errors and args.strict else 0
+
+
+def cmd_export(args):
+    from dataio.exporter import export_all
+
+    summary = export_all(args.directory, args.dataset or None, args.format, args.gzip)
+    for name, (filename, count) in summary.files.items():
+        print(f"  {name:<16} {count:>10} rows  {filename}")
+    print(f"Wrote {summary.rows} rows to {args.directory}")
+    return 0
+
+
+def cmd_backup(args):
+    from database.backup import backup_database
+
+    result = backup_database(args.directory, compress=not args.no_compress, keep=args.keep)
+    print(f"Backed up to {result.path} ({result.size / 1024 / 1024:.1f} MB in {result.seconds:.1f}s)")
+    return 0
+
+
+def cmd_report(args):
+    if args.report == 'revenue':
+        from reports import financial
+
+        rows = financial.revenue(args.start, args.end, args.period, args.doctor_id, not args.totals)
+        if args.csv:
+            financial.write_csv(rows, args.csv)
+            print(f"{len(rows)} rows written to {args.csv}")
+            return 0
+        print(f"{'period':<12} {'doctor':<28} {'billed':>12} {'collected':>12} {'outstanding':>12} {'new':>5}")
+        for row in rows:
+            print(f"{row.period:<12} {(row.doctor_name or '')[:28]:<28} {row.billed:>12.2f} "
+                  f"{row.collected:>12.2f} {row.outstanding:>12.2f} {row.new_patients:>5}")
+        total = financial.summary(args.start, args.end, args.doctor_id)
+        print(f"{'total':<12} {'':<28} {total.billed:>12.2f} {total.collected:>12.2f} "
+              f"{total.outstanding:>12.2f} {total.new_patients:>5}")
+        return 0
+
+    from reports import aging
+
+    if args.csv:
+        rows = aging.aging(args.doctor_id, args.as_of)
+        aging.write_csv(rows, args.csv)
+        print(f"{len(rows)} rows written to {args.csv}")
+        return 0
+    result = aging.summary(args.doctor_id, args.as_of)
+    for key, first, last in aging.BUCKETS:
+        label = f"{first}-{last} days" if last is not None else f"{first}+ days"
+        print(f"{label:<12} {result.counts[key]:>8} records {result.totals[key]:>14.2f}")
+    print(f"{'total':<12} {result.count:>8} records {result.total:>14.2f}")
+    return 0
+
+
+def cmd_check(args):
+    from database.connection import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        problems = [row[0] for row in conn.execute(f"PRAGMA {'quick_check' if args.quick else 'integrity_check'}")]
+        if problems == ['ok']:
+            problems = []
+        problems += [f"{table} row {rowid} points at a missing {parent} row"
+                     for table, rowid, parent, _ in conn.execute("PRAGMA foreign_key_check")]
+    finally:
+        conn.close()
+    for problem in problems:
+        print(problem)
+    print("Database is consistent" if not problems else f"{len(problems)} problems found")
+    return 1 if problems else 0
+
+
+def cmd_reindex(args):
+    import time
+    from database.connection import get_db_connection
+
+    started = time.monotonic()
+    conn = get_db_connection()
+    try:
+        conn.execute("REINDEX")
+        conn.execute("ANALYZE")
+        conn.commit()
+        if args.vacuum:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+    print(f"Indexes rebuilt and statistics refreshed in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+def cmd_archive(args):
+    from database.archive import archive_path, archive_records
+
+    summary = archive_records(args.years)
+    print(f"Archived {summary.records} records with {summary.treatments} treatments and "
+          f"{summary.payments} payments (no activity since {summary.cutoff}) to {archive_path()}")
+    return 0
+
+
+def cmd_benchmark(args):
+    from benchmarks.model_benchmarks import main as run_benchmarks
+
+    return run_benchmarks(args.options)
+
+
+def cmd_pdf(args):
+    from reports.batch_export import select_records, prefetch, export_batch
+
+    items = prefetch(select_records(args.doctor_id, args.unpaid, args.start, args.end))
+    summary = export_batch(items, args.output, merge=args.merge)
+    for record, error in summary.failures:
+        print(f"  #{record.id} {record.patient_name}: {error}")
+    print(f"Exported {summary.exported} of {summary.total} statements to {summary.output}. Failed: {summary.failed}")
+    return 1 if summary.failures else 0
+
+
+def cmd_serve(args):
+    from api import protocol
+    from api.server import run_server
+
+    run_server(args.host or protocol.DEFAULT_HOST, args.port or protocol.DEFAULT_PORT,
+               args.readers, args.token, not args.no_backups)
+    return 0
+
+
+def build_parser():
+    from database.backup import BACKUP_DIR
+
+    parser = argparse.ArgumentParser(prog='dentasys', description="DentaSys batch operations")
+    parser.add_argument('--db', help=f"Database file, or :memory: (default: ${ENV_VAR}, then ~/.dentasys_config.json)")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+    # existing: the command needs a database that is already there
+    parser.set_defaults(existing=True)
+
+    command = commands.add_parser('import', help="Import patients or doctors from CSV or XLSX")
+    command.add_argument('table', choices=('patients', 'doctors'))
+    command.add_argument('file')
+    command.add_argument('--map', action='append', default=[], metavar='FIELD=COLUMN',
+                         help="Column for a field, by header name or 1-based number (repeatable)")
+    command.add_argument('--report', help="Write skipped rows to this CSV file")
+    command.add_argument('--strict', action='store_true', help="Exit with status 1 if any row was skipped")
+    command.set_defaults(func=cmd_import, schema=True)
+
+    command = commands.add_parser('export', help="Export tables to CSV or JSON Lines")
+    command.add_argument('directory')
+    command.add_argument('--dataset', action='append', help="Table to export (repeatable; default all)")
+    command.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    command.add_argument('--gzip', action='store_true')
+    command.set_defaults(func=cmd_export, schema=True)
+
+    command = commands.add_parser('backup', help="Take an online backup")
+    command.add_argument('--directory', default=BACKUP_DIR, help=f"Backup directory (default: {BACKUP_DIR})")
+    command.add_argument('--keep', type=int, default=7, help="Backups to keep")
+    command.add_argument('--no-compress', action='store_true')
+    command.set_defaults(func=cmd_backup, schema=False)
+
+    command = commands.add_parser('report', help="Revenue or receivables aging report")
+    reports = command.add_subparsers(dest='report', metavar='REPORT', required=True)
+    revenue = reports.add_parser('revenue', help="Billed, collected and new patients per period")
+    revenue.add_argument('--from', dest='start', metavar='YYYY-MM-DD')
+    revenue.add_argument('--to', dest='end', metavar='YYYY-MM-DD')
+    revenue.add_argument('--period', choices=('day', 'month', 'year'), default='month')
+    revenue.add_argument('--doctor-id', type=int)
+    revenue.add_argument('--totals', action='store_true', help="One row per period instead of per doctor")
+    revenue.add_argument('--csv', help="Write the rows to a CSV file")
+    aging = reports.add_parser('aging', help="Outstanding balances by age")
+    aging.add_argument('--as-of', metavar='YYYY-MM-DD')
+    aging.add_argument('--doctor-id', type=int)
+    aging.add_argument('--csv', help="Write every record with a balance to a CSV file")
+    command.set_defaults(func=cmd_report, schema=True)
+
+    command = commands.add_parser('check', help="Run the SQLite integrity and foreign key checks")
+    command.add_argument('--quick', action='store_true', help="quick_check instead of integrity_check")
+    command.set_defaults(func=cmd_check, schema=False)
+
+    command = commands.add_parser('reindex', help="Rebuild indexes and refresh planner statistics")
+    command.add_argument('--vacuum', action='store_true', help="Also compact the database file")
+    command.set_defaults(func=cmd_reindex, schema=False)
+
+    command = commands.add_parser('archive', help="Move old fully paid records to archive.db")
+    command.add_argument('--years', type=int, default=3, help="Years without activity (default: 3)")
+    command.set_defaults(func=cmd_archive, schema=True)
+
+    command = commands.add_parser('benchmark', help="Run the model benchmarks; options go to benchmarks.model_benchmarks")
+    command.add_argument('options', nargs=argparse.REMAINDER)
+    command.set_defaults(func=cmd_benchmark, schema=False, existing=False)
+
+    command = commands.add_parser('pdf', help="Write PDF statements for many records")
+    command.add_argument('output', help="Directory, or a .pdf file with --merge")
+    command.add_argument('--doctor-id', type=int)
+    command.add_argument('--unpaid', action='store_true', help="Only records with a balance")
+    command.add_argument('--from', dest='start', metavar='YYYY-MM-DD')
+    command.add_argument('--to', dest='end', metavar='YYYY-MM-DD')
+    command.add_argument('--merge', action='store_true', help="One merged PDF instead of a file per record")
+    command.set_defaults(func=cmd_pdf, schema=True)
+
+    command = commands.add_parser('serve', help="Serve the database to GUI clients over HTTP")
+    command.add_argument('--host', help="Address to listen on (default: 127.0.0.1; 0.0.0.0 for the whole network)")
+    command.add_argument('--port', type=int, help="Port (default: 8765)")
+    command.add_argument('--readers', type=int, default=4, help="Threads serving reads")
+    command.add_argument('--token', help="Shared secret clients must send (default: none)")
+    command.add_argument('--no-backups', action='store_true', help="Do not take scheduled backups")
+    command.set_defaults(func=cmd_serve, schema=True, existing=False)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        configure(args.db)
+        if args.existing:
+            require_database()
+        if args.schema:
+            open_database()
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("\nInterrupted", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2 if isinstance(e, CommandError) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Archive database for DentaSys
+Records that are fully paid and have had no treatment, payment or change for
+a number of years are moved, with their treatments and payments, into
+archive.db next to the clinic database. The hot tables and their indexes only
+hold current work; the archive is ATTACHed when someone asks for history
+"""
+from contextlib import contextmanager
+from pathlib import Path
+
+from database import connection
+
+ARCHIVE_NAME = 'archive.db'
+# Used instead of a file while the clinic database itself is in memory
+MEMORY_ARCHIVE_URI = 'file:/dentasys_archive?vfs=memdb'
+
+DEFAULT_YEARS = 3
+
+# Records moved per pair of transactions, so the write lock is never held for long
+BATCH_SIZE = 1000
+
+# Same columns as the hot tables; ids are kept so references stay valid. No
+# foreign keys, since doctors and patients stay in the main database.
+ARCHIVE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS archive.records (
+    id INTEGER PRIMARY KEY,
+    doctor_id INTEGER NOT NULL,
+    patient_id INTEGER NOT NULL,
+    created_at DATETIME,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS archive.treatments (
+    id INTEGER PRIMARY KEY,
+    record_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    cost INTEGER NOT NULL,  -- cents
+    date DATE,
+    notes TEXT
+);
+
+CREATE TABLE IF NOT EXISTS archive.payments (
+    id INTEGER PRIMARY KEY,
+    record_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,  -- cents
+    date DATE,
+    notes TEXT
+);
+
+CREATE INDEX IF NOT EXISTS archive.idx_records_patient ON records(patient_id);
+CREATE INDEX IF NOT EXISTS archive.idx_records_doctor ON records(doctor_id);
+CREATE INDEX IF NOT EXISTS archive.idx_treatments_record ON treatments(record_id, date);
+CREATE INDEX IF NOT EXISTS archive.idx_payments_record ON payments(record_id, date);
+"""
+
+# Zero balance and nothing dated on or after :cutoff. The sums and latest dates
+# come straight from the covering (record_id, date, amount) indexes.
+CANDIDATES_SQL = """
+    SELECT r.id
+    FROM records r
+    LEFT JOIN (SELECT record_id, SUM(cost) AS total, MAX(date) AS last
+               FROM treatments GROUP BY record_id) t ON t.record_id = r.id
+    LEFT JOIN (SELECT record_id, SUM(amount) AS total, MAX(date) AS last
+               FROM payments GROUP BY record_id) p ON p.record_id = r.id
+    WHERE COALESCE(t.total, 0) = COALESCE(p.total, 0)
+      AND date(r.created_at) < :cutoff
+      AND COALESCE(t.last, '') < :cutoff
+      AND COALESCE(p.last, '') < :cutoff
+    ORDER BY r.id
+"""
+
+
+class ArchiveCancelled(Exception):
+    pass
+
+
+class ArchiveSummary:
+    def __init__(self, cutoff):
+        self.cutoff = cutoff
+        self.records = 0
+        self.treatments = 0
+        self.payments = 0
+
+
+def archive_path():
+    """Where the archive lives: archive.db beside the clinic database"""
+    if connection.is_memory():
+        return MEMORY_ARCHIVE_URI
+    return Path(connection.DB_PATH).parent / ARCHIVE_NAME
+
+
+def archive_exists():
+    return connection.is_memory() or Path(archive_path()).exists()
+
+
+def attach_archive(conn):
+    """ATTACH the archive to conn as "archive", creating its tables if needed"""
+    conn.execute("ATTACH DATABASE ? AS archive", (str(archive_path()),))
+    conn.executescript(ARCHIVE_SCHEMA_SQL)
+
+
+@contextmanager
+def archive_connection():
+    """Connection to the clinic database with the archive attached"""
+    conn = connection.get_db_connection()
+    try:
+        attach_archive(conn)
+        yield conn
+    finally:
+        conn.close()
+
+
+def cutoff_date(conn, years):
+    """First day that still counts as recent activity"""
+    if years < 1:
+        raise ValueError("Records must be inactive for at least one year to be archived")
+    return conn.execute("SELECT date('now', 'localtime', ?)", (f"-{int(years)} years",)).fetchone()[0]
+
+
+def find_candidates(conn, cutoff):
+    """Ids of records that can be archived"""
+    return [row[0] for row in conn.execute(CANDIDATES_SQL, {'cutoff': cutoff})]
+
+
+# Takes out of temp.archive_batch every record that stopped qualifying since
+# find_candidates ran: the front desk may have added a treatment or payment,
+# or deleted the record, in the meantime.
+RECHECK_SQL = """
+    DELETE FROM temp.archive_batch WHERE id NOT IN (
+        SELECT r.id FROM main.records r
+        WHERE r.id IN (SELECT id FROM temp.archive_batch)
+          AND date(r.created_at) < :cutoff
+          AND COALESCE((SELECT SUM(cost) FROM main.treatments WHERE record_id = r.id), 0)
+            = COALESCE((SELECT SUM(amount) FROM main.payments WHERE record_id = r.id), 0)
+          AND COALESCE((SELECT MAX(date) FROM main.treatments WHERE record_id = r.id), '') < :cutoff
+          AND COALESCE((SELECT MAX(date) FROM main.payments WHERE record_id = r.id), '') < :cutoff
+    )
+"""
+
+# Takes out every record with a row, or a change to a row, that is not in the
+# archive yet, so nothing is deleted that was not copied first
+UNCOPIED_SQL = """
+    DELETE FROM temp.archive_batch WHERE id IN (
+        SELECT id FROM (
+            SELECT id, doctor_id, patient_id, created_at FROM main.records
+            WHERE id IN (SELECT id FROM temp.archive_batch)
+            EXCEPT
+            SELECT id, doctor_id, patient_id, created_at FROM archive.records
+            WHERE id IN (SELECT id FROM temp.archive_batch))
+        UNION
+        SELECT record_id FROM (
+            SELECT id, record_id, name, cost, date, notes FROM main.treatments
+            WHERE record_id IN (SELECT id FROM temp.archive_batch)
+            EXCEPT
+            SELECT id, record_id, name, cost, date, notes FROM archive.treatments
+            WHERE record_id IN (SELECT id FROM temp.archive_batch))
+        UNION
+        SELECT record_id FROM (
+            SELECT id, record_id, amount, date, notes FROM main.payments
+            WHERE record_id IN (SELECT id FROM temp.archive_batch)
+            EXCEPT
+            SELECT id, record_id, amount, date, notes FROM archive.payments
+            WHERE record_id IN (SELECT id FROM temp.archive_batch))
+    )
+"""
+
+
+def drop_leftovers(conn, where="IN (SELECT id FROM main.records)"):
+    """Delete archive copies of records that are still in the clinic database.
+
+    Ids are never reused, so such a copy is left over from a batch that was
+    copied but then not deleted (new activity, or a crash in between); the
+    record in the main database is the real one.
+    """
+    conn.execute(f"DELETE FROM archive.treatments WHERE record_id {where}")
+    conn.execute(f"DELETE FROM archive.payments WHERE record_id {where}")
+    conn.execute(f"DELETE FROM archive.records WHERE id {where}")
+
+
+def copy_batch(conn, cutoff):
+    """Copy the records in temp.archive_batch that still qualify, with their entries, into the archive"""
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(RECHECK_SQL, {'cutoff': cutoff})
+    conn.execute("""
+        INSERT OR REPLACE INTO archive.records (id, doctor_id, patient_id, created_at)
+        SELECT id, doctor_id, patient_id, created_at FROM main.records
+        WHERE id IN (SELECT id FROM temp.archive_batch)
+    """)
+    conn.execute("""
+        INSERT OR REPLACE INTO archive.treatments (id, record_id, name, cost, date, notes)
+        SELECT id, record_id, name, cost, date, notes FROM main.treatments
+        WHERE record_id IN (SELECT id FROM temp.archive_batch)
+    """)
+    conn.execute("""
+        INSERT OR REPLACE INTO archive.payments (id, record_id, amount, date, notes)
+        SELECT id, record_id, amount, date, notes FROM main.payments
+        WHERE record_id IN (SELECT id FROM temp.archive_batch)
+    """)
+    conn.commit()
+
+
+def delete_batch(conn, cutoff, summary):
+    """Delete the records in temp.archive_batch from the hot tables.
+
+    Runs with the write lock held, and first drops every record that no
+    longer qualifies or has anything the copy missed; their archive copies
+    go too. The delete triggers would take the archived work out of
+    daily_revenue, but the reports should still show what was billed and
+    collected back then. The rollup rows the delete can touch are saved first
+    and put back afterwards: the days of the batch's entries, and the days of
+    every record of its patients (the first-visit count can move between them).
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DELETE FROM temp.archive_copied")
+    conn.execute("INSERT INTO temp.archive_copied SELECT id FROM temp.archive_batch")
+    conn.execute(RECHECK_SQL, {'cutoff': cutoff})
+    conn.execute(UNCOPIED_SQL)
+    drop_leftovers(conn, "IN (SELECT id FROM temp.archive_copied "
+                         "WHERE id NOT IN (SELECT id FROM temp.archive_batch))")
+
+    conn.execute("DELETE FROM temp.revenue_keys")
+    conn.execute("DELETE FROM temp.saved_revenue")
+    conn.execute("""
+        INSERT OR IGNORE INTO temp.revenue_keys (day, doctor_id)
+        SELECT t.date, r.doctor_id FROM main.treatments t JOIN main.records r ON r.id = t.record_id
+        WHERE t.record_id IN (SELECT id FROM temp.archive_batch) AND t.date IS NOT NULL
+        UNION
+        SELECT p.date, r.doctor_id FROM main.payments p JOIN main.records r ON r.id = p.record_id
+        WHERE p.record_id IN (SELECT id FROM temp.archive_batch) AND p.date IS NOT NULL
+        UNION
+        SELECT date(other.created_at), other.doctor_id
+        FROM main.records r JOIN main.records other ON other.patient_id = r.patient_id
+        WHERE r.id IN (SELECT id FROM temp.archive_batch)
+    """)
+    conn.execute("""
+        INSERT INTO temp.saved_revenue
+        SELECT d.* FROM temp.revenue_keys k
+        JOIN main.daily_revenue d ON d.day = k.day AND d.doctor_id = k.doctor_id
+    """)
+    summary.treatments += conn.execute(
+        "DELETE FROM main.treatments WHERE record_id IN (SELECT id FROM temp.archive_batch)").rowcount
+    summary.payments += conn.execute(
+        "DELETE FROM main.payments WHERE record_id IN (SELECT id FROM temp.archive_batch)").rowcount
+    summary.records += conn.execute(
+        "DELETE FROM main.records WHERE id IN (SELECT id FROM temp.archive_batch)").rowcount
+    conn.execute("""
+        DELETE FROM main.daily_revenue
+        WHERE (day, doctor_id) IN (SELECT day, doctor_id FROM temp.revenue_keys)
+    """)
+    conn.execute("INSERT INTO main.daily_revenue SELECT * FROM temp.saved_revenue")
+    conn.commit()
+
+
+def archive_records(years=DEFAULT_YEARS, progress=None, cancel_event=None):
+    """Move paid-off records with no activity for years into the archive.
+
+    Each batch is copied in one transaction and deleted in the next, each
+    holding the write lock and checking the records again, so the front desk
+    can keep working: a record that gets new activity meanwhile stays where
+    it is. A crash in between leaves a record in both places, never in
+    neither; the next run drops the stale copy. progress is called with a
+    fraction. Returns an ArchiveSummary.
+    """
+    conn = connection.get_db_connection()
+    try:
+        cutoff = cutoff_date(conn, years)
+        summary = ArchiveSummary(cutoff)
+        ids = find_candidates(conn, cutoff)
+        if not ids:
+            return summary
+
+        attach_archive(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        drop_leftovers(conn)
+        conn.commit()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_copied (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS revenue_keys "
+                     "(day TEXT, doctor_id INTEGER, PRIMARY KEY (day, doctor_id)) WITHOUT ROWID")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS saved_revenue AS SELECT * FROM main.daily_revenue WHERE 0")
+        conn.commit()
+        for start in range(0, len(ids), BATCH_SIZE):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ArchiveCancelled()
+            conn.execute("DELETE FROM temp.archive_batch")
+            conn.executemany("INSERT INTO temp.archive_batch (id) VALUES (?)",
+                             ((record_id,) for record_id in ids[start:start + BATCH_SIZE]))
+            conn.commit()
+            copy_batch(conn, cutoff)
+            delete_batch(conn, cutoff, summary)
+            if progress:
+                progress(min((start + BATCH_SIZE) / len(ids), 1.0))
+        return summary
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,256 @@
+"""
+Online backups for DentaSys
+Copies the live database, and archive.db next to it, with the SQLite backup
+API a few pages at a time, so the app keeps working while a backup runs.
+Each copy is checked with PRAGMA integrity_check before it replaces
+anything, optionally gzip compressed, and only the newest few are kept
+"""
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from database import connection
+from database.archive import archive_exists, attach_archive
+
+BACKUP_DIR = Path.home() / '.dentasys_backups'
+# Backups are named <database stem>-<YYYYmmdd-HHMMSS>[-<n>].db[.gz]; n counts
+# backups of the same database taken within one second
+TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
+# The archive is saved beside each backup as <backup name>.archive.db[.gz]
+ARCHIVE_SUFFIX = '.archive'
+
+# Pages copied per step. A step holds the read lock only while it runs, so
+# other connections can write between steps; a write from another connection
+# restarts the copy. Steps run back to back: Connection.backup only waits
+# (BUSY_SLEEP seconds) when a step finds the database busy or locked.
+STEP_PAGES = 256
+BUSY_SLEEP = 0.01
+
+
+class BackupError(Exception):
+    pass
+
+
+class BackupCancelled(BackupError):
+    pass
+
+
+class BackupResult:
+    def __init__(self, path, size, seconds):
+        self.path = path
+        self.size = size
+        self.seconds = seconds
+
+
+def backup_prefix():
+    """Name prefix for backups of the current database, from its file name"""
+    stem = 'memory' if connection.is_memory() else Path(connection.DB_PATH).stem
+    return f"{stem}-"
+
+
+def backup_pattern(prefix):
+    """Matches backup names for prefix, capturing the timestamp and counter"""
+    return re.compile(re.escape(prefix) + r'(\d{8}-\d{6})(?:-(\d+))?\.db(?:\.gz)?')
+
+
+def archive_companion(path):
+    """Where the archive copy taken with the backup at path goes"""
+    path = Path(path)
+    stem = path.name[:path.name.rindex('.db')]
+    return path.with_name(stem + ARCHIVE_SUFFIX + path.name[len(stem):])
+
+
+def list_backups(directory=BACKUP_DIR, prefix=None):
+    """Finished backups of one database in directory, oldest first.
+
+    prefix defaults to the current database's, so backups of other databases
+    kept in the same directory are left alone.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    pattern = backup_pattern(prefix or backup_prefix())
+    backups = []
+    for path in directory.iterdir():
+        match = pattern.fullmatch(path.name)
+        if match:
+            backups.append(((match.group(1), int(match.group(2) or 1)), path))
+    return [path for key, path in sorted(backups)]
+
+
+def prune_backups(directory=BACKUP_DIR, keep=7, prefix=None):
+    """Delete all but the newest keep backups, with their archive copies; returns the deleted paths"""
+    backups = list_backups(directory, prefix)
+    removed = backups[:-keep] if keep > 0 else backups
+    for path in removed:
+        for old in (path, archive_companion(path)):
+            try:
+                old.unlink(missing_ok=True)
+            except OSError as e:
+                print(f"Error removing old backup {old}: {e}")
+    return removed
+
+
+def check_integrity(path):
+    """Raise BackupError unless PRAGMA integrity_check passes on the database at path"""
+    conn = sqlite3.connect(path)
+    try:
+        problems = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+    if problems != ['ok']:
+        raise BackupError(f"Backup failed integrity check: {'; '.join(problems[:5])}")
+
+
+def reserve_name(directory):
+    """A backup file name not used yet in directory.
+
+    The .partial file is created exclusively to claim the name, so two backups
+    started in the same second, even from different processes, never share it.
+    """
+    base = backup_prefix() + datetime.now().strftime(TIMESTAMP_FORMAT)
+    counter = 1
+    while True:
+        name = f"{base}.db" if counter == 1 else f"{base}-{counter}.db"
+        taken = [directory / name, directory / (name + '.gz')]
+        if not any(path.exists() or archive_companion(path).exists() for path in taken):
+            try:
+                open(directory / (name + '.partial'), 'x').close()
+                return name
+            except FileExistsError:
+                pass
+        counter += 1
+
+
+def backup_database(directory=BACKUP_DIR, compress=True, keep=7, cancel_event=None):
+    """Copy the live database, and the archive if there is one, into directory.
+
+    Each copy is written to a .partial file and only renamed into place after
+    both pass the integrity check, so a crash or a failed check never leaves
+    something that looks like a good backup. The archive is renamed first, so
+    a finished backup always has its archive beside it. Returns a BackupResult
+    for the main copy; size counts both files.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    name = reserve_name(directory)
+    final = directory / (name + '.gz' if compress else name)
+    # (schema name, uncompressed .partial copy, final path), archive first
+    copies = [('main', directory / (name + '.partial'), final)]
+    if archive_exists():
+        companion = archive_companion(directory / name)
+        copies.insert(0, ('archive', companion.with_name(companion.name + '.partial'), archive_companion(final)))
+
+    def on_step(status, remaining, total):
+        if cancel_event is not None and cancel_event.is_set():
+            raise BackupCancelled("Backup cancelled")
+
+    try:
+        source = connection.get_db_connection()
+        try:
+            for schema, partial, _ in copies:
+                if schema == 'archive':
+                    attach_archive(source)
+                target = sqlite3.connect(partial)
+                try:
+                    source.backup(target, pages=STEP_PAGES, progress=on_step, name=schema, sleep=BUSY_SLEEP)
+                finally:
+                    target.close()
+        finally:
+            source.close()
+
+        for _, partial, _ in copies:
+            check_integrity(partial)
+
+        for _, partial, target in copies:
+            if compress:
+                compressed = target.with_name(target.name + '.partial')
+                with open(partial, 'rb') as src, gzip.open(compressed, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                os.replace(compressed, target)
+                partial.unlink()
+            else:
+                os.replace(partial, target)
+    except BaseException:
+        for _, partial, target in copies:
+            for path in (partial, target.with_name(target.name + '.partial')):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        if not final.exists():
+            # an archive copy renamed before the main copy failed
+            archive_companion(final).unlink(missing_ok=True)
+        raise
+
+    prune_backups(directory, keep)
+    return BackupResult(final, sum(target.stat().st_size for _, _, target in copies), time.monotonic() - started)
+
+
+class BackupScheduler:
+    """Runs backup_database on a background thread every interval_hours.
+
+    The first backup is due interval_hours after the newest existing one, but
+    never sooner than startup_delay_s after start, so opening the app stays fast.
+    """
+
+    def __init__(self, directory=BACKUP_DIR, interval_hours=24, keep=7, compress=True,
+                 startup_delay_s=120):
+        self.directory = Path(directory)
+        self.interval = interval_hours * 3600
+        self.keep = keep
+        self.compress = compress
+        self.startup_delay = startup_delay_s
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_result = None
+        self.last_error = None
+
+    def seconds_until_due(self):
+        backups = list_backups(self.directory)
+        if not backups:
+            return self.startup_delay
+        age = time.time() - backups[-1].stat().st_mtime
+        return max(self.interval - age, self.startup_delay)
+
+    def start(self):
+        """Start the scheduling thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='dentasys-backup')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop the thread; a backup in progress is abandoned and its partial file removed"""
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+
+    def run(self):
+        if connection.is_memory() or connection.REMOTE:
+            return  # nothing on disk to protect, or the server takes the backups
+        delay = self.seconds_until_due()
+        while not self.stop_event.wait(delay):
+            self.backup_now()
+            delay = self.interval
+
+    def backup_now(self):
+        """Take one backup on the calling thread; errors are recorded, not raised"""
+        try:
+            self.last_result = backup_database(self.directory, self.compress, self.keep, self.stop_event)
+            self.last_error = None
+        except BackupCancelled:
+            pass
+        except Exception as e:
+            self.last_error = e
+            print(f"Error backing up database: {e}")
+        return self.last_result
@@ -0,0 +1,127 @@
+"""
+Database settings for DentaSys
+Where the database lives and which pragmas each connection gets. The path
+comes from, in order: the --db command-line flag, the DENTASYS_DB environment
+variable, the "database" section of ~/.dentasys_config.json, and finally the
+file next to database/connection.py. The path ':memory:' selects an
+in-memory database for tests and benchmarks
+"""
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from database import connection
+from database.archive import MEMORY_ARCHIVE_URI
+
+ENV_VAR = 'DENTASYS_DB'
+CONFIG_FILE = Path.home() / '.dentasys_config.json'
+
+MEMORY = ':memory:'
+# Every connection opened with this URI in the process sees the same database.
+# The memdb VFS locks like a file, so threads wait out the busy timeout;
+# shared-cache mode (mode=memory&cache=shared) fails at once with "database
+# table is locked" whenever two threads overlap.
+MEMORY_URI = 'file:/dentasys?vfs=memdb'
+
+# Pragmas the config file may set, e.g. {"journal_mode": "wal", "busy_timeout": 5000}
+ALLOWED_PRAGMAS = ('journal_mode', 'synchronous', 'cache_size', 'busy_timeout',
+                   'temp_store', 'mmap_size', 'foreign_keys')
+PRAGMA_VALUE = re.compile(r'-?\d+|[A-Za-z_]+')
+
+# An in-memory database is dropped when its last connection closes; this one
+# stays open while memory mode is in use
+_memory_keeper = None
+
+
+def load_settings(config_file=CONFIG_FILE):
+    """The "database" section of the config file, or {} when there is none"""
+    try:
+        if Path(config_file).exists():
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('database') or {}
+    except Exception as e:
+        print(f"Error loading database settings: {e}")
+    return {}
+
+
+def resolve_path(cli_path=None, settings=None):
+    """Database path by priority; None means the default file"""
+    if cli_path:
+        return cli_path
+    if os.environ.get(ENV_VAR):
+        return os.environ[ENV_VAR]
+    return (settings or {}).get('path')
+
+
+def check_pragmas(pragmas):
+    """(name, value) pairs for the allowed pragmas; anything else raises ValueError"""
+    checked = []
+    for name, value in (pragmas or {}).items():
+        if name not in ALLOWED_PRAGMAS:
+            raise ValueError(f"Unsupported database pragma: {name}")
+        value = str(value)
+        if not PRAGMA_VALUE.fullmatch(value):
+            raise ValueError(f"Invalid value for pragma {name}: {value}")
+        checked.append((name, value))
+    return checked
+
+
+def use_database(path=None, pragmas=None):
+    """Point every new connection at path (None for the default file, MEMORY for RAM)"""
+    global _memory_keeper
+    connection.PRAGMAS = check_pragmas(pragmas)
+    if str(path) == MEMORY:
+        connection.DB_PATH = MEMORY_URI
+        connection.URI = True
+        if _memory_keeper is None:
+            _memory_keeper = sqlite3.connect(MEMORY_URI, uri=True, check_same_thread=False)
+            # and the in-memory archive that goes with it
+            _memory_keeper.execute("ATTACH DATABASE ? AS archive", (MEMORY_ARCHIVE_URI,))
+        return
+    connection.DB_PATH = Path(path).expanduser() if path else connection.DEFAULT_DB_PATH
+    connection.URI = False
+    if _memory_keeper is not None:
+        _memory_keeper.close()
+        _memory_keeper = None
+
+
+def configure(cli_path=None, config_file=CONFIG_FILE):
+    """Apply the flag, environment and config file settings; returns the chosen path"""
+    settings = load_settings(config_file)
+    path = resolve_path(cli_path, settings)
+    use_database(path, settings.get('pragmas'))
+    return connection.DB_PATH
+
+
+@contextmanager
+def database_at(path, pragmas=None):
+    """Use another database inside a with block, then restore the previous settings.
+
+    Leaving memory mode drops the in-memory database.
+    """
+    global _memory_keeper
+    previous = (connection.DB_PATH, connection.URI, connection.PRAGMAS)
+    use_database(path, pragmas)
+    try:
+        yield
+    finally:
+        connection.DB_PATH, connection.URI, connection.PRAGMAS = previous
+        if not connection.is_memory() and _memory_keeper is not None:
+            _memory_keeper.close()
+            _memory_keeper = None
+
+
+def load_file(path):
+    """Copy the database file at path into the current (usually in-memory) database"""
+    source = sqlite3.connect(path)
+    try:
+        target = connection.get_db_connection()
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
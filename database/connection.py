@@ -1,16 +1,50 @@
 import sqlite3
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent / "dental_center.db"
+DEFAULT_DB_PATH = Path(__file__).parent / "dental_center.db"
+# Changed through database.config; DB_PATH is a URI when URI is set
+DB_PATH = DEFAULT_DB_PATH
+URI = False
+PRAGMAS = []  # (name, value) pairs run on every new connection
+# Server URL while this process is a client of the DentaSys server (api.client)
+REMOTE = None
+# Set by models.helper.register_converters() to return typed date columns
+DETECT_TYPES = 0
 
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+def get_db_connection(detect_types=None):
+    """Connection to the clinic database; detect_types=0 returns stored text as is"""
+    if REMOTE:
+        raise RuntimeError(f"Not available while connected to the server at {REMOTE}")
+    conn = sqlite3.connect(DB_PATH, detect_types=DETECT_TYPES if detect_types is None else detect_types,
+                           uri=URI)
     conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
     return conn
 
 
+def is_memory():
+    """True when connections go to the in-memory database"""
+    return URI and 'vfs=memdb' in str(DB_PATH)
+
+
 def init_db():
-    with get_db_connection() as conn:
+    from database.migrations import LATEST_VERSION, migrate, set_version
+    from database.schema import POST_MIGRATION_SQL
+
+    conn = get_db_connection()
+    try:
+        fresh = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'treatments'"
+        ).fetchone()[0] == 0
         with open(Path(__file__).parent / "schema.sql", "r") as f:
             conn.executescript(f.read())
+        if fresh:
+            # A new database is created at the latest schema
+            set_version(conn, LATEST_VERSION)
+        else:
+            migrate(conn)
+        conn.executescript(POST_MIGRATION_SQL)
+    finally:
+        conn.close()
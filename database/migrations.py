@@ -0,0 +1,216 @@
+"""
+Schema migrations for DentaSys
+The database version is kept in PRAGMA user_version; each migration moves it up by one
+"""
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def set_version(conn, version):
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def column_type(conn, table, column):
+    for row in conn.execute(f"PRAGMA table_info({table})"):
+        if row[1] == column:
+            return row[2].upper()
+    return None
+
+
+def rebuild_table(conn, table, create_sql, select_sql):
+    """Replace a table with a new definition, copying rows through select_sql.
+
+    SQLite cannot change a column type in place, so this follows the documented
+    create/copy/drop/rename procedure. Must run inside a transaction.
+    """
+    indexes = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,))]
+    triggers = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,))]
+
+    conn.execute(create_sql.replace(f"CREATE TABLE {table} ", f"CREATE TABLE {table}_new ", 1))
+    conn.execute(f"INSERT INTO {table}_new {select_sql}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    for sql in indexes + triggers:
+        conn.execute(sql)
+
+
+def money_to_cents(conn):
+    """Store treatments.cost and payments.amount as INTEGER cents instead of REAL"""
+    if column_type(conn, 'treatments', 'cost') == 'REAL':
+        rebuild_table(conn, 'treatments', """
+            CREATE TABLE treatments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                record_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                cost INTEGER NOT NULL,
+                date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                notes TEXT,
+                FOREIGN KEY (record_id) REFERENCES records(id)
+            )""", """
+            SELECT id, record_id, name, CAST(ROUND(cost * 100) AS INTEGER), date, notes
+            FROM treatments""")
+
+    if column_type(conn, 'payments', 'amount') == 'REAL':
+        rebuild_table(conn, 'payments', """
+            CREATE TABLE payments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                record_id INTEGER NOT NULL,
+                amount INTEGER NOT NULL,
+                date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                notes TEXT,
+                FOREIGN KEY (record_id) REFERENCES records(id)
+            )""", """
+            SELECT id, record_id, CAST(ROUND(amount * 100) AS INTEGER), date, notes
+            FROM payments""")
+
+
+def normalize_dates(conn):
+    """Store treatment and payment dates as YYYY-MM-DD, defaulting to CURRENT_DATE"""
+    # Values date() cannot parse are kept as they are rather than lost
+    normalized = "CASE WHEN date(date) IS NULL THEN date ELSE date(date) END"
+    rebuild_table(conn, 'treatments', """
+        CREATE TABLE treatments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            record_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            cost INTEGER NOT NULL,
+            date DATE DEFAULT CURRENT_DATE,
+            notes TEXT,
+            FOREIGN KEY (record_id) REFERENCES records(id)
+        )""", f"""
+        SELECT id, record_id, name, cost, {normalized}, notes
+        FROM treatments""")
+    rebuild_table(conn, 'payments', """
+        CREATE TABLE payments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            record_id INTEGER NOT NULL,
+            amount INTEGER NOT NULL,
+            date DATE DEFAULT CURRENT_DATE,
+            notes TEXT,
+            FOREIGN KEY (record_id) REFERENCES records(id)
+        )""", f"""
+        SELECT id, record_id, amount, {normalized}, notes
+        FROM payments""")
+
+
+def rebuild_daily_revenue(conn):
+    """Recompute the daily_revenue rollup from the base tables"""
+    conn.execute("DELETE FROM daily_revenue")
+    conn.execute("""
+        INSERT INTO daily_revenue (day, doctor_id, billed, treatment_count)
+        SELECT t.date, r.doctor_id, SUM(t.cost), COUNT(*)
+        FROM treatments t JOIN records r ON r.id = t.record_id
+        WHERE t.date IS NOT NULL
+        GROUP BY t.date, r.doctor_id
+    """)
+    conn.execute("""
+        INSERT INTO daily_revenue (day, doctor_id, collected, payment_count)
+        SELECT p.date, r.doctor_id, SUM(p.amount), COUNT(*)
+        FROM payments p JOIN records r ON r.id = p.record_id
+        WHERE p.date IS NOT NULL
+        GROUP BY p.date, r.doctor_id
+        ON CONFLICT(day, doctor_id) DO UPDATE SET
+            collected = excluded.collected, payment_count = excluded.payment_count
+    """)
+    conn.execute("""
+        INSERT INTO daily_revenue (day, doctor_id, new_patients)
+        SELECT day, doctor_id, COUNT(*) FROM (
+            SELECT date(created_at) AS day, doctor_id,
+                   ROW_NUMBER() OVER (PARTITION BY patient_id ORDER BY created_at, id) AS n
+            FROM records
+        )
+        WHERE n = 1
+        GROUP BY day, doctor_id
+        ON CONFLICT(day, doctor_id) DO UPDATE SET new_patients = excluded.new_patients
+    """)
+
+
+def covering_record_indexes(conn):
+    """Include the money column in the per-record date indexes so balance queries skip the table"""
+    conn.execute("DROP INDEX IF EXISTS idx_treatments_record_date")
+    conn.execute("CREATE INDEX idx_treatments_record_date ON treatments(record_id, date, cost)")
+    conn.execute("DROP INDEX IF EXISTS idx_payments_record_date")
+    conn.execute("CREATE INDEX idx_payments_record_date ON payments(record_id, date, amount)")
+
+
+def backfill_phone_normalized(conn, table):
+    """Recompute phone_normalized for every row with normalize_phone, the rule the lookups use"""
+    from models.helper import normalize_phone
+
+    conn.execute(f"DROP INDEX IF EXISTS idx_{table}_phone_normalized")
+    seen = set()
+    updates = []
+    duplicates = 0
+    for row_id, phone in conn.execute(f"SELECT id, phone FROM {table} ORDER BY id").fetchall():
+        digits = normalize_phone(phone) or None
+        # Numbers that only differed in formatting: the oldest row keeps its normalized phone
+        if digits in seen:
+            digits = None
+            duplicates += 1
+        elif digits:
+            seen.add(digits)
+        updates.append((digits, row_id))
+    conn.executemany(f"UPDATE {table} SET phone_normalized = ? WHERE id = ?", updates)
+    if duplicates:
+        print(f"{duplicates} {table} share a phone number with another row; "
+              f"their phone_normalized was left empty")
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_phone_normalized "
+                 f"ON {table}(phone_normalized)")
+
+
+def normalize_phones(conn):
+    """Add phone_normalized (digits only) to doctors and patients, backfilled and unique"""
+    conn.execute("DROP INDEX IF EXISTS idx_patients_phone_digits")
+    for table in ('doctors', 'patients'):
+        if column_type(conn, table, 'phone_normalized') is None:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN phone_normalized TEXT")
+        backfill_phone_normalized(conn, table)
+
+
+def phone_digits_in_python(conn):
+    """Drop the phone_normalized triggers; the models set it with normalize_phone now.
+
+    The triggers only stripped a few separators while lookups strip every
+    non-digit, so values written by them are recomputed.
+    """
+    for table in ('doctors', 'patients'):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_phone_insert")
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_phone_update")
+        backfill_phone_normalized(conn, table)
+
+
+# Index i holds the migration that takes the database to version i + 1
+MIGRATIONS = [
+    money_to_cents,
+    normalize_dates,
+    rebuild_daily_revenue,
+    covering_record_indexes,
+    normalize_phones,
+    phone_digits_in_python,
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn):
+    """Apply every pending migration, each in its own transaction"""
+    version = get_version(conn)
+    for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                raise RuntimeError(f"Migration {target} left {len(violations)} foreign key violations")
+            set_version(conn, target)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return get_version(conn)
@@ -7,7 +7,8 @@ CREATE TABLE IF NOT EXISTS doctors (
     name TEXT UNIQUE NOT NULL,
     phone TEXT UNIQUE,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    deleted_at DATETIME
+    deleted_at DATETIME,
+    phone_normalized TEXT  -- digits only, set by the models (models.helper.normalize_phone)
 );
 
 -- Patients Table
@@ -19,7 +20,8 @@ CREATE TABLE IF NOT EXISTS patients (
     birth_date DATE,
     notes TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    deleted_at DATETIME
+    deleted_at DATETIME,
+    phone_normalized TEXT  -- digits only, set by the models (models.helper.normalize_phone)
 );
 
 -- Records Table
@@ -38,8 +40,8 @@ CREATE TABLE IF NOT EXISTS treatments (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     record_id INTEGER NOT NULL,
     name TEXT NOT NULL,
-    cost REAL NOT NULL,
-    date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    cost INTEGER NOT NULL,  -- cents
+    date DATE DEFAULT CURRENT_DATE,  -- YYYY-MM-DD
     notes TEXT,
     FOREIGN KEY (record_id) REFERENCES records(id)
 );
@@ -48,11 +50,123 @@ CREATE TABLE IF NOT EXISTS treatments (
 CREATE TABLE IF NOT EXISTS payments (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     record_id INTEGER NOT NULL,
-    amount REAL NOT NULL,
-    date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    amount INTEGER NOT NULL,  -- cents
+    date DATE DEFAULT CURRENT_DATE,  -- YYYY-MM-DD
     notes TEXT,
     FOREIGN KEY (record_id) REFERENCES records(id)
 );
+
+-- Date range indexes
+CREATE INDEX IF NOT EXISTS idx_treatments_date ON treatments(date);
+CREATE INDEX IF NOT EXISTS idx_treatments_record_date ON treatments(record_id, date, cost);
+CREATE INDEX IF NOT EXISTS idx_payments_date ON payments(date);
+CREATE INDEX IF NOT EXISTS idx_payments_record_date ON payments(record_id, date, amount);
+CREATE INDEX IF NOT EXISTS idx_records_patient_created ON records(patient_id, created_at);
+
+-- Type-ahead name search; LIKE 'prefix%' can only use an index in NOCASE order
+CREATE INDEX IF NOT EXISTS idx_doctors_name_nocase ON doctors(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_patients_name_nocase ON patients(name COLLATE NOCASE);
+
+-- Daily revenue rollup, one row per day and doctor, kept current by the triggers below
+CREATE TABLE IF NOT EXISTS daily_revenue (
+    day TEXT NOT NULL,  -- YYYY-MM-DD
+    doctor_id INTEGER NOT NULL,
+    billed INTEGER NOT NULL DEFAULT 0,  -- cents
+    collected INTEGER NOT NULL DEFAULT 0,  -- cents
+    treatment_count INTEGER NOT NULL DEFAULT 0,
+    payment_count INTEGER NOT NULL DEFAULT 0,
+    new_patients INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, doctor_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_treatments_rollup_insert AFTER INSERT ON treatments
+BEGIN
+    INSERT INTO daily_revenue (day, doctor_id, billed, treatment_count)
+    SELECT NEW.date, doctor_id, NEW.cost, 1 FROM records WHERE id = NEW.record_id AND NEW.date IS NOT NULL
+    ON CONFLICT(day, doctor_id) DO UPDATE SET
+        billed = billed + excluded.billed, treatment_count = treatment_count + excluded.treatment_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_treatments_rollup_delete AFTER DELETE ON treatments
+BEGIN
+    UPDATE daily_revenue SET billed = billed - OLD.cost, treatment_count = treatment_count - 1
+    WHERE day = OLD.date AND doctor_id = (SELECT doctor_id FROM records WHERE id = OLD.record_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_treatments_rollup_update AFTER UPDATE OF record_id, cost, date ON treatments
+BEGIN
+    UPDATE daily_revenue SET billed = billed - OLD.cost, treatment_count = treatment_count - 1
+    WHERE day = OLD.date AND doctor_id = (SELECT doctor_id FROM records WHERE id = OLD.record_id);
+    INSERT INTO daily_revenue (day, doctor_id, billed, treatment_count)
+    SELECT NEW.date, doctor_id, NEW.cost, 1 FROM records WHERE id = NEW.record_id AND NEW.date IS NOT NULL
+    ON CONFLICT(day, doctor_id) DO UPDATE SET
+        billed = billed + excluded.billed, treatment_count = treatment_count + excluded.treatment_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_payments_rollup_insert AFTER INSERT ON payments
+BEGIN
+    INSERT INTO daily_revenue (day, doctor_id, collected, payment_count)
+    SELECT NEW.date, doctor_id, NEW.amount, 1 FROM records WHERE id = NEW.record_id AND NEW.date IS NOT NULL
+    ON CONFLICT(day, doctor_id) DO UPDATE SET
+        collected = collected + excluded.collected, payment_count = payment_count + excluded.payment_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_payments_rollup_delete AFTER DELETE ON payments
+BEGIN
+    UPDATE daily_revenue SET collected = collected - OLD.amount, payment_count = payment_count - 1
+    WHERE day = OLD.date AND doctor_id = (SELECT doctor_id FROM records WHERE id = OLD.record_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_payments_rollup_update AFTER UPDATE OF record_id, amount, date ON payments
+BEGIN
+    UPDATE daily_revenue SET collected = collected - OLD.amount, payment_count = payment_count - 1
+    WHERE day = OLD.date AND doctor_id = (SELECT doctor_id FROM records WHERE id = OLD.record_id);
+    INSERT INTO daily_revenue (day, doctor_id, collected, payment_count)
+    SELECT NEW.date, doctor_id, NEW.amount, 1 FROM records WHERE id = NEW.record_id AND NEW.date IS NOT NULL
+    ON CONFLICT(day, doctor_id) DO UPDATE SET
+        collected = collected + excluded.collected, payment_count = payment_count + excluded.payment_count;
+END;
+
+-- A patient counts as new on the day (and for the doctor) of their earliest record
+CREATE TRIGGER IF NOT EXISTS trg_records_rollup_insert AFTER INSERT ON records
+WHEN NOT EXISTS (
+    SELECT 1 FROM records WHERE patient_id = NEW.patient_id AND id != NEW.id
+      AND (created_at, id) < (NEW.created_at, NEW.id)
+)
+BEGIN
+    -- The record that used to be first, if NEW was dated before it
+    INSERT INTO daily_revenue (day, doctor_id, new_patients)
+    SELECT date(created_at), doctor_id, -1 FROM records
+    WHERE patient_id = NEW.patient_id AND id != NEW.id
+    ORDER BY created_at, id LIMIT 1
+    ON CONFLICT(day, doctor_id) DO UPDATE SET new_patients = new_patients + excluded.new_patients;
+    INSERT INTO daily_revenue (day, doctor_id, new_patients)
+    VALUES (date(NEW.created_at), NEW.doctor_id, 1)
+    ON CONFLICT(day, doctor_id) DO UPDATE SET new_patients = new_patients + excluded.new_patients;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_records_rollup_delete AFTER DELETE ON records
+WHEN NOT EXISTS (
+    SELECT 1 FROM records WHERE patient_id = OLD.patient_id
+      AND (created_at, id) < (OLD.created_at, OLD.id)
+)
+BEGIN
+    UPDATE daily_revenue SET new_patients = new_patients - 1
+    WHERE day = date(OLD.created_at) AND doctor_id = OLD.doctor_id;
+    -- The next record becomes the patient's first
+    INSERT INTO daily_revenue (day, doctor_id, new_patients)
+    SELECT date(created_at), doctor_id, 1 FROM records
+    WHERE patient_id = OLD.patient_id
+    ORDER BY created_at, id LIMIT 1
+    ON CONFLICT(day, doctor_id) DO UPDATE SET new_patients = new_patients + excluded.new_patients;
+END;
+"""
+
+# Objects on columns that existing databases only gain in a migration. init_db
+# runs this after migrating, since SCHEMA_SQL runs first and must work on every version.
+POST_MIGRATION_SQL = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_doctors_phone_normalized ON doctors(phone_normalized);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_patients_phone_normalized ON patients(phone_normalized);
 """
 
 
@@ -0,0 +1,207 @@
+"""
+Full data export for DentaSys
+Streams each table, and a records-with-totals view, to CSV or JSON Lines.
+Rows are pulled from the cursor with fetchmany and written straight out, so
+memory stays flat however large the table is. Output can be gzip compressed
+"""
+import csv
+import gzip
+import os
+
+from database.connection import get_db_connection
+
+FORMATS = ('csv', 'jsonl')
+
+
+def money(column):
+    """Cents column as a decimal amount string; exact for any realistic total"""
+    return f"printf('%.2f', ({column}) / 100.0)"
+
+
+# name: ([(output column, SQL expression)], rest of the query). Values are
+# formatted in SQL, and JSON Lines rows are built with json_object, so Python
+# only moves finished rows to the file. Every query has a stable order so
+# monthly exports diff cleanly.
+DATASETS = {
+    'doctors': (
+        [('id', 'id'), ('name', 'name'), ('phone', 'phone'),
+         ('created_at', 'created_at'), ('deleted_at', 'deleted_at')],
+        "FROM doctors ORDER BY id"
+    ),
+    'patients': (
+        [('id', 'id'), ('name', 'name'), ('phone', 'phone'), ('gender', 'gender'),
+         ('birth_date', 'birth_date'), ('notes', 'notes'),
+         ('created_at', 'created_at'), ('deleted_at', 'deleted_at')],
+        "FROM patients ORDER BY id"
+    ),
+    'records': (
+        [('id', 'id'), ('doctor_id', 'doctor_id'), ('patient_id', 'patient_id'),
+         ('created_at', 'created_at')],
+        "FROM records ORDER BY id"
+    ),
+    'treatments': (
+        [('id', 'id'), ('record_id', 'record_id'), ('name', 'name'), ('cost', money('cost')),
+         ('date', 'date'), ('notes', 'notes')],
+        "FROM treatments ORDER BY id"
+    ),
+    'payments': (
+        [('id', 'id'), ('record_id', 'record_id'), ('amount', money('amount')),
+         ('date', 'date'), ('notes', 'notes')],
+        "FROM payments ORDER BY id"
+    ),
+    # One row per record with names and totals, for spreadsheets that cannot join
+    'records_summary': (
+        [('record_id', 'r.id'), ('created_at', 'r.created_at'),
+         ('doctor_id', 'd.id'), ('doctor_name', 'd.name'),
+         ('patient_id', 'p.id'), ('patient_name', 'p.name'), ('patient_phone', 'p.phone'),
+         ('total_cost', money('COALESCE(t.total_cost, 0)')),
+         ('total_paid', money('COALESCE(pay.total_paid, 0)')),
+         ('balance', money('COALESCE(t.total_cost, 0) - COALESCE(pay.total_paid, 0)'))],
+        """
+        FROM records r
+        JOIN doctors d ON d.id = r.doctor_id
+        JOIN patients p ON p.id = r.patient_id
+        LEFT JOIN (SELECT record_id, SUM(cost) AS total_cost
+                   FROM treatments GROUP BY record_id) t ON t.record_id = r.id
+        LEFT JOIN (SELECT record_id, SUM(amount) AS total_paid
+                   FROM payments GROUP BY record_id) pay ON pay.record_id = r.id
+        ORDER BY r.id
+        """
+    ),
+}
+
+# Table whose row count is the dataset's, for the progress bar
+COUNT_TABLES = {'records_summary': 'records'}
+
+# Rows pulled from the cursor per fetchmany call
+BATCH_SIZE = 1000
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class DataExportSummary:
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = {}  # dataset name: (path, rows written)
+
+    @property
+    def rows(self):
+        return sum(count for path, count in self.files.values())
+
+
+def dataset_query(name, fmt):
+    """SELECT for a dataset: one column per field for CSV, one JSON object per row for JSON Lines"""
+    columns, rest = DATASETS[name]
+    if fmt == 'csv':
+        select = ", ".join(f'{expression} AS "{column}"' for column, expression in columns)
+    else:
+        select = "json_object(" + ", ".join(f"'{column}', {expression}" for column, expression in columns) + ")"
+    return f"SELECT {select} {rest}"
+
+
+def export_filename(name, fmt, compress=False):
+    return f"{name}.{fmt}" + (".gz" if compress else "")
+
+
+def open_output(filename, compress=False):
+    """Text file for writing, gzip compressed when asked"""
+    if compress:
+        # Level 6 is gzip's own default: most of the size win for far less time than 9
+        return gzip.open(filename, 'wt', compresslevel=6, encoding='utf-8', newline='')
+    # BOM so Excel reads Arabic names; JSON Lines readers expect plain UTF-8
+    encoding = 'utf-8-sig' if filename.endswith('.csv') else 'utf-8'
+    return open(filename, 'w', encoding=encoding, newline='')
+
+
+def write_rows(cursor, out, fmt, progress=None, cancel_event=None):
+    """Write every row of an executed cursor to out; returns the row count"""
+    if fmt == 'csv':
+        writer = csv.writer(out)
+        writer.writerow([column[0] for column in cursor.description])
+
+    count = 0
+    while True:
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        batch = cursor.fetchmany(BATCH_SIZE)
+        if not batch:
+            return count
+        if fmt == 'csv':
+            writer.writerows(batch)
+        else:
+            out.writelines(row[0] + "\n" for row in batch)
+        count += len(batch)
+        if progress:
+            progress(count)
+
+
+def export_dataset(conn, name, filename, fmt='csv', compress=False, progress=None, cancel_event=None):
+    """Stream one dataset to filename; returns the number of rows written"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    cursor = conn.execute(dataset_query(name, fmt))
+    try:
+        with open_output(filename, compress) as out:
+            return write_rows(cursor, out, fmt, progress, cancel_event)
+    except BaseException:
+        # Leave no half-written file behind
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        raise
+    finally:
+        cursor.close()
+
+
+def export_all(directory, names=None, fmt='csv', compress=False, progress=None, cancel_event=None):
+    """Export datasets (all by default) into directory as <name>.<fmt>[.gz].
+
+    In WAL mode (as under the DentaSys server) all datasets are read inside
+    one transaction, so they form a consistent snapshot while others keep
+    writing. With the default rollback journal an open read blocks every
+    writer, so each dataset is read in its own transaction instead and the
+    files may differ by what was saved in between. progress is called with
+    (fraction, dataset name). Returns a DataExportSummary.
+    """
+    names = list(names or DATASETS)
+    for name in names:
+        if name not in DATASETS:
+            raise ValueError(f"Unknown dataset: {name}")
+    os.makedirs(directory, exist_ok=True)
+    summary = DataExportSummary(directory)
+
+    # Stored text is written as is, so skip the date converters
+    conn = get_db_connection(detect_types=0)
+    conn.row_factory = None
+    try:
+        snapshot = conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+        if snapshot:
+            conn.execute("BEGIN")
+        counts = {}
+        if progress:
+            for name in names:
+                table = COUNT_TABLES.get(name, name)
+                counts[name] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        total = max(sum(counts.values()), 1)
+        done = 0
+        for name in names:
+            filename = os.path.join(directory, export_filename(name, fmt, compress))
+            if progress:
+                def on_rows(count, name=name, before=done):
+                    progress(min((before + count) / total, 1.0), name)
+            else:
+                on_rows = None
+            if not snapshot:
+                conn.execute("BEGIN")
+            summary.files[name] = (filename, export_dataset(conn, name, filename, fmt, compress,
+                                                            on_rows, cancel_event))
+            if not snapshot:
+                conn.rollback()  # release the read lock so waiting writers can commit
+            done += counts.get(name, 0)
+        return summary
+    finally:
+        conn.rollback()
+        conn.close()
@@ -0,0 +1,293 @@
+"""
+Bulk patient and doctor import for DentaSys
+Streams rows from a CSV or XLSX file, maps columns to fields, normalizes and
+validates each row, and inserts the accepted rows with chunked executemany in
+one transaction. Rows that clash with an existing name or phone, or with an
+earlier row of the file, are skipped and listed in the summary
+"""
+import csv
+import re
+from datetime import date, datetime, timedelta
+
+from database.connection import get_db_connection
+from dataio.xlsx import XlsxTable
+from localization.translations import translations
+from models.helper import normalize_phone
+
+# Fields each table accepts, in insert order
+FIELDS = {
+    'patients': ('name', 'phone', 'gender', 'birth_date', 'notes'),
+    'doctors': ('name', 'phone'),
+}
+
+REQUIRED = {
+    'patients': ('name', 'phone'),
+    'doctors': ('name',),
+}
+
+# Lower-cased header texts recognised for each field when guessing the mapping
+HEADER_ALIASES = {
+    'name': ('name', 'full name', 'patient', 'patient name', 'doctor', 'doctor name', 'الاسم', 'اسم المريض', 'اسم الطبيب'),
+    'phone': ('phone', 'phone number', 'mobile', 'telephone', 'tel', 'الهاتف', 'رقم الهاتف', 'الجوال'),
+    'gender': ('gender', 'sex', 'الجنس'),
+    'birth_date': ('birth_date', 'birth date', 'date of birth', 'dob', 'birthday', 'تاريخ الميلاد'),
+    'notes': ('notes', 'note', 'comments', 'ملاحظات'),
+}
+
+GENDERS = {
+    'male': 'Male', 'm': 'Male', 'ذكر': 'Male',
+    'female': 'Female', 'f': 'Female', 'أنثى': 'Female', 'انثى': 'Female',
+}
+
+# Day-first layouts seen in clinic spreadsheets, tried after ISO
+DATE_FORMATS = ('%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y')
+
+# Excel stores dates as days since 1899-12-30
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# Same limits PatientForm applies to a typed phone number
+PHONE_DIGITS = (10, 15)
+
+CHUNK_SIZE = 1000
+
+
+def field_label(field):
+    return translations.get(f'import_field_{field}')
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class ImportSummary:
+    def __init__(self, table):
+        self.table = table
+        self.total = 0
+        self.imported = 0
+        self.errors = []  # (line number, message) pairs
+
+    @property
+    def skipped(self):
+        return len(self.errors)
+
+
+class CsvTable:
+    """Rows of a CSV file as lists of strings; the delimiter is sniffed from the first lines"""
+
+    def __init__(self, path):
+        # utf-8-sig drops the BOM Excel writes in front of UTF-8 CSV files
+        self.file = open(path, newline='', encoding='utf-8-sig')
+        sample = self.file.read(64 * 1024)
+        self.file.seek(0)
+        try:
+            self.dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            self.dialect = csv.excel
+        self.size = max(self.file.buffer.seek(0, 2), 1)
+        self.file.buffer.seek(0)
+
+    def __iter__(self):
+        return csv.reader(self.file, self.dialect)
+
+    def fraction(self):
+        # The text layer refuses tell() while iterating; the byte buffer is close enough
+        return min(self.file.buffer.tell() / self.size, 1.0)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_table(path):
+    """CsvTable or XlsxTable for path, chosen by extension"""
+    if str(path).lower().endswith('.xlsx'):
+        return XlsxTable(path)
+    return CsvTable(path)
+
+
+def read_header(path):
+    """Column names from the first row of the file"""
+    with open_table(path) as table:
+        for row in table:
+            return [cell.strip() for cell in row]
+    return []
+
+
+def guess_mapping(header, table):
+    """{field: column index} for the columns whose header names a field"""
+    mapping = {}
+    columns = [" ".join(cell.lower().replace('_', ' ').split()) for cell in header]
+    for field in FIELDS[table]:
+        aliases = {" ".join(alias.replace('_', ' ').split()) for alias in HEADER_ALIASES[field]}
+        for index, column in enumerate(columns):
+            if column in aliases and index not in mapping.values():
+                mapping[field] = index
+                break
+    return mapping
+
+
+def parse_birth_date(text):
+    """Birth date from ISO, a day-first layout or an Excel date serial; None when unparseable"""
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        pass
+    for layout in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, layout).date()
+        except ValueError:
+            pass
+    if re.fullmatch(r'\d+(\.0+)?', text):
+        serial = int(float(text))
+        if 0 < serial < 2958466:  # 9999-12-31
+            return EXCEL_EPOCH + timedelta(days=serial)
+    return None
+
+
+def normalize_row(values, table):
+    """Cleaned field values, or raise ValueError with a message for the error report"""
+    row = {field: " ".join(values.get(field, '').split()) for field in FIELDS[table]}
+    for field in REQUIRED[table]:
+        if not row[field]:
+            raise ValueError(translations.get('import_missing_value', field=field_label(field)))
+
+    if len(row['name']) < 2 or len(row['name']) > 100:
+        raise ValueError(translations.get('import_invalid_name', value=row['name']))
+
+    digits = normalize_phone(row['phone'])
+    if row['phone']:
+        low, high = PHONE_DIGITS
+        if not low <= len(digits) <= high or not re.fullmatch(r'[\d+\-\s().]+', row['phone']):
+            raise ValueError(translations.get('import_invalid_phone', value=row['phone']))
+    row['phone'] = row['phone'] or None
+    row['phone_normalized'] = digits or None
+
+    if table == 'patients':
+        gender = row['gender']
+        row['gender'] = GENDERS.get(gender.lower()) if gender else None
+        if gender and row['gender'] is None:
+            raise ValueError(translations.get('import_invalid_gender', value=gender))
+
+        birth_date = row['birth_date']
+        row['birth_date'] = parse_birth_date(birth_date) if birth_date else None
+        if birth_date and (row['birth_date'] is None or row['birth_date'] > date.today()):
+            raise ValueError(translations.get('import_invalid_date', value=birth_date))
+        row['notes'] = values.get('notes', '').strip() or None
+    return row
+
+
+def find_existing(conn, table, rows):
+    """Names and normalized phones of rows that are already taken in the database.
+
+    The chunk's keys go through a temp table so both lookups are joins on the
+    unique name and phone_normalized indexes.
+    """
+    conn.execute("DELETE FROM import_keys")
+    conn.executemany("INSERT INTO import_keys (name, phone_normalized) VALUES (?, ?)",
+                     ((row['name'], row['phone_normalized']) for row in rows))
+    names = {name for name, in conn.execute(
+        f"SELECT t.name FROM import_keys k JOIN {table} t ON t.name = k.name")}
+    phones = {phone for phone, in conn.execute(
+        f"SELECT t.phone_normalized FROM import_keys k JOIN {table} t ON t.phone_normalized = k.phone_normalized")}
+    return names, phones
+
+
+def insert_chunk(conn, table, chunk, summary):
+    """Insert the rows of chunk that do not clash with existing rows"""
+    names, phones = find_existing(conn, table, [row for line, row in chunk])
+    accepted = []
+    for line, row in chunk:
+        if row['name'] in names:
+            summary.errors.append((line, translations.get('import_duplicate_existing', field=field_label('name'), value=row['name'])))
+        elif row['phone_normalized'] in phones:
+            summary.errors.append((line, translations.get('import_duplicate_existing', field=field_label('phone'), value=row['phone'])))
+        else:
+            accepted.append(row)
+    fields = FIELDS[table] + ('phone_normalized',)
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+        (tuple(row[field] for field in fields) for row in accepted)
+    )
+    summary.imported += len(accepted)
+
+
+def import_file(path, table, mapping, progress=None, cancel_event=None):
+    """Import the rows of a CSV or XLSX file into patients or doctors.
+
+    mapping is {field: column index}; the first row of the file is the header.
+    Everything is inserted in one transaction, so a cancelled or failed import
+    leaves the database untouched. Returns an ImportSummary.
+    """
+    if table not in FIELDS:
+        raise ValueError(f"Cannot import into {table}")
+    summary = ImportSummary(table)
+    # Names and phones already used by earlier rows of the file
+    seen_names = set()
+    seen_phones = set()
+
+    conn = get_db_connection()
+    try:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS import_keys (name TEXT, phone_normalized TEXT)")
+        conn.execute("BEGIN")
+        with open_table(path) as rows:
+            chunk = []
+            for line, values in enumerate(rows, start=1):
+                if line == 1:
+                    continue  # header
+                if not any(cell.strip() for cell in values):
+                    continue
+                summary.total += 1
+                try:
+                    row = normalize_row(
+                        {field: values[index] if index < len(values) else '' for field, index in mapping.items()},
+                        table
+                    )
+                except ValueError as e:
+                    summary.errors.append((line, str(e)))
+                    continue
+
+                if row['name'] in seen_names:
+                    summary.errors.append((line, translations.get('import_duplicate_in_file', field=field_label('name'), value=row['name'])))
+                    continue
+                if row['phone_normalized'] and row['phone_normalized'] in seen_phones:
+                    summary.errors.append((line, translations.get('import_duplicate_in_file', field=field_label('phone'), value=row['phone'])))
+                    continue
+                seen_names.add(row['name'])
+                if row['phone_normalized']:
+                    seen_phones.add(row['phone_normalized'])
+
+                chunk.append((line, row))
+                if len(chunk) >= CHUNK_SIZE:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ImportCancelled()
+                    insert_chunk(conn, table, chunk, summary)
+                    chunk = []
+                    if progress:
+                        progress(rows.fraction())
+            if chunk:
+                insert_chunk(conn, table, chunk, summary)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ImportCancelled()
+        conn.commit()
+        if progress:
+            progress(1.0)
+        summary.errors.sort()
+        return summary
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def write_error_report(summary, filename):
+    """Write the skipped rows of an import to a CSV file"""
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:  # BOM so Excel reads Arabic text
+        writer = csv.writer(f)
+        writer.writerow(['line', 'error'])
+        writer.writerows(summary.errors)
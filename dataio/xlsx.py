@@ -0,0 +1,141 @@
+"""
+Minimal streaming XLSX reader for DentaSys
+Reads the first worksheet straight from the zip with iterparse, so a large
+sheet is never held in memory and no spreadsheet library is needed
+"""
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+CELL_REF = re.compile(r'([A-Z]+)')
+
+
+def column_index(ref):
+    """Zero-based column of a cell reference such as 'C12'"""
+    index = 0
+    for letter in CELL_REF.match(ref).group(1):
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def number_text(value):
+    """Excel stores every number as a float; whole numbers are shown without '.0'"""
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return str(int(number)) if number.is_integer() else value
+
+
+class XlsxTable:
+    """Rows of the first worksheet as lists of strings.
+
+    fraction() reports how far through the sheet's XML the reader is,
+    for progress bars.
+    """
+
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path)
+        try:
+            self.shared_strings = self.read_shared_strings()
+            self.sheet_info = self.zip.getinfo(self.first_sheet())
+        except (KeyError, ET.ParseError) as e:
+            self.zip.close()
+            raise ValueError(f"Not a readable XLSX workbook: {e}")
+        self.stream = None
+
+    def first_sheet(self):
+        """Archive path of the first sheet listed in the workbook"""
+        workbook = ET.fromstring(self.zip.read('xl/workbook.xml'))
+        sheet = workbook.find(f'{NS}sheets/{NS}sheet')
+        rel_id = sheet.get(f'{REL_NS}id')
+        rels = ET.fromstring(self.zip.read('xl/_rels/workbook.xml.rels'))
+        for rel in rels.iter(f'{PKG_REL_NS}Relationship'):
+            if rel.get('Id') == rel_id:
+                target = rel.get('Target')
+                if target.startswith('/'):
+                    return target.lstrip('/')
+                return posixpath.normpath(posixpath.join('xl', target))
+        raise KeyError(rel_id)
+
+    def read_shared_strings(self):
+        try:
+            data = self.zip.open('xl/sharedStrings.xml')
+        except KeyError:
+            return []
+        strings = []
+        with data:
+            for event, element in ET.iterparse(data):
+                if element.tag == f'{NS}si':
+                    strings.append(self.rich_text(element))
+                    element.clear()
+        return strings
+
+    @staticmethod
+    def rich_text(element):
+        """Text of an <si> or <is> element; rich text is split into runs and phonetic hints are skipped"""
+        parts = []
+        for child in element:
+            if child.tag == f'{NS}t':
+                parts.append(child.text or '')
+            elif child.tag == f'{NS}r':
+                parts.append(child.findtext(f'{NS}t') or '')
+        return ''.join(parts)
+
+    def cell_text(self, cell):
+        kind = cell.get('t')
+        if kind == 'inlineStr':
+            inline = cell.find(f'{NS}is')
+            return self.rich_text(inline) if inline is not None else ''
+        value = cell.findtext(f'{NS}v')
+        if value is None:
+            return ''
+        if kind == 's':
+            return self.shared_strings[int(value)]
+        if kind == 'b':
+            return 'TRUE' if value == '1' else 'FALSE'
+        if kind in ('str', 'e'):
+            return value
+        return number_text(value)
+
+    def __iter__(self):
+        self.stream = self.zip.open(self.sheet_info)
+        sheet_data = None
+        with self.stream:
+            for event, element in ET.iterparse(self.stream, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == f'{NS}sheetData':
+                        sheet_data = element
+                    continue
+                if element.tag != f'{NS}row':
+                    continue
+                row = []
+                for cell in element.iter(f'{NS}c'):
+                    ref = cell.get('r')
+                    if ref:
+                        # Empty cells are left out of the XML; pad to the referenced column
+                        row.extend([''] * (column_index(ref) - len(row)))
+                    row.append(self.cell_text(cell))
+                # Drop the finished row so the tree never grows past one row
+                if sheet_data is not None:
+                    sheet_data.remove(element)
+                yield row
+
+    def fraction(self):
+        if self.stream is None or not self.sheet_info.file_size:
+            return 0.0
+        return min(self.stream.tell() / self.sheet_info.file_size, 1.0)
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,9 +5,13 @@ from gui.pages.home_page import HomePage
 from gui.pages.doctors_page import DoctorsPage
 from gui.pages.patients_page import PatientsPage
 from gui.pages.records_page import RecordsPage
+from gui.pages.reports_page import ReportsPage
 from gui.widgets.language_switch import LanguageSwitch
+from gui.watchdog import EventLoopWatchdog
 from gui.styles import apply_styles
+from database import connection
 from database.schema import create_schema
+from database.backup import BackupScheduler
 from localization.translations import translations
 
 
@@ -31,13 +35,15 @@ class MainWindow:
         # Set minimum size for when not maximized
         self.root.minsize(1200, 800)
         
-        # Initialize database
-        create_schema()
+        # Initialize database; a server keeps its own schema up to date
+        if not connection.REMOTE:
+            create_schema()
         
         # Apply modern styling
         apply_styles(self.root)
         
-        # Register for language change notifications
+        # Register for language change notifications, delivered together in one idle pass
+        translations.set_scheduler(self.root.after_idle)
         translations.add_observer(self.update_ui)
         
         # Create main container
@@ -49,6 +55,12 @@ class MainWindow:
         # Apply initial RTL/LTR layout
         self.apply_text_direction()
         
+        # Log event-loop stalls with the blocking handler's stack
+        self.watchdog = EventLoopWatchdog(self.root)
+        
+        # Daily online backups on a background thread
+        self.backups = BackupScheduler()
+        
     def setup_ui(self):
         # Main container with minimal padding for full width usage
         self.main_frame = ttk.Frame(self.root, padding="10")
@@ -107,6 +119,10 @@ class MainWindow:
         self.records_page = RecordsPage(self.notebook)
         self.notebook.add(self.records_page.frame, text=translations.get('tab_records'), padding=0)
         
+        # Reports Page
+        self.reports_page = ReportsPage(self.notebook)
+        self.notebook.add(self.reports_page.frame, text=translations.get('tab_reports'), padding=0)
+        
     def apply_text_direction(self):
         """Apply RTL or LTR text direction based on current language"""
         is_rtl = translations.is_rtl()
@@ -157,12 +173,16 @@ class MainWindow:
         self.notebook.tab(1, text=translations.get('tab_doctors'))
         self.notebook.tab(2, text=translations.get('tab_patients'))
         self.notebook.tab(3, text=translations.get('tab_records'))
+        self.notebook.tab(4, text=translations.get('tab_reports'))
         
         # Apply text direction changes
         self.apply_text_direction()
         
-        # Force UI refresh
-        self.root.update_idletasks()
-        
     def run(self):
-        self.root.mainloop()
\ No newline at end of file
+        self.watchdog.start()
+        self.backups.start()
+        try:
+            self.root.mainloop()
+        finally:
+            self.backups.stop()
+            self.watchdog.stop()
\ No newline at end of file
@@ -3,6 +3,7 @@ from tkinter import ttk
 import threading
 import time
 from models import Doctor, Patient, Record
+from gui.scrolling import register_scrollable
 from localization.translations import translations
 
 
@@ -46,8 +47,8 @@ class HomePage:
         self.frame.columnconfigure(0, weight=1)
         self.frame.rowconfigure(0, weight=1)
         
-        # Bind mousewheel to canvas for full page scrolling
-        self.bind_mousewheel()
+        # The wheel scrolls this canvas anywhere over its content
+        register_scrollable(self.main_canvas)
         
         # Set up the content frame structure with full width
         self.content_frame = self.scrollable_frame
@@ -65,27 +66,6 @@ class HomePage:
         # Load initial data
         self.load_dashboard_stats()
         
-    def bind_mousewheel(self):
-        """Bind mousewheel events to the main canvas for full page scrolling"""
-        def _on_mousewheel(event):
-            self.main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        # Bind to multiple widgets to ensure scrolling works everywhere
-        self.main_canvas.bind("<MouseWheel>", _on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Bind to the frame itself
-        self.frame.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Function to bind mousewheel to all child widgets recursively
-        def bind_to_children(widget):
-            widget.bind("<MouseWheel>", _on_mousewheel)
-            for child in widget.winfo_children():
-                bind_to_children(child)
-        
-        # Bind after a short delay to ensure all widgets are created
-        self.frame.after(100, lambda: bind_to_children(self.scrollable_frame))
-        
     def setup_welcome_section(self):
         # Welcome frame with full width and minimal padding
         welcome_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
@@ -320,9 +300,6 @@ class HomePage:
         self.results_notebook.tab(1, text=translations.get('tab_patients'))
         self.results_notebook.tab(2, text=translations.get('tab_records'))
         
-        # Re-bind mousewheel after UI updates
-        self.frame.after(100, self.bind_mousewheel)
-        
     def load_dashboard_stats(self):
         """Load dashboard statistics"""
         try:
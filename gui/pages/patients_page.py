@@ -1,7 +1,11 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from database import connection
 from models import Patient
 from gui.widgets.patient_form import PatientForm
+from gui.widgets.import_form import ImportForm
+from gui.widgets.export_progress import ExportProgressDialog
+from gui.scrolling import register_scrollable
 from localization.translations import translations
 
 
@@ -44,8 +48,8 @@ class PatientsPage:
         self.frame.columnconfigure(0, weight=1)
         self.frame.rowconfigure(0, weight=1)
         
-        # Bind mousewheel to canvas for full page scrolling
-        self.bind_mousewheel()
+        # The wheel scrolls this canvas anywhere over its content
+        register_scrollable(self.main_canvas)
         
         # Set up the content frame structure with full width
         self.content_frame = self.scrollable_frame
@@ -57,25 +61,6 @@ class PatientsPage:
         # Content frame
         self.setup_content()
         
-    def bind_mousewheel(self):
-        """Bind mousewheel events for full page scrolling"""
-        def _on_mousewheel(event):
-            self.main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        # Bind to multiple widgets to ensure scrolling works everywhere
-        self.main_canvas.bind("<MouseWheel>", _on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
-        self.frame.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Function to bind mousewheel to all child widgets recursively
-        def bind_to_children(widget):
-            widget.bind("<MouseWheel>", _on_mousewheel)
-            for child in widget.winfo_children():
-                bind_to_children(child)
-        
-        # Bind after a short delay to ensure all widgets are created
-        self.frame.after(100, lambda: bind_to_children(self.scrollable_frame))
-        
     def setup_header(self):
         header_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
         header_frame.grid(row=0, column=0, sticky="ew", pady=(0, 15))
@@ -118,6 +103,16 @@ class PatientsPage:
         )
         self.delete_btn.pack(side='right', ipadx=15, ipady=8)
         
+        # Import from a spreadsheet (writes the database file directly, so not
+        # offered while connected to a server)
+        self.import_btn = ttk.Button(
+            buttons_frame, 
+            text=translations.get('import_patients'),
+            command=self.import_patients,
+            state='disabled' if connection.REMOTE else 'normal'
+        )
+        self.import_btn.pack(side='right', padx=(0, 15), ipadx=15, ipady=8)
+        
     def setup_content(self):
         # Content frame with full width and minimal padding
         content_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
@@ -177,6 +172,7 @@ class PatientsPage:
         self.add_btn.config(text=translations.get('add_patient'))
         self.edit_btn.config(text=translations.get('edit_patient'))
         self.delete_btn.config(text=translations.get('delete_patient'))
+        self.import_btn.config(text=translations.get('import_patients'))
         
         # Update search
         self.search_label.config(text=translations.get('search_patients'))
@@ -190,9 +186,6 @@ class PatientsPage:
         # Reload data to update gender translations
         self.load_patients()
         
-        # Re-bind mousewheel after UI updates
-        self.frame.after(100, self.bind_mousewheel)
-        
     def load_patients(self, search_term=None):
         """Load patients data into the table"""
         # Clear existing data
@@ -263,6 +256,11 @@ class PatientsPage:
     def add_patient(self):
         """Open add patient dialog"""
         dialog = PatientForm(self.content_frame, title=translations.get('add_new_patient'))
+        if dialog.existing_patient:
+            # Staff picked a matching patient instead of creating a duplicate
+            self.selected_patient = dialog.existing_patient
+            self.edit_patient()
+            return
         if dialog.result:
             try:
                 Patient.create(
@@ -279,6 +277,52 @@ class PatientsPage:
             except Exception as e:
                 messagebox.showerror(translations.get('error'), translations.get('failed_to_add', item='patient', error=str(e)))
                 
+    def import_patients(self):
+        """Bulk add patients from a CSV or XLSX file"""
+        from dataio.importer import import_file, write_error_report
+        
+        form = ImportForm(self.content_frame, 'patients', title=translations.get('import_patients'))
+        if not form.result:
+            return
+        options = form.result
+        
+        def task(progress, cancel_event):
+            return import_file(options['path'], 'patients', options['mapping'],
+                               progress=progress, cancel_event=cancel_event)
+            
+        def on_success(summary):
+            self.load_patients()
+            message = translations.get('import_summary', imported=summary.imported,
+                                       total=summary.total, skipped=summary.skipped)
+            if not summary.errors:
+                messagebox.showinfo(translations.get('success'), message)
+                return
+            details = "\n".join(translations.get('import_error_line', line=line, error=error)
+                                for line, error in summary.errors[:20])
+            if messagebox.askyesno(translations.get('import_patients'),
+                                   f"{message}\n\n{details}\n\n{translations.get('import_save_report')}"):
+                filename = filedialog.asksaveasfilename(
+                    title=translations.get('import_save_report'),
+                    defaultextension=".csv",
+                    filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                    initialfile="import_errors.csv"
+                )
+                if filename:
+                    try:
+                        write_error_report(summary, filename)
+                    except OSError as e:
+                        messagebox.showerror(translations.get('error'), str(e))
+                        
+        def on_error(error):
+            messagebox.showerror(translations.get('error'), translations.get('import_error', error=str(error)))
+            
+        progress_dialog = ExportProgressDialog(
+            self.content_frame,
+            title=translations.get('import_patients'),
+            message=translations.get('import_reading')
+        )
+        progress_dialog.run(task, on_success=on_success, on_error=on_error)
+                
     def edit_patient(self):
         """Open edit patient dialog"""
         if not self.selected_patient:
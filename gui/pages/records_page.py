@@ -1,8 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
+from database import connection
+from database.archive import DEFAULT_YEARS
 from models import Record, Doctor, Patient, Treatment, Payment
 from gui.widgets.record_form import RecordForm
 from gui.widgets.record_details import RecordDetailsWindow
+from gui.widgets.batch_export_form import BatchExportForm
+from gui.widgets.export_progress import ExportProgressDialog
+from gui.scrolling import register_scrollable
 from localization.translations import translations
 
 
@@ -45,8 +50,8 @@ class RecordsPage:
         self.frame.columnconfigure(0, weight=1)
         self.frame.rowconfigure(0, weight=1)
         
-        # Bind mousewheel to canvas for full page scrolling
-        self.bind_mousewheel()
+        # The wheel scrolls this canvas anywhere over its content
+        register_scrollable(self.main_canvas)
         
         # Set up the content frame structure with full width
         self.content_frame = self.scrollable_frame
@@ -58,25 +63,6 @@ class RecordsPage:
         # Content frame
         self.setup_content()
         
-    def bind_mousewheel(self):
-        """Bind mousewheel events for full page scrolling"""
-        def _on_mousewheel(event):
-            self.main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        # Bind to multiple widgets to ensure scrolling works everywhere
-        self.main_canvas.bind("<MouseWheel>", _on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
-        self.frame.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Function to bind mousewheel to all child widgets recursively
-        def bind_to_children(widget):
-            widget.bind("<MouseWheel>", _on_mousewheel)
-            for child in widget.winfo_children():
-                bind_to_children(child)
-        
-        # Bind after a short delay to ensure all widgets are created
-        self.frame.after(100, lambda: bind_to_children(self.scrollable_frame))
-        
     def setup_header(self):
         header_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
         header_frame.grid(row=0, column=0, sticky="ew", pady=(0, 15))
@@ -119,6 +105,25 @@ class RecordsPage:
         )
         self.delete_btn.pack(side='right', ipadx=15, ipady=8)
         
+        # Batch Export button
+        self.batch_export_btn = ttk.Button(
+            buttons_frame, 
+            text=translations.get('batch_export'), 
+            style='TButton',
+            command=self.batch_export
+        )
+        self.batch_export_btn.pack(side='right', padx=(0, 15), ipadx=15, ipady=8)
+        
+        # Archive Old Records button; the server's database file cannot be archived from here
+        self.archive_btn = ttk.Button(
+            buttons_frame, 
+            text=translations.get('archive_records'), 
+            style='TButton',
+            command=self.archive_old_records,
+            state='disabled' if connection.REMOTE else 'normal'
+        )
+        self.archive_btn.pack(side='right', padx=(0, 15), ipadx=15, ipady=8)
+        
     def setup_content(self):
         # Content frame with full width and minimal padding
         content_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
@@ -139,6 +144,16 @@ class RecordsPage:
         self.search_entry.grid(row=0, column=1, sticky="ew", ipady=6)
         self.search_var.trace('w', self.on_search)
         
+        # Archived records are only read when asked for
+        self.show_archive_var = tk.BooleanVar(value=False)
+        self.show_archive_check = ttk.Checkbutton(
+            search_frame,
+            text=translations.get('show_archived'),
+            variable=self.show_archive_var,
+            command=self.on_search
+        )
+        self.show_archive_check.grid(row=0, column=2, sticky="e", padx=(15, 0))
+        
         # Table frame with full width
         table_frame = ttk.Frame(content_frame)
         table_frame.grid(row=1, column=0, sticky="ew", pady=(0, 15))
@@ -179,9 +194,12 @@ class RecordsPage:
         self.add_btn.config(text=translations.get('add_record'))
         self.view_btn.config(text=translations.get('view_details'))
         self.delete_btn.config(text=translations.get('delete_record'))
+        self.batch_export_btn.config(text=translations.get('batch_export'))
+        self.archive_btn.config(text=translations.get('archive_records'))
         
         # Update search
         self.search_label.config(text=translations.get('search_records'))
+        self.show_archive_check.config(text=translations.get('show_archived'))
         
         # Update table headers
         self.records_tree.heading('ID', text=translations.get('col_id'))
@@ -192,9 +210,6 @@ class RecordsPage:
         self.records_tree.heading('Balance', text=translations.get('col_balance'))
         self.records_tree.heading('Created', text=translations.get('col_created'))
         
-        # Re-bind mousewheel after UI updates
-        self.frame.after(100, self.bind_mousewheel)
-        
     def load_records(self, search_term=None):
         """Load records data into the table"""
         # Clear existing data
@@ -202,7 +217,7 @@ class RecordsPage:
             self.records_tree.delete(item)
             
         try:
-            records = Record.get_all()
+            records = Record.get_archived() if self.show_archive_var.get() else Record.get_all()
             
             # Filter by search term if provided
             if search_term:
@@ -258,7 +273,7 @@ class RecordsPage:
     def on_record_select(self, event):
         """Handle record selection"""
         selection = self.records_tree.selection()
-        if selection:
+        if selection and not self.show_archive_var.get():
             item = self.records_tree.item(selection[0])
             record_id = item['values'][0]
             self.selected_record = Record.get_by_id(record_id)
@@ -334,4 +349,83 @@ class RecordsPage:
                 self.delete_btn.config(state='disabled')
                 messagebox.showinfo(translations.get('success'), translations.get('record_deleted_success'))
             except Exception as e:
-                messagebox.showerror(translations.get('error'), translations.get('failed_to_delete', item='record', error=str(e)))
\ No newline at end of file
+                messagebox.showerror(translations.get('error'), translations.get('failed_to_delete', item='record', error=str(e)))
+                
+    def batch_export(self):
+        """Export statements for many records at once"""
+        from reports.batch_export import select_records, prefetch, export_batch
+        
+        form = BatchExportForm(self.content_frame, title=translations.get('batch_export_title'))
+        if not form.result:
+            return
+        options = form.result
+        
+        def task(progress, cancel_event):
+            progress(0, translations.get('batch_selecting'))
+            records = select_records(
+                doctor_id=options['doctor_id'],
+                unpaid_only=options['unpaid_only'],
+                start_date=options['start_date'],
+                end_date=options['end_date']
+            )
+            items = prefetch(records)
+            progress(0, translations.get('batch_rendering', count=len(items)))
+            return export_batch(items, options['output'], merge=options['merge'],
+                                progress=progress, cancel_event=cancel_event)
+            
+        def on_success(summary):
+            message = translations.get('batch_export_summary', exported=summary.exported,
+                                       total=summary.total, failed=summary.failed, output=summary.output)
+            if summary.failures:
+                details = "\n".join(f"#{record.id} {record.patient_name}: {error}"
+                                    for record, error in summary.failures[:20])
+                messagebox.showwarning(translations.get('batch_export'), f"{message}\n\n{details}")
+            else:
+                messagebox.showinfo(translations.get('success'), message)
+                
+        def on_error(error):
+            messagebox.showerror(translations.get('error'), translations.get('pdf_export_error', error=str(error)))
+            
+        progress_dialog = ExportProgressDialog(
+            self.content_frame,
+            title=translations.get('batch_export'),
+            message=translations.get('batch_selecting')
+        )
+        progress_dialog.run(task, on_success=on_success, on_error=on_error)
+        
+    def archive_old_records(self):
+        """Move paid-off records with no recent activity into the archive"""
+        from database.archive import archive_records
+        
+        years = simpledialog.askinteger(
+            translations.get('archive_records'),
+            translations.get('archive_years_prompt'),
+            parent=self.content_frame,
+            initialvalue=DEFAULT_YEARS,
+            minvalue=1,
+            maxvalue=50
+        )
+        if not years:
+            return
+        if not messagebox.askyesno(translations.get('archive_records'),
+                                   translations.get('archive_confirm', years=years)):
+            return
+        
+        def task(progress, cancel_event):
+            return archive_records(years, progress=progress, cancel_event=cancel_event)
+        
+        def on_success(summary):
+            self.load_records()
+            messagebox.showinfo(translations.get('success'), translations.get(
+                'archive_summary', records=summary.records, treatments=summary.treatments,
+                payments=summary.payments, cutoff=summary.cutoff))
+            
+        def on_error(error):
+            messagebox.showerror(translations.get('error'), translations.get('archive_error', error=str(error)))
+            
+        progress_dialog = ExportProgressDialog(
+            self.content_frame,
+            title=translations.get('archive_records'),
+            message=translations.get('archive_running')
+        )
+        progress_dialog.run(task, on_success=on_success, on_error=on_error, on_cancel=self.load_records)
@@ -0,0 +1,572 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime, date
+from database import connection
+from models import Doctor, Record
+from reports import aging, financial
+from gui.widgets.record_details import RecordDetailsWindow
+from gui.widgets.data_export_form import DataExportForm
+from gui.widgets.export_progress import ExportProgressDialog
+from gui.scrolling import register_scrollable
+from localization.translations import translations
+
+
+class ReportsPage:
+    # Rows shown in the aging table; the summary cards and CSV export cover all of them
+    AGING_ROWS = 500
+    POLL_MS = 50
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.doctors = []
+        self.revenue_rows = []
+        self.aging_rows = []
+        self.aging_totals = None
+        # Reports run on worker threads; results come back through this queue
+        self.report_results = queue.Queue()
+        self.report_generation = {}
+        self.reports_pending = 0
+
+        # Register for language change notifications
+        translations.add_observer(self.update_ui)
+
+        self.setup_ui()
+        self.load_doctors()
+        self.load_revenue()
+        self.load_aging()
+
+    def setup_ui(self):
+        # Main frame for the tab - full width
+        self.frame = ttk.Frame(self.parent)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+
+        # Create scrollable canvas for the entire page
+        self.main_canvas = tk.Canvas(self.frame, highlightthickness=0)
+        self.main_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.main_canvas.yview)
+        self.scrollable_frame = ttk.Frame(self.main_canvas)
+
+        # Configure scrolling
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.main_canvas.configure(scrollregion=self.main_canvas.bbox("all"))
+        )
+
+        self.main_canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.main_canvas.configure(yscrollcommand=self.main_scrollbar.set)
+
+        # Grid canvas and scrollbar
+        self.main_canvas.grid(row=0, column=0, sticky="nsew")
+        self.main_scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # The wheel scrolls this canvas anywhere over its content
+        register_scrollable(self.main_canvas)
+
+        self.content_frame = self.scrollable_frame
+        self.content_frame.columnconfigure(0, weight=1)
+
+        # Header frame
+        self.setup_header()
+
+        # One inner tab per report
+        self.reports_notebook = ttk.Notebook(self.content_frame)
+        self.reports_notebook.grid(row=1, column=0, sticky="ew", pady=(0, 15))
+        self.setup_revenue_tab()
+        self.setup_aging_tab()
+
+    def setup_header(self):
+        header_frame = ttk.Frame(self.content_frame, style='Card.TFrame', padding=20)
+        header_frame.grid(row=0, column=0, sticky="ew", pady=(0, 15))
+        header_frame.columnconfigure(1, weight=1)
+
+        self.title_label = ttk.Label(header_frame, text=translations.get('reports_title'), style='Title.TLabel')
+        self.title_label.grid(row=0, column=0, sticky="w")
+
+        # Every table to CSV/JSON Lines, for the accountant. It reads the database
+        # file directly, so it is not offered while connected to a server
+        self.export_data_btn = ttk.Button(
+            header_frame,
+            text=translations.get('export_data'),
+            style='Warning.TButton',
+            command=self.export_data,
+            state='disabled' if connection.REMOTE else 'normal'
+        )
+        self.export_data_btn.grid(row=0, column=1, sticky="e", ipadx=15, ipady=8)
+
+    def setup_revenue_tab(self):
+        revenue_frame = ttk.Frame(self.reports_notebook, style='Card.TFrame', padding=20)
+        revenue_frame.columnconfigure(0, weight=1)
+
+        # Filters
+        filters_frame = ttk.Frame(revenue_frame)
+        filters_frame.grid(row=0, column=0, sticky="ew", pady=(0, 20))
+
+        today = date.today()
+        self.revenue_from_label = ttk.Label(filters_frame, text=translations.get('date_from'), font=('Segoe UI', 11, 'bold'))
+        self.revenue_from_label.pack(side='left', padx=(0, 8))
+        self.revenue_start_var = tk.StringVar(value=today.replace(month=1, day=1).isoformat())
+        ttk.Entry(filters_frame, textvariable=self.revenue_start_var, width=12, font=('Segoe UI', 11)).pack(side='left', ipady=4)
+
+        self.revenue_to_label = ttk.Label(filters_frame, text=translations.get('date_to'), font=('Segoe UI', 11, 'bold'))
+        self.revenue_to_label.pack(side='left', padx=(15, 8))
+        self.revenue_end_var = tk.StringVar(value=today.isoformat())
+        ttk.Entry(filters_frame, textvariable=self.revenue_end_var, width=12, font=('Segoe UI', 11)).pack(side='left', ipady=4)
+
+        self.period_label = ttk.Label(filters_frame, text=translations.get('period'), font=('Segoe UI', 11, 'bold'))
+        self.period_label.pack(side='left', padx=(15, 8))
+        self.period_var = tk.StringVar()
+        self.period_combo = ttk.Combobox(filters_frame, textvariable=self.period_var, state='readonly', width=10)
+        self.period_combo.pack(side='left', ipady=4)
+        self.set_period_values('month')
+
+        self.revenue_doctor_label = ttk.Label(filters_frame, text=translations.get('col_doctor'), font=('Segoe UI', 11, 'bold'))
+        self.revenue_doctor_label.pack(side='left', padx=(15, 8))
+        self.revenue_doctor_var = tk.StringVar()
+        self.revenue_doctor_combo = ttk.Combobox(filters_frame, textvariable=self.revenue_doctor_var, state='readonly', width=25)
+        self.revenue_doctor_combo.pack(side='left', ipady=4)
+
+        self.export_csv_btn = ttk.Button(
+            filters_frame,
+            text=translations.get('export_csv'),
+            style='Warning.TButton',
+            command=self.export_revenue_csv
+        )
+        self.export_csv_btn.pack(side='right', ipadx=15, ipady=6)
+
+        self.generate_btn = ttk.Button(
+            filters_frame,
+            text=translations.get('btn_generate'),
+            style='Success.TButton',
+            command=self.load_revenue
+        )
+        self.generate_btn.pack(side='right', padx=(0, 15), ipadx=15, ipady=6)
+
+        # Summary cards
+        cards_frame = ttk.Frame(revenue_frame)
+        cards_frame.grid(row=1, column=0, sticky="w", pady=(0, 20))
+
+        self.summary_cards = {}
+        for key, color in (('total_billed', '#3498db'), ('total_collected', '#27ae60'),
+                           ('outstanding', '#e74c3c'), ('new_patients', '#9b59b6')):
+            card = ttk.Frame(cards_frame, style='Card.TFrame', padding=15)
+            card.pack(side='left', padx=(0, 10))
+            value_label = ttk.Label(card, text="0", font=('Segoe UI', 16, 'bold'), foreground=color)
+            value_label.pack()
+            title_label = ttk.Label(card, text=translations.get(key), font=('Segoe UI', 10), foreground='#7f8c8d')
+            title_label.pack()
+            self.summary_cards[key] = (value_label, title_label)
+
+        # Revenue table
+        table_frame = ttk.Frame(revenue_frame)
+        table_frame.grid(row=2, column=0, sticky="ew")
+        table_frame.columnconfigure(0, weight=1)
+
+        columns = ('Period', 'Doctor', 'Billed', 'Collected', 'Outstanding', 'Treatments', 'Payments', 'New Patients')
+        self.revenue_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+        self.set_revenue_headings()
+
+        self.revenue_tree.column('Period', width=120, anchor='center')
+        self.revenue_tree.column('Doctor', width=220)
+        self.revenue_tree.column('Billed', width=130, anchor='center')
+        self.revenue_tree.column('Collected', width=130, anchor='center')
+        self.revenue_tree.column('Outstanding', width=130, anchor='center')
+        self.revenue_tree.column('Treatments', width=100, anchor='center')
+        self.revenue_tree.column('Payments', width=100, anchor='center')
+        self.revenue_tree.column('New Patients', width=110, anchor='center')
+
+        revenue_scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.revenue_tree.yview)
+        self.revenue_tree.configure(yscrollcommand=revenue_scrollbar.set)
+        self.revenue_tree.grid(row=0, column=0, sticky="ew")
+        revenue_scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.reports_notebook.add(revenue_frame, text=translations.get('revenue_tab'))
+
+    def setup_aging_tab(self):
+        aging_frame = ttk.Frame(self.reports_notebook, style='Card.TFrame', padding=20)
+        aging_frame.columnconfigure(0, weight=1)
+
+        # Filters
+        filters_frame = ttk.Frame(aging_frame)
+        filters_frame.grid(row=0, column=0, sticky="ew", pady=(0, 20))
+
+        self.as_of_label = ttk.Label(filters_frame, text=translations.get('as_of'), font=('Segoe UI', 11, 'bold'))
+        self.as_of_label.pack(side='left', padx=(0, 8))
+        self.as_of_var = tk.StringVar(value=date.today().isoformat())
+        ttk.Entry(filters_frame, textvariable=self.as_of_var, width=12, font=('Segoe UI', 11)).pack(side='left', ipady=4)
+
+        self.aging_doctor_label = ttk.Label(filters_frame, text=translations.get('col_doctor'), font=('Segoe UI', 11, 'bold'))
+        self.aging_doctor_label.pack(side='left', padx=(15, 8))
+        self.aging_doctor_var = tk.StringVar()
+        self.aging_doctor_combo = ttk.Combobox(filters_frame, textvariable=self.aging_doctor_var, state='readonly', width=25)
+        self.aging_doctor_combo.pack(side='left', ipady=4)
+
+        self.aging_export_btn = ttk.Button(
+            filters_frame,
+            text=translations.get('export_csv'),
+            style='Warning.TButton',
+            command=self.export_aging_csv
+        )
+        self.aging_export_btn.pack(side='right', ipadx=15, ipady=6)
+
+        self.aging_generate_btn = ttk.Button(
+            filters_frame,
+            text=translations.get('btn_generate'),
+            style='Success.TButton',
+            command=self.load_aging
+        )
+        self.aging_generate_btn.pack(side='right', padx=(0, 15), ipadx=15, ipady=6)
+
+        # Bucket cards
+        cards_frame = ttk.Frame(aging_frame)
+        cards_frame.grid(row=1, column=0, sticky="w", pady=(0, 20))
+
+        self.aging_cards = {}
+        colors = ('#27ae60', '#f39c12', '#e67e22', '#e74c3c')
+        for (key, first, last), color in zip(aging.BUCKETS, colors):
+            self.aging_cards[f'aging_{key}'] = self.create_aging_card(cards_frame, f'aging_{key}', color)
+        self.aging_cards['total_receivable'] = self.create_aging_card(cards_frame, 'total_receivable', '#3498db')
+
+        # Aging table
+        table_frame = ttk.Frame(aging_frame)
+        table_frame.grid(row=2, column=0, sticky="ew")
+        table_frame.columnconfigure(0, weight=1)
+
+        columns = ('Record', 'Doctor', 'Patient', 'Balance', 'Oldest Unpaid', 'Days', 'Bucket')
+        self.aging_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+        self.set_aging_headings()
+
+        self.aging_tree.column('Record', width=80, anchor='center')
+        self.aging_tree.column('Doctor', width=200)
+        self.aging_tree.column('Patient', width=200)
+        self.aging_tree.column('Balance', width=130, anchor='center')
+        self.aging_tree.column('Oldest Unpaid', width=130, anchor='center')
+        self.aging_tree.column('Days', width=80, anchor='center')
+        self.aging_tree.column('Bucket', width=120, anchor='center')
+
+        aging_scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.aging_tree.yview)
+        self.aging_tree.configure(yscrollcommand=aging_scrollbar.set)
+        self.aging_tree.grid(row=0, column=0, sticky="ew")
+        aging_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.aging_tree.bind('<Double-1>', self.open_aging_record)
+
+        self.aging_count_label = ttk.Label(table_frame, text="", font=('Segoe UI', 10), foreground='#7f8c8d')
+        self.aging_count_label.grid(row=1, column=0, sticky="w", pady=(8, 0))
+
+        self.reports_notebook.add(aging_frame, text=translations.get('aging_tab'))
+
+    def create_aging_card(self, parent, key, color):
+        card = ttk.Frame(parent, style='Card.TFrame', padding=15)
+        card.pack(side='left', padx=(0, 10))
+        value_label = ttk.Label(card, text="0", font=('Segoe UI', 16, 'bold'), foreground=color)
+        value_label.pack()
+        title_label = ttk.Label(card, text=translations.get(key), font=('Segoe UI', 10), foreground='#7f8c8d')
+        title_label.pack()
+        return value_label, title_label
+
+    def set_aging_headings(self):
+        self.aging_tree.heading('Record', text=translations.get('col_record'))
+        self.aging_tree.heading('Doctor', text=translations.get('col_doctor'))
+        self.aging_tree.heading('Patient', text=translations.get('col_patient'))
+        self.aging_tree.heading('Balance', text=translations.get('col_balance'))
+        self.aging_tree.heading('Oldest Unpaid', text=translations.get('col_oldest_unpaid'))
+        self.aging_tree.heading('Days', text=translations.get('col_days'))
+        self.aging_tree.heading('Bucket', text=translations.get('col_bucket'))
+
+    def set_revenue_headings(self):
+        self.revenue_tree.heading('Period', text=translations.get('col_period'))
+        self.revenue_tree.heading('Doctor', text=translations.get('col_doctor'))
+        self.revenue_tree.heading('Billed', text=translations.get('col_billed'))
+        self.revenue_tree.heading('Collected', text=translations.get('col_collected'))
+        self.revenue_tree.heading('Outstanding', text=translations.get('col_outstanding'))
+        self.revenue_tree.heading('Treatments', text=translations.get('col_treatments'))
+        self.revenue_tree.heading('Payments', text=translations.get('col_payments'))
+        self.revenue_tree.heading('New Patients', text=translations.get('col_new_patients'))
+
+    def set_period_values(self, period):
+        """Fill the period combobox in the current language and select period"""
+        self.period_map = {translations.get(f'period_{key}'): key for key in financial.PERIODS}
+        self.period_combo.config(values=list(self.period_map))
+        self.period_var.set(translations.get(f'period_{period}'))
+
+    def selected_period(self):
+        return self.period_map.get(self.period_var.get(), 'month')
+
+    def load_doctors(self):
+        """Load doctors for the doctor filters"""
+        try:
+            self.doctors = Doctor.get_all()
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='doctors', error=str(e)))
+            self.doctors = []
+        self.set_doctor_values(self.revenue_doctor_combo, self.revenue_doctor_var)
+        self.set_doctor_values(self.aging_doctor_combo, self.aging_doctor_var)
+
+    def set_doctor_values(self, combo, var):
+        """Fill a doctor combobox, keeping the current choice when it still exists"""
+        self.doctor_map = {translations.get('all_doctors'): None}
+        for doctor in self.doctors:
+            self.doctor_map[doctor.name] = doctor.id
+        combo.config(values=list(self.doctor_map))
+        if var.get() not in self.doctor_map:
+            var.set(translations.get('all_doctors'))
+
+    def parse_range(self, start_var, end_var):
+        """Validate a from/to pair; returns (start, end) or None after showing the errors"""
+        errors = []
+        parsed = []
+        for var in (start_var, end_var):
+            value = var.get().strip()
+            if not value:
+                parsed.append(None)
+                continue
+            try:
+                parsed.append(datetime.strptime(value, "%Y-%m-%d").date())
+            except ValueError:
+                errors.append(translations.get('invalid_date', value=value))
+                parsed.append(None)
+        start_date, end_date = parsed
+        if start_date and end_date and start_date > end_date:
+            errors.append(translations.get('invalid_date_range'))
+        if errors:
+            messagebox.showerror(translations.get('validation_error'), "\n".join(errors))
+            return None
+        return start_date, end_date
+
+    def load_revenue(self):
+        """Run the revenue report for the chosen filters"""
+        date_range = self.parse_range(self.revenue_start_var, self.revenue_end_var)
+        if date_range is None:
+            return
+        start_date, end_date = date_range
+        doctor_id = self.doctor_map.get(self.revenue_doctor_var.get())
+        period = self.selected_period()
+
+        def query():
+            return (financial.revenue(start_date, end_date, period=period, doctor_id=doctor_id),
+                    financial.summary(start_date, end_date, doctor_id=doctor_id))
+
+        self.run_report('revenue', query, self.show_revenue)
+
+    def show_revenue(self, result):
+        self.revenue_rows, totals = result
+        self.revenue_tree.delete(*self.revenue_tree.get_children())
+        for row in self.revenue_rows:
+            self.revenue_tree.insert('', 'end', values=(
+                row.period,
+                row.doctor_name or "",
+                f"${row.billed:.2f}",
+                f"${row.collected:.2f}",
+                f"${row.outstanding:.2f}",
+                row.treatment_count,
+                row.payment_count,
+                row.new_patients
+            ))
+
+        self.summary_cards['total_billed'][0].config(text=f"${totals.billed:.2f}")
+        self.summary_cards['total_collected'][0].config(text=f"${totals.collected:.2f}")
+        self.summary_cards['outstanding'][0].config(text=f"${totals.outstanding:.2f}")
+        self.summary_cards['new_patients'][0].config(text=str(totals.new_patients))
+
+    def export_revenue_csv(self):
+        """Save the rows currently shown to a CSV file"""
+        filename = filedialog.asksaveasfilename(
+            title=translations.get('save_csv'),
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile=f"Revenue_{self.selected_period()}_{datetime.now().strftime('%Y%m%d')}.csv"
+        )
+        if not filename:
+            return
+        try:
+            financial.write_csv(self.revenue_rows, filename)
+            messagebox.showinfo(translations.get('success'), translations.get('csv_exported_success', filename=filename))
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('csv_export_error', error=str(e)))
+
+    def parse_as_of(self):
+        """Validate the aging as-of date; returns None after showing the error"""
+        value = self.as_of_var.get().strip()
+        if not value:
+            return date.today()
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            messagebox.showerror(translations.get('validation_error'), translations.get('invalid_date', value=value))
+            return None
+
+    def load_aging(self):
+        """Run the receivables aging report for the chosen filters"""
+        as_of = self.parse_as_of()
+        if as_of is None:
+            return
+        doctor_id = self.doctor_map.get(self.aging_doctor_var.get())
+
+        def query():
+            return aging.aging(doctor_id, as_of, limit=self.AGING_ROWS), aging.summary(doctor_id, as_of)
+
+        self.run_report('aging', query, self.show_aging)
+
+    def show_aging(self, result):
+        self.aging_rows, totals = result
+        self.aging_tree.delete(*self.aging_tree.get_children())
+        for row in self.aging_rows:
+            self.aging_tree.insert('', 'end', iid=str(row.record_id), values=(
+                row.record_id,
+                row.doctor_name or "",
+                row.patient_name or "",
+                f"${row.balance:.2f}",
+                row.oldest_unpaid.isoformat() if row.oldest_unpaid else "",
+                row.age_days,
+                translations.get(f'aging_{row.bucket}')
+            ))
+
+        self.aging_totals = totals
+        for key, first, last in aging.BUCKETS:
+            self.aging_cards[f'aging_{key}'][0].config(text=f"${totals.totals[key]:.2f}")
+        self.aging_cards['total_receivable'][0].config(text=f"${totals.total:.2f}")
+        self.update_aging_count()
+
+    def run_report(self, name, query, show):
+        """Run query on a worker thread and pass its result to show on the Tk thread.
+
+        Only the newest run of each report is shown, so clicking refresh again
+        while a slow query is running never puts older figures on screen.
+        """
+        generation = self.report_generation.get(name, 0) + 1
+        self.report_generation[name] = generation
+
+        def work():
+            try:
+                outcome = (True, query())
+            except Exception as e:
+                outcome = (False, e)
+            self.report_results.put((name, generation, show, outcome))
+
+        threading.Thread(target=work, daemon=True).start()
+        self.reports_pending += 1
+        if self.reports_pending == 1:
+            self.frame.after(self.POLL_MS, self.poll_reports)
+
+    def poll_reports(self):
+        """Show finished reports; keeps polling while any is still running"""
+        if not self.frame.winfo_exists():
+            return
+        try:
+            while True:
+                name, generation, show, (ok, payload) = self.report_results.get_nowait()
+                self.reports_pending -= 1
+                if generation != self.report_generation[name]:
+                    continue
+                if ok:
+                    show(payload)
+                else:
+                    messagebox.showerror(translations.get('error'),
+                                         translations.get('failed_to_load', item='report', error=str(payload)))
+        except queue.Empty:
+            pass
+        if self.reports_pending:
+            self.frame.after(self.POLL_MS, self.poll_reports)
+
+    def update_aging_count(self):
+        if self.aging_totals is None:
+            return
+        self.aging_count_label.config(text=translations.get(
+            'showing_rows', shown=len(self.aging_rows), total=self.aging_totals.count))
+
+    def open_aging_record(self, event):
+        """Open the record details window for the double-clicked row"""
+        selection = self.aging_tree.selection()
+        if not selection:
+            return
+        try:
+            record = Record.get_by_id(int(selection[0]))
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='record', error=str(e)))
+            return
+        if record:
+            RecordDetailsWindow(self.content_frame, record)
+
+    def export_aging_csv(self):
+        """Save every aged balance (not only the rows shown) to a CSV file"""
+        as_of = self.parse_as_of()
+        if as_of is None:
+            return
+        filename = filedialog.asksaveasfilename(
+            title=translations.get('save_csv'),
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile=f"Aging_{as_of.strftime('%Y%m%d')}.csv"
+        )
+        if not filename:
+            return
+        try:
+            rows = aging.aging(self.doctor_map.get(self.aging_doctor_var.get()), as_of)
+            aging.write_csv(rows, filename)
+            messagebox.showinfo(translations.get('success'), translations.get('csv_exported_success', filename=filename))
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('csv_export_error', error=str(e)))
+
+    def export_data(self):
+        """Stream the chosen tables to files on a worker thread"""
+        from dataio.exporter import export_all
+
+        form = DataExportForm(self.content_frame, title=translations.get('export_data_title'))
+        if not form.result:
+            return
+        options = form.result
+
+        def task(progress, cancel_event):
+            def on_progress(fraction, name):
+                progress(fraction, translations.get('export_data_writing', dataset=translations.get(f'dataset_{name}')))
+            return export_all(options['output'], options['names'], fmt=options['format'],
+                              compress=options['compress'], progress=on_progress, cancel_event=cancel_event)
+
+        def on_success(summary):
+            messagebox.showinfo(translations.get('success'), translations.get(
+                'export_data_summary', files=len(summary.files), rows=summary.rows, output=summary.directory))
+
+        def on_error(error):
+            messagebox.showerror(translations.get('error'), translations.get('export_data_error', error=str(error)))
+
+        progress_dialog = ExportProgressDialog(
+            self.content_frame,
+            title=translations.get('export_data_title'),
+            message=translations.get('export_data_title')
+        )
+        progress_dialog.run(task, on_success=on_success, on_error=on_error)
+
+    def update_ui(self):
+        """Update UI elements when language changes"""
+        self.title_label.config(text=translations.get('reports_title'))
+        self.export_data_btn.config(text=translations.get('export_data'))
+        self.reports_notebook.tab(0, text=translations.get('revenue_tab'))
+        self.reports_notebook.tab(1, text=translations.get('aging_tab'))
+
+        # Revenue filters
+        self.revenue_from_label.config(text=translations.get('date_from'))
+        self.revenue_to_label.config(text=translations.get('date_to'))
+        self.period_label.config(text=translations.get('period'))
+        self.revenue_doctor_label.config(text=translations.get('col_doctor'))
+        self.generate_btn.config(text=translations.get('btn_generate'))
+        self.export_csv_btn.config(text=translations.get('export_csv'))
+        self.set_period_values(self.selected_period())
+        self.set_doctor_values(self.revenue_doctor_combo, self.revenue_doctor_var)
+
+        for key, (value_label, title_label) in self.summary_cards.items():
+            title_label.config(text=translations.get(key))
+        self.set_revenue_headings()
+
+        # Aging
+        self.as_of_label.config(text=translations.get('as_of'))
+        self.aging_doctor_label.config(text=translations.get('col_doctor'))
+        self.aging_generate_btn.config(text=translations.get('btn_generate'))
+        self.aging_export_btn.config(text=translations.get('export_csv'))
+        self.set_doctor_values(self.aging_doctor_combo, self.aging_doctor_var)
+        for key, (value_label, title_label) in self.aging_cards.items():
+            title_label.config(text=translations.get(key))
+        self.set_aging_headings()
+        for row in self.aging_rows:
+            self.aging_tree.set(str(row.record_id), 'Bucket', translations.get(f'aging_{row.bucket}'))
+        self.update_aging_count()
@@ -0,0 +1,58 @@
+"""
+Mousewheel routing for DentaSys
+One application-wide binding sends each wheel event to the registered canvas
+under the pointer, so pages never bind widgets one by one
+"""
+import tkinter as tk
+from tkinter import ttk
+
+# Path names of canvases that scroll a whole page or window
+_scrollables = set()
+
+# Widgets that scroll themselves; the wheel is left to their own class bindings
+_SELF_SCROLLING = (ttk.Treeview, tk.Text, tk.Listbox)
+
+
+def register_scrollable(canvas):
+    """Make canvas scroll when the wheel turns over it or anything inside it"""
+    _scrollables.add(str(canvas))
+    canvas.bind('<Destroy>', lambda e: _scrollables.discard(str(canvas)), add='+')
+    # bind_all replaces the previous binding, so registering many canvases still leaves one handler
+    canvas.bind_all('<MouseWheel>', _on_mousewheel)
+    canvas.bind_all('<Button-4>', _on_mousewheel)
+    canvas.bind_all('<Button-5>', _on_mousewheel)
+
+
+def _wheel_units(event):
+    if event.num == 4:
+        return -1
+    if event.num == 5:
+        return 1
+    # Windows reports multiples of 120, macOS reports small raw deltas
+    if abs(event.delta) >= 120:
+        return int(-event.delta / 120)
+    return -event.delta
+
+
+def _target_canvas(event):
+    try:
+        widget = event.widget.winfo_containing(event.x_root, event.y_root)
+    except (AttributeError, KeyError, tk.TclError):
+        # Pointer over a menu, a popdown Tk created itself or a widget being destroyed
+        return None
+    while widget is not None:
+        if isinstance(widget, _SELF_SCROLLING):
+            return None
+        if str(widget) in _scrollables:
+            return widget
+        widget = widget.master
+    return None
+
+
+def _on_mousewheel(event):
+    canvas = _target_canvas(event)
+    if canvas is None or canvas.yview() == (0.0, 1.0):
+        return
+    units = _wheel_units(event)
+    if units:
+        canvas.yview_scroll(units, "units")
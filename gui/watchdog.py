@@ -0,0 +1,104 @@
+"""
+Event-loop stall watchdog for DentaSys
+Detects when the Tk main loop stops responding and logs the main thread's stack
+"""
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+LOG_FILE = Path.home() / '.dentasys_watchdog.log'
+
+
+class EventLoopWatchdog:
+    def __init__(self, root, interval_ms=100, threshold_ms=500, sample_interval_ms=50,
+                 log_file=LOG_FILE, max_bytes=1024 * 1024, backup_count=3):
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.sample_interval = sample_interval_ms / 1000
+        self.main_thread_id = threading.main_thread().ident
+
+        self.last_beat = time.monotonic()
+        self.after_id = None
+        self.sampler_thread = None
+        self.stop_event = threading.Event()
+        self.stall_reported = False
+        self.stall_count = 0
+
+        self.logger = self.create_logger(log_file, max_bytes, backup_count)
+
+    def create_logger(self, log_file, max_bytes, backup_count):
+        """Create a rotating file logger dedicated to stall reports"""
+        logger = logging.getLogger('dentasys.watchdog')
+        logger.setLevel(logging.WARNING)
+        logger.propagate = False
+        if not logger.handlers:
+            try:
+                handler = RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                              backupCount=backup_count, encoding='utf-8')
+            except OSError as e:
+                print(f"Error opening watchdog log: {e}")
+                handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+            logger.addHandler(handler)
+        return logger
+
+    def start(self):
+        """Start the heartbeat and the sampling thread"""
+        if self.sampler_thread and self.sampler_thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.last_beat = time.monotonic()
+        self.after_id = self.root.after(int(self.interval * 1000), self.heartbeat)
+
+        self.sampler_thread = threading.Thread(target=self.sample_loop, name='dentasys-watchdog')
+        self.sampler_thread.daemon = True
+        self.sampler_thread.start()
+
+    def stop(self):
+        """Stop the heartbeat and the sampling thread"""
+        self.stop_event.set()
+        if self.after_id is not None:
+            try:
+                self.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
+        if self.sampler_thread and self.sampler_thread is not threading.current_thread():
+            self.sampler_thread.join(timeout=1)
+
+    def heartbeat(self):
+        """Runs on the Tk thread; measures how late it fired"""
+        now = time.monotonic()
+        lateness = now - self.last_beat - self.interval
+        if lateness > self.threshold:
+            self.stall_count += 1
+            self.logger.warning(f"Event loop stalled for {lateness * 1000:.0f} ms "
+                                f"(stall #{self.stall_count})")
+
+        self.last_beat = now
+        self.stall_reported = False
+        if not self.stop_event.is_set():
+            self.after_id = self.root.after(int(self.interval * 1000), self.heartbeat)
+
+    def sample_loop(self):
+        """Runs on the sampling thread; captures the main thread's stack during a stall"""
+        while not self.stop_event.wait(self.sample_interval):
+            blocked_for = time.monotonic() - self.last_beat - self.interval
+            if blocked_for > self.threshold and not self.stall_reported:
+                self.stall_reported = True
+                self.logger.warning(
+                    f"Event loop blocked for {blocked_for * 1000:.0f} ms, main thread stack:\n"
+                    f"{self.capture_main_stack()}"
+                )
+
+    def capture_main_stack(self):
+        """Format the current Python stack of the main thread"""
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return "  <main thread stack unavailable>"
+        return ''.join(traceback.format_stack(frame))
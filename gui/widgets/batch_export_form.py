@@ -0,0 +1,206 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+from models import Doctor
+from localization.translations import translations
+
+
+class BatchExportForm:
+    def __init__(self, parent, title="Batch Export"):
+        self.parent = parent
+        self.result = None
+
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("560x620")
+        self.dialog.resizable(True, True)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # Center the dialog
+        self.center_dialog()
+
+        # Load data
+        self.load_data()
+
+        # Setup UI
+        self.setup_ui()
+
+        # Wait for dialog to close
+        self.dialog.wait_window()
+
+    def center_dialog(self):
+        """Center the dialog on the parent window"""
+        self.dialog.update_idletasks()
+
+        # Get parent window position and size
+        parent_x = self.parent.winfo_rootx()
+        parent_y = self.parent.winfo_rooty()
+        parent_width = self.parent.winfo_width()
+        parent_height = self.parent.winfo_height()
+
+        x = parent_x + (parent_width // 2) - 280
+        y = parent_y + (parent_height // 2) - 310
+
+        self.dialog.geometry(f"560x620+{max(x, 0)}+{max(y, 0)}")
+
+    def load_data(self):
+        """Load doctors for the doctor filter"""
+        try:
+            self.doctors = Doctor.get_all()
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='doctors', error=str(e)))
+            self.doctors = []
+
+    def setup_ui(self):
+        # Main frame with padding
+        main_frame = ttk.Frame(self.dialog, padding=30)
+        main_frame.pack(fill='both', expand=True)
+
+        # Title
+        title_label = ttk.Label(main_frame, text=translations.get('batch_export_title'), font=('Segoe UI', 16, 'bold'))
+        title_label.pack(pady=(0, 20))
+
+        fields_frame = ttk.Frame(main_frame)
+        fields_frame.pack(fill='both', expand=True)
+
+        # Doctor filter
+        doctor_label = ttk.Label(fields_frame, text=translations.get('col_doctor'), font=('Segoe UI', 11, 'bold'))
+        doctor_label.pack(anchor='w', pady=(0, 8))
+
+        self.all_doctors_text = translations.get('all_doctors')
+        self.doctor_map = {self.all_doctors_text: None}
+        for doctor in self.doctors:
+            self.doctor_map[doctor.name] = doctor.id
+
+        self.doctor_var = tk.StringVar(value=self.all_doctors_text)
+        self.doctor_combo = ttk.Combobox(
+            fields_frame,
+            textvariable=self.doctor_var,
+            values=list(self.doctor_map),
+            state='readonly',
+            font=('Segoe UI', 11),
+            height=10
+        )
+        self.doctor_combo.pack(fill='x', pady=(0, 15), ipady=6)
+
+        # Unpaid only
+        self.unpaid_var = tk.BooleanVar(value=False)
+        unpaid_check = ttk.Checkbutton(fields_frame, text=translations.get('unpaid_only'), variable=self.unpaid_var)
+        unpaid_check.pack(anchor='w', pady=(0, 15))
+
+        # Date range
+        range_label = ttk.Label(fields_frame, text=translations.get('activity_date_range'), font=('Segoe UI', 11, 'bold'))
+        range_label.pack(anchor='w', pady=(0, 8))
+
+        range_frame = ttk.Frame(fields_frame)
+        range_frame.pack(fill='x', pady=(0, 5))
+        range_frame.columnconfigure((1, 3), weight=1)
+
+        ttk.Label(range_frame, text=translations.get('date_from')).grid(row=0, column=0, sticky='w', padx=(0, 8))
+        self.start_var = tk.StringVar()
+        ttk.Entry(range_frame, textvariable=self.start_var, font=('Segoe UI', 11)).grid(row=0, column=1, sticky='ew', ipady=4)
+
+        ttk.Label(range_frame, text=translations.get('date_to')).grid(row=0, column=2, sticky='w', padx=(15, 8))
+        self.end_var = tk.StringVar()
+        ttk.Entry(range_frame, textvariable=self.end_var, font=('Segoe UI', 11)).grid(row=0, column=3, sticky='ew', ipady=4)
+
+        hint_label = ttk.Label(fields_frame, text=translations.get('date_format_hint'), font=('Segoe UI', 9), foreground='#7f8c8d')
+        hint_label.pack(anchor='w', pady=(0, 15))
+
+        # Output mode
+        output_label = ttk.Label(fields_frame, text=translations.get('export_output'), font=('Segoe UI', 11, 'bold'))
+        output_label.pack(anchor='w', pady=(0, 8))
+
+        self.merge_var = tk.BooleanVar(value=False)
+        ttk.Radiobutton(fields_frame, text=translations.get('output_directory'), variable=self.merge_var,
+                        value=False).pack(anchor='w')
+        ttk.Radiobutton(fields_frame, text=translations.get('output_merged_pdf'), variable=self.merge_var,
+                        value=True).pack(anchor='w', pady=(0, 8))
+
+        path_frame = ttk.Frame(fields_frame)
+        path_frame.pack(fill='x', pady=(0, 15))
+        path_frame.columnconfigure(0, weight=1)
+
+        self.output_var = tk.StringVar()
+        ttk.Entry(path_frame, textvariable=self.output_var, font=('Segoe UI', 11)).grid(row=0, column=0, sticky='ew', ipady=4)
+        ttk.Button(path_frame, text=translations.get('browse'), command=self.browse_output).grid(row=0, column=1, padx=(8, 0), ipadx=10)
+
+        # Buttons frame
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill='x', pady=(20, 0))
+
+        cancel_btn = ttk.Button(
+            buttons_frame,
+            text=translations.get('btn_cancel'),
+            command=self.cancel,
+            style='TButton'
+        )
+        cancel_btn.pack(side='right', padx=(15, 0), ipadx=20, ipady=8)
+
+        export_btn = ttk.Button(
+            buttons_frame,
+            text=translations.get('btn_export'),
+            command=self.save,
+            style='Success.TButton'
+        )
+        export_btn.pack(side='right', ipadx=20, ipady=8)
+
+        self.dialog.bind('<Escape>', lambda e: self.cancel())
+
+    def browse_output(self):
+        """Choose the output directory or merged PDF file"""
+        if self.merge_var.get():
+            path = filedialog.asksaveasfilename(
+                parent=self.dialog,
+                title=translations.get('save_pdf'),
+                defaultextension=".pdf",
+                filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
+                initialfile=f"Statements_{datetime.now().strftime('%Y%m%d')}.pdf"
+            )
+        else:
+            path = filedialog.askdirectory(parent=self.dialog, title=translations.get('output_directory'))
+        if path:
+            self.output_var.set(path)
+
+    def parse_date(self, value, errors):
+        """Parse an optional YYYY-MM-DD entry"""
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except ValueError:
+            errors.append(translations.get('invalid_date', value=value))
+            return None
+
+    def save(self):
+        """Validate the options and close"""
+        errors = []
+        start_date = self.parse_date(self.start_var.get(), errors)
+        end_date = self.parse_date(self.end_var.get(), errors)
+        if start_date and end_date and start_date > end_date:
+            errors.append(translations.get('invalid_date_range'))
+        output = self.output_var.get().strip()
+        if not output:
+            errors.append(translations.get('output_required'))
+
+        if errors:
+            messagebox.showerror(translations.get('validation_error'), "\n".join(errors), parent=self.dialog)
+            return
+
+        self.result = {
+            'doctor_id': self.doctor_map.get(self.doctor_var.get()),
+            'unpaid_only': self.unpaid_var.get(),
+            'start_date': start_date,
+            'end_date': end_date,
+            'merge': self.merge_var.get(),
+            'output': output
+        }
+        self.dialog.destroy()
+
+    def cancel(self):
+        """Cancel the dialog"""
+        self.result = None
+        self.dialog.destroy()
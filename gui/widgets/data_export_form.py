@@ -0,0 +1,139 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from dataio.exporter import DATASETS, FORMATS
+from localization.translations import translations
+
+
+class DataExportForm:
+    """Choose which tables to export, the file format and the output directory"""
+
+    def __init__(self, parent, title="Export Data"):
+        self.parent = parent
+        self.result = None
+
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("520x600")
+        self.dialog.resizable(True, True)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # Center the dialog
+        self.center_dialog()
+
+        # Setup UI
+        self.setup_ui(title)
+
+        # Wait for dialog to close
+        self.dialog.wait_window()
+
+    def center_dialog(self):
+        """Center the dialog on the parent window"""
+        self.dialog.update_idletasks()
+
+        x = self.parent.winfo_rootx() + (self.parent.winfo_width() // 2) - 260
+        y = self.parent.winfo_rooty() + (self.parent.winfo_height() // 2) - 300
+
+        self.dialog.geometry(f"520x600+{max(x, 0)}+{max(y, 0)}")
+
+    def setup_ui(self, title):
+        # Main frame with padding
+        main_frame = ttk.Frame(self.dialog, padding=30)
+        main_frame.pack(fill='both', expand=True)
+
+        # Title
+        title_label = ttk.Label(main_frame, text=title, font=('Segoe UI', 16, 'bold'))
+        title_label.pack(pady=(0, 20))
+
+        fields_frame = ttk.Frame(main_frame)
+        fields_frame.pack(fill='both', expand=True)
+
+        # Datasets
+        datasets_label = ttk.Label(fields_frame, text=translations.get('export_datasets'), font=('Segoe UI', 11, 'bold'))
+        datasets_label.pack(anchor='w', pady=(0, 8))
+
+        self.dataset_vars = {}
+        for name in DATASETS:
+            var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(fields_frame, text=translations.get(f'dataset_{name}'), variable=var).pack(anchor='w')
+            self.dataset_vars[name] = var
+
+        # Format
+        format_label = ttk.Label(fields_frame, text=translations.get('export_format'), font=('Segoe UI', 11, 'bold'))
+        format_label.pack(anchor='w', pady=(15, 8))
+
+        self.format_var = tk.StringVar(value=FORMATS[0])
+        for fmt in FORMATS:
+            ttk.Radiobutton(fields_frame, text=translations.get(f'format_{fmt}'), variable=self.format_var,
+                            value=fmt).pack(anchor='w')
+
+        self.compress_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(fields_frame, text=translations.get('export_gzip'), variable=self.compress_var).pack(anchor='w', pady=(8, 15))
+
+        # Output directory
+        output_label = ttk.Label(fields_frame, text=translations.get('export_directory'), font=('Segoe UI', 11, 'bold'))
+        output_label.pack(anchor='w', pady=(0, 8))
+
+        path_frame = ttk.Frame(fields_frame)
+        path_frame.pack(fill='x', pady=(0, 15))
+        path_frame.columnconfigure(0, weight=1)
+
+        self.output_var = tk.StringVar()
+        ttk.Entry(path_frame, textvariable=self.output_var, font=('Segoe UI', 11)).grid(row=0, column=0, sticky='ew', ipady=4)
+        ttk.Button(path_frame, text=translations.get('browse'), command=self.browse_output).grid(row=0, column=1, padx=(8, 0), ipadx=10)
+
+        # Buttons frame
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill='x', pady=(20, 0))
+
+        cancel_btn = ttk.Button(
+            buttons_frame,
+            text=translations.get('btn_cancel'),
+            command=self.cancel,
+            style='TButton'
+        )
+        cancel_btn.pack(side='right', padx=(15, 0), ipadx=20, ipady=8)
+
+        export_btn = ttk.Button(
+            buttons_frame,
+            text=translations.get('btn_export'),
+            command=self.save,
+            style='Success.TButton'
+        )
+        export_btn.pack(side='right', ipadx=20, ipady=8)
+
+        self.dialog.bind('<Escape>', lambda e: self.cancel())
+
+    def browse_output(self):
+        """Choose the directory the files are written to"""
+        path = filedialog.askdirectory(parent=self.dialog, title=translations.get('export_directory'))
+        if path:
+            self.output_var.set(path)
+
+    def save(self):
+        """Validate the options and close"""
+        errors = []
+        names = [name for name, var in self.dataset_vars.items() if var.get()]
+        if not names:
+            errors.append(translations.get('export_datasets_required'))
+        output = self.output_var.get().strip()
+        if not output:
+            errors.append(translations.get('output_required'))
+
+        if errors:
+            messagebox.showerror(translations.get('validation_error'), "\n".join(errors), parent=self.dialog)
+            return
+
+        self.result = {
+            'names': names,
+            'format': self.format_var.get(),
+            'compress': self.compress_var.get(),
+            'output': output
+        }
+        self.dialog.destroy()
+
+    def cancel(self):
+        """Cancel the dialog"""
+        self.result = None
+        self.dialog.destroy()
@@ -0,0 +1,143 @@
+import tkinter as tk
+from tkinter import ttk
+import queue
+import threading
+from localization.translations import translations
+
+
+class ExportProgressDialog:
+    """Modal progress window that runs a task on a worker thread.
+
+    The task is called as task(progress, cancel_event); progress(fraction, text=None)
+    may be called from the worker thread. Results are delivered back on the Tk thread.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, parent, title, message=""):
+        self.parent = parent
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        self.worker = None
+        self.on_success = None
+        self.on_error = None
+        self.on_cancel = None
+
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("420x160")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.setup_ui(message)
+        self.center_dialog()
+
+        # Remember the modal window we take the grab from so it can be restored
+        self.previous_grab = self.dialog.grab_current()
+        self.dialog.grab_set()
+
+    def center_dialog(self):
+        """Center the dialog on the parent window"""
+        self.dialog.update_idletasks()
+
+        x = self.parent.winfo_rootx() + (self.parent.winfo_width() // 2) - 210
+        y = self.parent.winfo_rooty() + (self.parent.winfo_height() // 2) - 80
+
+        self.dialog.geometry(f"420x160+{x}+{y}")
+
+    def setup_ui(self, message):
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill='both', expand=True)
+
+        self.message_label = ttk.Label(main_frame, text=message, font=('Segoe UI', 11))
+        self.message_label.pack(anchor='w', pady=(0, 10))
+
+        self.progress_var = tk.DoubleVar(value=0)
+        self.progress_bar = ttk.Progressbar(
+            main_frame,
+            variable=self.progress_var,
+            maximum=100,
+            mode='determinate'
+        )
+        self.progress_bar.pack(fill='x', pady=(0, 15))
+
+        self.cancel_btn = ttk.Button(
+            main_frame,
+            text=translations.get('btn_cancel'),
+            command=self.cancel,
+            style='Danger.TButton'
+        )
+        self.cancel_btn.pack(side='right', ipadx=15, ipady=4)
+
+    def run(self, task, on_success=None, on_error=None, on_cancel=None):
+        """Start task on a worker thread and poll its progress from the Tk loop"""
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+
+        def progress(fraction, text=None):
+            self.events.put(('progress', (fraction, text)))
+
+        def work():
+            try:
+                result = task(progress, self.cancel_event)
+            except Exception as e:
+                if self.cancel_event.is_set():
+                    self.events.put(('cancelled', None))
+                else:
+                    self.events.put(('error', e))
+            else:
+                self.events.put(('cancelled', None) if self.cancel_event.is_set() else ('done', result))
+
+        self.worker = threading.Thread(target=work)
+        self.worker.daemon = True
+        self.worker.start()
+        self.dialog.after(self.POLL_MS, self.poll)
+
+    def poll(self):
+        """Apply queued progress updates and finish when the worker reports back"""
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == 'progress':
+                    fraction, text = payload
+                    self.progress_var.set(fraction * 100)
+                    if text:
+                        self.message_label.config(text=text)
+                else:
+                    self.finish(kind, payload)
+                    return
+        except queue.Empty:
+            pass
+        self.dialog.after(self.POLL_MS, self.poll)
+
+    def finish(self, kind, payload):
+        """Close the dialog and hand the outcome to the matching callback"""
+        self.close()
+        if kind == 'done' and self.on_success:
+            self.on_success(payload)
+        elif kind == 'error' and self.on_error:
+            self.on_error(payload)
+        elif kind == 'cancelled' and self.on_cancel:
+            self.on_cancel()
+
+    def cancel(self):
+        """Ask the worker to stop; the dialog closes once it has"""
+        self.cancel_event.set()
+        self.cancel_btn.config(state='disabled')
+        self.message_label.config(text=translations.get('cancelling'))
+
+    def close(self):
+        """Release the grab back to the parent window and destroy the dialog"""
+        try:
+            self.dialog.grab_release()
+            self.dialog.destroy()
+        except tk.TclError:
+            pass
+        if self.previous_grab is not None:
+            try:
+                self.previous_grab.grab_set()
+            except tk.TclError:
+                pass
@@ -0,0 +1,167 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from dataio.importer import FIELDS, REQUIRED, read_header, guess_mapping
+from localization.translations import translations
+
+
+class ImportForm:
+    """Choose a CSV/XLSX file and which of its columns fill each field"""
+
+    def __init__(self, parent, table, title="Import"):
+        self.parent = parent
+        self.table = table
+        self.result = None
+        self.header = []
+        self.field_vars = {}
+
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("560x560")
+        self.dialog.resizable(True, True)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+
+        # Center the dialog
+        self.center_dialog()
+
+        # Setup UI
+        self.setup_ui(title)
+
+        # Wait for dialog to close
+        self.dialog.wait_window()
+
+    def center_dialog(self):
+        """Center the dialog on the parent window"""
+        self.dialog.update_idletasks()
+
+        x = self.parent.winfo_rootx() + (self.parent.winfo_width() // 2) - 280
+        y = self.parent.winfo_rooty() + (self.parent.winfo_height() // 2) - 280
+
+        self.dialog.geometry(f"560x560+{max(x, 0)}+{max(y, 0)}")
+
+    def setup_ui(self, title):
+        # Main frame with padding
+        main_frame = ttk.Frame(self.dialog, padding=30)
+        main_frame.pack(fill='both', expand=True)
+
+        # Title
+        title_label = ttk.Label(main_frame, text=title, font=('Segoe UI', 16, 'bold'))
+        title_label.pack(pady=(0, 20))
+
+        fields_frame = ttk.Frame(main_frame)
+        fields_frame.pack(fill='both', expand=True)
+
+        # Source file
+        file_label = ttk.Label(fields_frame, text=translations.get('import_file'), font=('Segoe UI', 11, 'bold'))
+        file_label.pack(anchor='w', pady=(0, 8))
+
+        path_frame = ttk.Frame(fields_frame)
+        path_frame.pack(fill='x', pady=(0, 15))
+        path_frame.columnconfigure(0, weight=1)
+
+        self.path_var = tk.StringVar()
+        ttk.Entry(path_frame, textvariable=self.path_var, font=('Segoe UI', 11), state='readonly').grid(row=0, column=0, sticky='ew', ipady=4)
+        ttk.Button(path_frame, text=translations.get('browse'), command=self.browse_file).grid(row=0, column=1, padx=(8, 0), ipadx=10)
+
+        # Column mapping
+        mapping_label = ttk.Label(fields_frame, text=translations.get('import_mapping'), font=('Segoe UI', 11, 'bold'))
+        mapping_label.pack(anchor='w', pady=(0, 8))
+
+        mapping_frame = ttk.Frame(fields_frame)
+        mapping_frame.pack(fill='x', pady=(0, 15))
+        mapping_frame.columnconfigure(1, weight=1)
+
+        self.not_mapped_text = translations.get('import_not_mapped')
+        self.column_combos = []
+        for row, field in enumerate(FIELDS[self.table]):
+            text = translations.get(f'import_field_{field}')
+            if field in REQUIRED[self.table]:
+                text += " *"
+            ttk.Label(mapping_frame, text=text).grid(row=row, column=0, sticky='w', padx=(0, 15), pady=4)
+            var = tk.StringVar(value=self.not_mapped_text)
+            combo = ttk.Combobox(mapping_frame, textvariable=var, values=[self.not_mapped_text],
+                                 state='readonly', font=('Segoe UI', 11))
+            combo.grid(row=row, column=1, sticky='ew', pady=4, ipady=4)
+            self.field_vars[field] = var
+            self.column_combos.append(combo)
+
+        # Buttons frame
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill='x', pady=(20, 0))
+
+        cancel_btn = ttk.Button(
+            buttons_frame,
+            text=translations.get('btn_cancel'),
+            command=self.cancel,
+            style='TButton'
+        )
+        cancel_btn.pack(side='right', padx=(15, 0), ipadx=20, ipady=8)
+
+        import_btn = ttk.Button(
+            buttons_frame,
+            text=translations.get('btn_import'),
+            command=self.save,
+            style='Success.TButton'
+        )
+        import_btn.pack(side='right', ipadx=20, ipady=8)
+
+        self.dialog.bind('<Escape>', lambda e: self.cancel())
+
+    def column_text(self, index):
+        """Combobox entry for a column: its number and header text"""
+        return f"{index + 1}: {self.header[index]}"
+
+    def browse_file(self):
+        """Choose the file and preselect the columns whose headers name a field"""
+        path = filedialog.askopenfilename(
+            parent=self.dialog,
+            title=translations.get('import_file'),
+            filetypes=[("Spreadsheets", "*.csv *.xlsx"), ("CSV files", "*.csv"),
+                       ("Excel workbooks", "*.xlsx"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.header = read_header(path)
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('import_error', error=str(e)), parent=self.dialog)
+            return
+        self.path_var.set(path)
+
+        columns = [self.not_mapped_text] + [self.column_text(index) for index in range(len(self.header))]
+        for combo in self.column_combos:
+            combo['values'] = columns
+        mapping = guess_mapping(self.header, self.table)
+        for field, var in self.field_vars.items():
+            var.set(self.column_text(mapping[field]) if field in mapping else self.not_mapped_text)
+
+    def save(self):
+        """Validate the mapping and close"""
+        errors = []
+        path = self.path_var.get()
+        if not path:
+            errors.append(translations.get('import_file_required'))
+
+        columns = [self.column_text(index) for index in range(len(self.header))]
+        mapping = {}
+        for field, var in self.field_vars.items():
+            if var.get() in columns:
+                mapping[field] = columns.index(var.get())
+            elif path and field in REQUIRED[self.table]:
+                errors.append(translations.get('import_field_required', field=translations.get(f'import_field_{field}')))
+
+        if errors:
+            messagebox.showerror(translations.get('validation_error'), "\n".join(errors), parent=self.dialog)
+            return
+
+        self.result = {
+            'path': path,
+            'mapping': mapping
+        }
+        self.dialog.destroy()
+
+    def cancel(self):
+        """Cancel the dialog"""
+        self.result = None
+        self.dialog.destroy()
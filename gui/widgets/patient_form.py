@@ -2,20 +2,32 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from datetime import datetime, date
+import queue
 import re
+import threading
+from models import Patient
 from localization.translations import translations
 
 
 class PatientForm:
+    # Wait for a pause in typing before looking for duplicates
+    DUPLICATE_DELAY_MS = 300
+    POLL_MS = 50
+
     def __init__(self, parent, title="Patient Form", patient=None):
         self.parent = parent
         self.patient = patient
         self.result = None
+        # Set when the user chooses to open a matching patient instead of saving
+        self.existing_patient = None
+        self.duplicate_job = None
+        self.duplicate_generation = 0
+        self.duplicate_results = queue.Queue()
         
         # Create dialog window with better size
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(title)
-        self.dialog.geometry("550x650")
+        self.dialog.geometry("550x750")
         self.dialog.resizable(True, True)
         self.dialog.transient(parent)
         self.dialog.grab_set()
@@ -56,7 +68,7 @@ class PatientForm:
         x = 100
         y = 100
 
-        self.dialog.geometry(f"550x650+{x}+{y}")
+        self.dialog.geometry(f"550x750+{x}+{y}")
         
     def setup_ui(self):
         # Main frame with padding
@@ -88,6 +100,14 @@ class PatientForm:
         self.phone_entry = ttk.Entry(fields_frame, textvariable=self.phone_var, font=('Segoe UI', 11))
         self.phone_entry.pack(fill='x', pady=(0, 20), ipady=8)
         
+        # Possible duplicates, filled in while the user types
+        self.duplicates_frame = ttk.Frame(fields_frame, style='Card.TFrame', padding=10)
+        self.duplicates_anchor = ttk.Frame(fields_frame)
+        self.duplicates_anchor.pack(fill='x')
+        
+        self.name_var.trace_add('write', self.schedule_duplicate_check)
+        self.phone_var.trace_add('write', self.schedule_duplicate_check)
+        
         # Gender field
         gender_label = ttk.Label(fields_frame, text=translations.get('gender'), font=('Segoe UI', 11, 'bold'))
         gender_label.pack(anchor='w', pady=(0, 8))
@@ -197,6 +217,81 @@ class PatientForm:
         self.phone_entry.bind('<Return>', lambda e: self.save())
         self.dialog.bind('<Escape>', lambda e: self.cancel())
         
+    def schedule_duplicate_check(self, *args):
+        """Look for existing patients once typing pauses"""
+        if self.duplicate_job is not None:
+            self.dialog.after_cancel(self.duplicate_job)
+        self.duplicate_job = self.dialog.after(self.DUPLICATE_DELAY_MS, self.start_duplicate_check)
+        
+    def start_duplicate_check(self):
+        """Query for duplicates on a worker thread; only the newest result is shown"""
+        self.duplicate_job = None
+        self.duplicate_generation += 1
+        generation = self.duplicate_generation
+        name = self.name_var.get().strip()
+        phone = self.phone_var.get().strip()
+        exclude_id = self.patient.id if self.patient else None
+        
+        def work():
+            try:
+                matches = Patient.find_duplicates(name, phone, exclude_id=exclude_id)
+            except Exception as e:
+                print(f"Error checking for duplicate patients: {e}")
+                matches = []
+            self.duplicate_results.put((generation, matches))
+            
+        threading.Thread(target=work, daemon=True).start()
+        self.dialog.after(self.POLL_MS, self.poll_duplicates)
+        
+    def poll_duplicates(self):
+        """Show the worker's result on the Tk thread"""
+        if not self.dialog.winfo_exists():
+            return
+        try:
+            generation, matches = self.duplicate_results.get_nowait()
+        except queue.Empty:
+            self.dialog.after(self.POLL_MS, self.poll_duplicates)
+            return
+        if generation == self.duplicate_generation:
+            self.show_duplicates(matches)
+            
+    def show_duplicates(self, matches):
+        """List matching patients under the phone field, or hide the list"""
+        for widget in self.duplicates_frame.winfo_children():
+            widget.destroy()
+        if not matches:
+            self.duplicates_frame.pack_forget()
+            return
+        
+        ttk.Label(
+            self.duplicates_frame,
+            text=f"⚠️ {translations.get('possible_duplicates')}",
+            font=('Segoe UI', 10, 'bold'),
+            foreground='#f39c12'
+        ).pack(anchor='w', pady=(0, 5))
+        
+        for patient, reason in matches:
+            row = ttk.Frame(self.duplicates_frame)
+            row.pack(fill='x', pady=2)
+            reason_text = translations.get('duplicate_same_phone' if reason == 'phone' else 'duplicate_similar_name')
+            ttk.Label(
+                row,
+                text=f"{patient.name} ({patient.phone}) - {reason_text}",
+                font=('Segoe UI', 10)
+            ).pack(side='left')
+            ttk.Button(
+                row,
+                text=translations.get('btn_open'),
+                command=lambda p=patient: self.open_existing(p)
+            ).pack(side='right')
+        self.duplicates_frame.pack(in_=self.duplicates_anchor, fill='x', pady=(0, 20))
+        
+    def open_existing(self, patient):
+        """Close without saving and hand the matching patient back to the caller"""
+        self.existing_patient = patient
+        self.result = None
+        self.dialog.destroy()
+        
     def populate_fields(self):
         """Populate fields when editing"""
         if self.patient:
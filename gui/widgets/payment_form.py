@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from datetime import datetime, date
+from models.money import Money
 
 
 class PaymentForm:
@@ -192,10 +193,10 @@ class PaymentForm:
             errors.append("Payment amount is required")
         else:
             try:
-                amount = float(amount_str)
+                amount = Money.of(amount_str)
                 if amount <= 0:
                     errors.append("Payment amount must be greater than zero")
-                elif amount > 999999.99:
+                elif amount > Money.of('999999.99'):
                     errors.append("Payment amount is too large")
             except ValueError:
                 errors.append("Payment amount must be a valid number")
@@ -230,7 +231,7 @@ class PaymentForm:
             return
             
         # Prepare data
-        amount = float(self.amount_var.get().strip())
+        amount = Money.of(self.amount_var.get())
         notes = self.notes_text.get('1.0', 'end-1c').strip() or None
         
         # Get date
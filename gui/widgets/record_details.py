@@ -1,24 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from models import Treatment, Payment
+from models import Treatment, Payment, RecordSnapshot, Ledger
 from gui.widgets.treatment_form import TreatmentForm
 from gui.widgets.payment_form import PaymentForm
+from gui.widgets.export_progress import ExportProgressDialog
+from gui.scrolling import register_scrollable
 from localization.translations import translations
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.pdfgen import canvas
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reports.record_pdf import build_record_pdf, default_filename
 import os
-from datetime import datetime
 
 
 class RecordDetailsWindow:
     def __init__(self, parent, record):
         self.parent = parent
         self.record = record
+        self.snapshot = None
+        self.ledger = None
+        self.loaded_tabs = set()
         self.selected_treatment = None
         self.selected_payment = None
         
@@ -90,8 +88,8 @@ class RecordDetailsWindow:
         main_frame.columnconfigure(0, weight=1)
         main_frame.rowconfigure(0, weight=1)
         
-        # Bind mousewheel for full window scrolling
-        self.bind_mousewheel()
+        # The wheel scrolls this canvas anywhere over its content
+        register_scrollable(self.main_canvas)
         
         # Set up content with minimal padding for full width
         content_frame = ttk.Frame(self.scrollable_frame, padding=15)
@@ -107,25 +105,6 @@ class RecordDetailsWindow:
         # Buttons frame
         self.setup_buttons(content_frame)
         
-    def bind_mousewheel(self):
-        """Bind mousewheel events for full window scrolling"""
-        def _on_mousewheel(event):
-            self.main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        # Bind to multiple widgets to ensure scrolling works everywhere
-        self.main_canvas.bind("<MouseWheel>", _on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
-        self.window.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Function to bind mousewheel to all child widgets recursively
-        def bind_to_children(widget):
-            widget.bind("<MouseWheel>", _on_mousewheel)
-            for child in widget.winfo_children():
-                bind_to_children(child)
-        
-        # Bind after a short delay to ensure all widgets are created
-        self.window.after(100, lambda: bind_to_children(self.scrollable_frame))
-        
     def setup_header(self, parent):
         header_frame = ttk.Frame(parent, style='Card.TFrame', padding=15)
         header_frame.pack(fill='x', pady=(0, 15))
@@ -263,6 +242,9 @@ class RecordDetailsWindow:
         # Payments tab
         self.setup_payments_tab()
         
+        # Ledger tab
+        self.setup_ledger_tab()
+        
     def setup_treatments_tab(self):
         # Treatments frame with full width
         treatments_frame = ttk.Frame(self.notebook)
@@ -319,7 +301,8 @@ class RecordDetailsWindow:
         self.treatments_tree = ttk.Treeview(
             treatments_table_frame, 
             columns=treatment_columns,
-            show='headings'
+            show='headings',
+            height=15
         )
         
         # Configure treatment columns with better widths for full screen
@@ -335,8 +318,14 @@ class RecordDetailsWindow:
         self.treatments_tree.column('Date', width=150, anchor='center')
         self.treatments_tree.column('Notes', width=400)
         
-        # Grid treatment table without scrollbars - full width
+        # Grid treatment table with a fixed height; more rows are fetched on scroll
+        treatments_scrollbar = ttk.Scrollbar(treatments_table_frame, orient='vertical', command=self.treatments_tree.yview)
+        self.treatments_tree.configure(yscrollcommand=self.on_scroll(treatments_scrollbar, self.load_more_treatments))
         self.treatments_tree.grid(row=0, column=0, sticky="ew")
+        treatments_scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        self.treatments_footer, self.more_treatments_btn = self.setup_page_footer(
+            treatments_table_frame, self.load_more_treatments)
         
         # Bind treatment events
         self.treatments_tree.bind('<<TreeviewSelect>>', self.on_treatment_select)
@@ -400,7 +389,8 @@ class RecordDetailsWindow:
         self.payments_tree = ttk.Treeview(
             payments_table_frame, 
             columns=payment_columns,
-            show='headings'
+            show='headings',
+            height=15
         )
         
         # Configure payment columns with better widths for full screen
@@ -414,8 +404,14 @@ class RecordDetailsWindow:
         self.payments_tree.column('Date', width=150, anchor='center')
         self.payments_tree.column('Notes', width=500)
         
-        # Grid payment table without scrollbars - full width
+        # Grid payment table with a fixed height; more rows are fetched on scroll
+        payments_scrollbar = ttk.Scrollbar(payments_table_frame, orient='vertical', command=self.payments_tree.yview)
+        self.payments_tree.configure(yscrollcommand=self.on_scroll(payments_scrollbar, self.load_more_payments))
         self.payments_tree.grid(row=0, column=0, sticky="ew")
+        payments_scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        self.payments_footer, self.more_payments_btn = self.setup_page_footer(
+            payments_table_frame, self.load_more_payments)
         
         # Bind payment events
         self.payments_tree.bind('<<TreeviewSelect>>', self.on_payment_select)
@@ -423,6 +419,79 @@ class RecordDetailsWindow:
         
         self.notebook.add(payments_frame, text=translations.get('payments_tab'))
         
+    def setup_ledger_tab(self):
+        # Read-only chronological view of treatments and payments with a running balance
+        ledger_frame = ttk.Frame(self.notebook)
+        ledger_frame.columnconfigure(0, weight=1)
+        
+        ledger_header = ttk.Frame(ledger_frame, padding=15)
+        ledger_header.grid(row=0, column=0, sticky="ew")
+        
+        ledger_title = ttk.Label(
+            ledger_header, 
+            text=translations.get('ledger_tab'), 
+            font=('Segoe UI', 14, 'bold')
+        )
+        ledger_title.grid(row=0, column=0, sticky="w")
+        
+        ledger_table_frame = ttk.Frame(ledger_frame, padding=15)
+        ledger_table_frame.grid(row=1, column=0, sticky="ew")
+        ledger_table_frame.columnconfigure(0, weight=1)
+        
+        ledger_columns = ('Date', 'Type', 'Description', 'Debit', 'Credit', 'Balance', 'Notes')
+        self.ledger_tree = ttk.Treeview(
+            ledger_table_frame, 
+            columns=ledger_columns,
+            show='headings',
+            height=15
+        )
+        
+        self.ledger_tree.heading('Date', text=translations.get('col_date'))
+        self.ledger_tree.heading('Type', text=translations.get('col_type'))
+        self.ledger_tree.heading('Description', text=translations.get('col_description'))
+        self.ledger_tree.heading('Debit', text=translations.get('col_debit'))
+        self.ledger_tree.heading('Credit', text=translations.get('col_credit'))
+        self.ledger_tree.heading('Balance', text=translations.get('col_balance'))
+        self.ledger_tree.heading('Notes', text=translations.get('col_notes'))
+        
+        self.ledger_tree.column('Date', width=110, anchor='center')
+        self.ledger_tree.column('Type', width=100, anchor='center')
+        self.ledger_tree.column('Description', width=230)
+        self.ledger_tree.column('Debit', width=120, anchor='center')
+        self.ledger_tree.column('Credit', width=120, anchor='center')
+        self.ledger_tree.column('Balance', width=120, anchor='center')
+        self.ledger_tree.column('Notes', width=300)
+        
+        ledger_scrollbar = ttk.Scrollbar(ledger_table_frame, orient='vertical', command=self.ledger_tree.yview)
+        self.ledger_tree.configure(yscrollcommand=self.on_scroll(ledger_scrollbar, self.load_more_ledger))
+        self.ledger_tree.grid(row=0, column=0, sticky="ew")
+        ledger_scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        self.ledger_footer, self.more_ledger_btn = self.setup_page_footer(
+            ledger_table_frame, self.load_more_ledger)
+        
+        self.notebook.add(ledger_frame, text=translations.get('ledger_tab'))
+        
+    def setup_page_footer(self, parent, load_more):
+        """Row count label and load more button under a table"""
+        footer_frame = ttk.Frame(parent)
+        footer_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+        
+        count_label = ttk.Label(footer_frame, font=('Segoe UI', 9), foreground='#7f8c8d')
+        count_label.pack(side='left')
+        
+        more_btn = ttk.Button(footer_frame, text=translations.get('load_more'), command=load_more)
+        more_btn.pack(side='right', ipadx=10)
+        return count_label, more_btn
+        
+    def on_scroll(self, scrollbar, load_more):
+        """yscrollcommand that also fetches the next page when the end is reached"""
+        def command(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 1.0 and float(first) > 0.0:
+                self.window.after_idle(load_more)
+        return command
+        
     def setup_buttons(self, parent):
         # Buttons frame
         buttons_frame = ttk.Frame(parent)
@@ -447,321 +516,242 @@ class RecordDetailsWindow:
         close_btn.pack(side='right', ipadx=20, ipady=8)
         
     def load_data(self):
-        """Load treatments and payments data"""
-        self.load_treatments()
-        self.load_payments()
+        """Load the record header and totals; tab rows are fetched when shown"""
+        try:
+            self.snapshot = RecordSnapshot.load_summary(self.record.id)
+        except Exception as e:
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='record', error=str(e)))
+            return
+        if self.snapshot is None:
+            return
+        self.record = self.snapshot.record
         self.update_summary()
         
-    def load_treatments(self):
-        """Load treatments into the table"""
-        # Clear existing data
-        for item in self.treatments_tree.get_children():
-            self.treatments_tree.delete(item)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.on_tab_changed()
+        
+    def on_tab_changed(self, event=None):
+        """Fetch the first page of the visible tab the first time it is shown"""
+        if self.snapshot is None:
+            return
+        tab = self.notebook.index('current')
+        if tab in self.loaded_tabs:
+            return
+        self.loaded_tabs.add(tab)
+        if tab == 0:
+            self.load_more_treatments()
+        elif tab == 1:
+            self.load_more_payments()
+        else:
+            self.load_more_ledger()
             
+    def treatment_values(self, treatment):
+        """Row values for a treatment"""
+        treatment_date = treatment.date.strftime("%Y-%m-%d") if treatment.date else ""
+        return (
+            treatment.id,
+            treatment.name,
+            f"${treatment.cost:.2f}",
+            treatment_date,
+            treatment.notes or ""
+        )
+        
+    def payment_values(self, payment):
+        """Row values for a payment"""
+        payment_date = payment.date.strftime("%Y-%m-%d") if payment.date else ""
+        return (
+            payment.id,
+            f"${payment.amount:.2f}",
+            payment_date,
+            payment.notes or ""
+        )
+        
+    def ledger_values(self, entry):
+        """Row values for a ledger entry"""
+        if entry.kind == 'treatment':
+            description, debit, credit = entry.description or "", f"${entry.debit:.2f}", ""
+        else:
+            description, debit, credit = "", "", f"${entry.credit:.2f}"
+        return (
+            entry.date.strftime("%Y-%m-%d") if entry.date else "",
+            translations.get(f'entry_{entry.kind}'),
+            description,
+            debit,
+            credit,
+            f"${entry.balance:.2f}",
+            entry.notes or ""
+        )
+        
+    def load_more_treatments(self):
+        """Append the next page of treatments to the table"""
+        if self.snapshot.treatments_complete:
+            return
         try:
-            treatments = self.record.treatments()
-            for treatment in treatments:
-                treatment_date = treatment.date.strftime("%Y-%m-%d") if treatment.date else ""
-                self.treatments_tree.insert('', 'end', values=(
-                    treatment.id,
-                    treatment.name,
-                    f"${treatment.cost:.2f}",
-                    treatment_date,
-                    treatment.notes or ""
-                ))
+            treatments = self.snapshot.fetch_treatments()
         except Exception as e:
-            messagebox.showerror(translations.get('error'), f"Failed to load treatments: {str(e)}")
-            
-    def load_payments(self):
-        """Load payments into the table"""
-        # Clear existing data
-        for item in self.payments_tree.get_children():
-            self.payments_tree.delete(item)
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='treatments', error=str(e)))
+            return
+        for treatment in treatments:
+            if not self.treatments_tree.exists(str(treatment.id)):
+                self.treatments_tree.insert('', 'end', iid=str(treatment.id), values=self.treatment_values(treatment))
+        self.update_page_footers()
             
+    def load_more_payments(self):
+        """Append the next page of payments to the table"""
+        if self.snapshot.payments_complete:
+            return
         try:
-            payments = self.record.payments()
-            for payment in payments:
-                payment_date = payment.date.strftime("%Y-%m-%d") if payment.date else ""
-                self.payments_tree.insert('', 'end', values=(
-                    payment.id,
-                    f"${payment.amount:.2f}",
-                    payment_date,
-                    payment.notes or ""
-                ))
+            payments = self.snapshot.fetch_payments()
         except Exception as e:
-            messagebox.showerror(translations.get('error'), f"Failed to load payments: {str(e)}")
-            
-    def update_summary(self):
-        """Update the summary section"""
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='payments', error=str(e)))
+            return
+        for payment in payments:
+            if not self.payments_tree.exists(str(payment.id)):
+                self.payments_tree.insert('', 'end', iid=str(payment.id), values=self.payment_values(payment))
+        self.update_page_footers()
+        
+    def load_more_ledger(self):
+        """Append the next page of ledger entries to the table"""
+        if self.ledger is None:
+            self.ledger = Ledger(self.record.id)
+        if self.ledger.complete:
+            return
         try:
-            total_cost = self.record.cost()
-            total_paid = self.record.amount()
-            balance = self.record.balance()
-            
-            self.cost_value.config(text=f"${total_cost:.2f}")
-            self.paid_value.config(text=f"${total_paid:.2f}")
-            self.balance_value.config(text=f"${balance:.2f}")
-            
-            # Update balance color
-            if balance > 0:
-                self.balance_value.config(foreground='#e74c3c')  # Red
-            elif balance == 0:
-                self.balance_value.config(foreground='#27ae60')  # Green
-            else:
-                self.balance_value.config(foreground='#f39c12')  # Orange (overpaid)
-                
+            entries = self.ledger.fetch()
         except Exception as e:
-            print(f"Error updating summary: {e}")
-            
-    def export_to_pdf(self):
-        """Export record details to PDF"""
-        try:
-            # Ask user for save location
-            filename = filedialog.asksaveasfilename(
-                title=translations.get('save_pdf'),
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
-                initialfile=f"Record_{self.record.doctor_name}_{self.record.patient_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
-            )
-            
-            if not filename:
-                return
-                
-            # Create PDF
-            self.create_pdf(filename)
-            
-            # Show success message
-            messagebox.showinfo(
-                translations.get('success'), 
-                translations.get('pdf_exported_success', filename=os.path.basename(filename))
-            )
-            
-        except Exception as e:
-            messagebox.showerror(
-                translations.get('error'), 
-                translations.get('pdf_export_error', error=str(e))
-            )
+            messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='ledger', error=str(e)))
+            return
+        for entry in entries:
+            self.ledger_tree.insert('', 'end', values=self.ledger_values(entry))
+        self.update_page_footers()
+        
+    def reset_ledger(self):
+        """Drop the loaded ledger after an edit; every later balance may have changed"""
+        self.ledger = None
+        self.ledger_tree.delete(*self.ledger_tree.get_children())
+        if 2 in self.loaded_tabs:
+            self.load_more_ledger()
+        else:
+            self.update_page_footers()
+        
+    def update_page_footers(self):
+        """Show how many rows are loaded and whether more can be fetched"""
+        ledger_shown = len(self.ledger.entries) if self.ledger else 0
+        for label, button, shown, total in (
+            (self.treatments_footer, self.more_treatments_btn, len(self.snapshot.treatments), self.snapshot.treatment_count),
+            (self.payments_footer, self.more_payments_btn, len(self.snapshot.payments), self.snapshot.payment_count),
+            (self.ledger_footer, self.more_ledger_btn, ledger_shown,
+             self.snapshot.treatment_count + self.snapshot.payment_count),
+        ):
+            label.config(text=translations.get('showing_rows', shown=shown, total=total))
+            button.config(state='normal' if shown < total else 'disabled')
             
-    def create_pdf(self, filename):
-        """Create the PDF document"""
-        doc = SimpleDocTemplate(filename, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#2c3e50')
-        )
+    def patch_treatment_row(self, treatment):
+        """Insert or update a single treatment row after an edit"""
+        index = self.snapshot.put_treatment(treatment)
+        iid = str(treatment.id)
+        if index is None:
+            # Moved past the loaded rows; it will come back with a later page
+            if self.treatments_tree.exists(iid):
+                self.treatments_tree.delete(iid)
+        elif self.treatments_tree.exists(iid):
+            self.treatments_tree.item(iid, values=self.treatment_values(treatment))
+            self.treatments_tree.move(iid, '', index)
+        else:
+            self.treatments_tree.insert('', index, iid=iid, values=self.treatment_values(treatment))
+        self.update_summary()
+        self.reset_ledger()
+        
+    def patch_payment_row(self, payment):
+        """Insert or update a single payment row after an edit"""
+        index = self.snapshot.put_payment(payment)
+        iid = str(payment.id)
+        if index is None:
+            # Moved past the loaded rows; it will come back with a later page
+            if self.payments_tree.exists(iid):
+                self.payments_tree.delete(iid)
+        elif self.payments_tree.exists(iid):
+            self.payments_tree.item(iid, values=self.payment_values(payment))
+            self.payments_tree.move(iid, '', index)
+        else:
+            self.payments_tree.insert('', index, iid=iid, values=self.payment_values(payment))
+        self.update_summary()
+        self.reset_ledger()
         
-        header_style = ParagraphStyle(
-            'CustomHeader',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.HexColor('#3498db')
-        )
+    def update_summary(self):
+        """Update the summary section from the in-memory totals"""
+        total_cost = self.snapshot.total_cost
+        total_paid = self.snapshot.total_paid
+        balance = self.snapshot.balance
         
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=6
-        )
+        self.cost_value.config(text=f"${total_cost:.2f}")
+        self.paid_value.config(text=f"${total_paid:.2f}")
+        self.balance_value.config(text=f"${balance:.2f}")
         
-        # Title
-        story.append(Paragraph(translations.get('record_details'), title_style))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Record Information
-        story.append(Paragraph(translations.get('record_information'), header_style))
-        
-        record_info = [
-            [translations.get('col_doctor'), self.record.doctor_name],
-            [translations.get('col_patient'), self.record.patient_name],
-            [translations.get('col_created'), self.record.created_at.strftime("%Y-%m-%d %H:%M") if self.record.created_at else ""],
-            [translations.get('record_id'), str(self.record.id)]
-        ]
-        
-        record_table = Table(record_info, colWidths=[2*inch, 4*inch])
-        record_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        story.append(record_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Account Summary
-        story.append(Paragraph(translations.get('account_summary'), header_style))
-        
-        total_cost = self.record.cost()
-        total_paid = self.record.amount()
-        balance = self.record.balance()
-        
-        summary_info = [
-            [translations.get('total_cost'), f"${total_cost:.2f}"],
-            [translations.get('total_paid'), f"${total_paid:.2f}"],
-            [translations.get('balance'), f"${balance:.2f}"]
-        ]
-        
-        summary_table = Table(summary_info, colWidths=[2*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        
-        # Color code the balance
+        # Update balance color
         if balance > 0:
-            summary_table.setStyle(TableStyle([
-                ('TEXTCOLOR', (1, 2), (1, 2), colors.HexColor('#e74c3c'))
-            ]))
+            self.balance_value.config(foreground='#e74c3c')  # Red
         elif balance == 0:
-            summary_table.setStyle(TableStyle([
-                ('TEXTCOLOR', (1, 2), (1, 2), colors.HexColor('#27ae60'))
-            ]))
+            self.balance_value.config(foreground='#27ae60')  # Green
         else:
-            summary_table.setStyle(TableStyle([
-                ('TEXTCOLOR', (1, 2), (1, 2), colors.HexColor('#f39c12'))
-            ]))
-        
-        story.append(summary_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Treatments
-        treatments = self.record.treatments()
-        if treatments:
-            story.append(Paragraph(translations.get('treatments_tab'), header_style))
-            
-            treatment_data = [[
-                translations.get('col_id'),
-                translations.get('treatment_name'),
-                translations.get('col_cost'),
-                translations.get('col_date'),
-                translations.get('col_notes')
-            ]]
+            self.balance_value.config(foreground='#f39c12')  # Orange (overpaid)
             
-            for treatment in treatments:
-                treatment_data.append([
-                    str(treatment.id),
-                    treatment.name or "",
-                    f"${treatment.cost:.2f}" if treatment.cost else "$0.00",
-                    treatment.date.strftime("%Y-%m-%d") if treatment.date else "",
-                    treatment.notes or ""
-                ])
-            
-            treatment_table = Table(treatment_data, colWidths=[0.5*inch, 2*inch, 1*inch, 1*inch, 2.5*inch])
-            treatment_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # ID column center
-                ('ALIGN', (2, 0), (2, -1), 'RIGHT'),   # Cost column right
-                ('ALIGN', (3, 0), (3, -1), 'CENTER'),  # Date column center
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
-            
-            story.append(treatment_table)
-            story.append(Spacer(1, 0.2*inch))
+    def export_to_pdf(self):
+        """Export record details to PDF on a background thread"""
+        # Ask user for save location
+        filename = filedialog.asksaveasfilename(
+            title=translations.get('save_pdf'),
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
+            initialfile=default_filename(self.record)
+        )
         
-        # Payments
-        payments = self.record.payments()
-        if payments:
-            story.append(Paragraph(translations.get('payments_tab'), header_style))
+        if not filename:
+            return
+            
+        # Reuse the rows on screen when every page is loaded, otherwise read the full record off the Tk thread
+        snapshot = self.snapshot.copy() if self.snapshot.complete else None
+        record_id = self.record.id
+        
+        def task(progress, cancel_event):
+            data = snapshot or RecordSnapshot.load(record_id)
+            build_record_pdf(filename, data, progress=progress, cancel_event=cancel_event)
+            return filename
             
-            payment_data = [[
-                translations.get('col_id'),
-                translations.get('col_amount'),
-                translations.get('col_date'),
-                translations.get('col_notes')
-            ]]
+        def on_success(filename):
+            messagebox.showinfo(
+                translations.get('success'), 
+                translations.get('pdf_exported_success', filename=os.path.basename(filename)),
+                parent=self.window
+            )
             
-            for payment in payments:
-                payment_data.append([
-                    str(payment.id),
-                    f"${payment.amount:.2f}" if payment.amount else "$0.00",
-                    payment.date.strftime("%Y-%m-%d") if payment.date else "",
-                    payment.notes or ""
-                ])
+        def on_error(error):
+            messagebox.showerror(
+                translations.get('error'), 
+                translations.get('pdf_export_error', error=str(error)),
+                parent=self.window
+            )
             
-            payment_table = Table(payment_data, colWidths=[0.5*inch, 1.5*inch, 1.5*inch, 3.5*inch])
-            payment_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # ID column center
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),   # Amount column right
-                ('ALIGN', (2, 0), (2, -1), 'CENTER'),  # Date column center
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
-            ]))
+        def on_cancel():
+            messagebox.showinfo(
+                translations.get('export_pdf'),
+                translations.get('pdf_export_cancelled'),
+                parent=self.window
+            )
             
-            story.append(payment_table)
-        
-        # Footer
-        story.append(Spacer(1, 0.3*inch))
-        footer_text = f"{translations.get('generated_on')}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        story.append(Paragraph(footer_text, ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#7f8c8d')
-        )))
-        
-        # Build PDF
-        doc.build(story)
+        progress_dialog = ExportProgressDialog(
+            self.window,
+            title=translations.get('export_pdf'),
+            message=translations.get('exporting_pdf')
+        )
+        progress_dialog.run(task, on_success=on_success, on_error=on_error, on_cancel=on_cancel)
         
     # Treatment event handlers
     def on_treatment_select(self, event):
         """Handle treatment selection"""
         selection = self.treatments_tree.selection()
         if selection:
-            item = self.treatments_tree.item(selection[0])
-            treatment_id = item['values'][0]
-            self.selected_treatment = Treatment.get_by_id(treatment_id)
+            self.selected_treatment = self.snapshot.get_treatment(int(selection[0]))
             
             self.edit_treatment_btn.config(state='normal')
             self.delete_treatment_btn.config(state='normal')
@@ -780,15 +770,14 @@ class RecordDetailsWindow:
         dialog = TreatmentForm(self.window, title=translations.get('add_new_treatment'), record_id=self.record.id)
         if dialog.result:
             try:
-                Treatment.create(
+                treatment = Treatment.create(
                     record_id=self.record.id,
                     name=dialog.result['name'],
                     cost=dialog.result['cost'],
                     treatment_date=dialog.result['date'],
                     notes=dialog.result['notes']
                 )
-                self.load_treatments()
-                self.update_summary()
+                self.patch_treatment_row(treatment)
                 messagebox.showinfo(translations.get('success'), translations.get('treatment_added_success'))
             except Exception as e:
                 messagebox.showerror(translations.get('error'), f"Failed to add treatment: {str(e)}")
@@ -805,15 +794,15 @@ class RecordDetailsWindow:
         )
         if dialog.result:
             try:
-                Treatment.update(
+                treatment = Treatment.update(
                     self.selected_treatment.id,
                     name=dialog.result['name'],
                     cost=dialog.result['cost'],
                     treatment_date=dialog.result['date'],
                     notes=dialog.result['notes']
                 )
-                self.load_treatments()
-                self.update_summary()
+                self.selected_treatment = treatment
+                self.patch_treatment_row(treatment)
                 messagebox.showinfo(translations.get('success'), translations.get('treatment_updated_success'))
             except Exception as e:
                 messagebox.showerror(translations.get('error'), f"Failed to update treatment: {str(e)}")
@@ -831,8 +820,10 @@ class RecordDetailsWindow:
         if result:
             try:
                 Treatment.delete(self.selected_treatment.id)
-                self.load_treatments()
+                self.snapshot.remove_treatment(self.selected_treatment.id)
+                self.treatments_tree.delete(str(self.selected_treatment.id))
                 self.update_summary()
+                self.reset_ledger()
                 self.selected_treatment = None
                 self.edit_treatment_btn.config(state='disabled')
                 self.delete_treatment_btn.config(state='disabled')
@@ -845,9 +836,7 @@ class RecordDetailsWindow:
         """Handle payment selection"""
         selection = self.payments_tree.selection()
         if selection:
-            item = self.payments_tree.item(selection[0])
-            payment_id = item['values'][0]
-            self.selected_payment = Payment.get_by_id(payment_id)
+            self.selected_payment = self.snapshot.get_payment(int(selection[0]))
             
             self.edit_payment_btn.config(state='normal')
             self.delete_payment_btn.config(state='normal')
@@ -866,14 +855,13 @@ class RecordDetailsWindow:
         dialog = PaymentForm(self.window, title=translations.get('add_new_payment'), record_id=self.record.id)
         if dialog.result:
             try:
-                Payment.create(
+                payment = Payment.create(
                     record_id=self.record.id,
                     amount=dialog.result['amount'],
                     payment_date=dialog.result['date'],
                     notes=dialog.result['notes']
                 )
-                self.load_payments()
-                self.update_summary()
+                self.patch_payment_row(payment)
                 messagebox.showinfo(translations.get('success'), translations.get('payment_added_success'))
             except Exception as e:
                 messagebox.showerror(translations.get('error'), f"Failed to add payment: {str(e)}")
@@ -890,14 +878,14 @@ class RecordDetailsWindow:
         )
         if dialog.result:
             try:
-                Payment.update(
+                payment = Payment.update(
                     self.selected_payment.id,
                     amount=dialog.result['amount'],
                     payment_date=dialog.result['date'],
                     notes=dialog.result['notes']
                 )
-                self.load_payments()
-                self.update_summary()
+                self.selected_payment = payment
+                self.patch_payment_row(payment)
                 messagebox.showinfo(translations.get('success'), translations.get('payment_updated_success'))
             except Exception as e:
                 messagebox.showerror(translations.get('error'), f"Failed to update payment: {str(e)}")
@@ -915,8 +903,10 @@ class RecordDetailsWindow:
         if result:
             try:
                 Payment.delete(self.selected_payment.id)
-                self.load_payments()
+                self.snapshot.remove_payment(self.selected_payment.id)
+                self.payments_tree.delete(str(self.selected_payment.id))
                 self.update_summary()
+                self.reset_ledger()
                 self.selected_payment = None
                 self.edit_payment_btn.config(state='disabled')
                 self.delete_payment_btn.config(state='disabled')
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from models import Doctor, Patient
+from gui.widgets.search_picker import SearchPicker
 from localization.translations import translations
 
 
@@ -32,7 +33,7 @@ class RecordForm:
             self.populate_fields()
             
         # Focus on first field
-        self.doctor_combo.focus()
+        self.doctor_picker.focus()
         
         # Wait for dialog to close
         self.dialog.wait_window()
@@ -57,14 +58,14 @@ class RecordForm:
         self.dialog.geometry(f"500x400+{x}+{y}")
         
     def load_data(self):
-        """Load doctors and patients data"""
+        """Check that doctors and patients exist; the pickers search as the user types"""
         try:
-            self.doctors = Doctor.get_all()
-            self.patients = Patient.get_all()
+            self.has_doctors = bool(Doctor.search_prefix('', limit=1))
+            self.has_patients = bool(Patient.search_prefix('', limit=1))
         except Exception as e:
             messagebox.showerror(translations.get('error'), translations.get('failed_to_load', item='data', error=str(e)))
-            self.doctors = []
-            self.patients = []
+            self.has_doctors = False
+            self.has_patients = False
             
     def setup_ui(self):
         # Main frame with padding
@@ -84,63 +85,25 @@ class RecordForm:
         doctor_label = ttk.Label(fields_frame, text=translations.get('doctor_required'), font=('Segoe UI', 11, 'bold'))
         doctor_label.pack(anchor='w', pady=(0, 8))
         
-        self.doctor_var = tk.StringVar()
-        self.doctor_combo = ttk.Combobox(
-            fields_frame, 
-            textvariable=self.doctor_var,
-            state='readonly',
-            font=('Segoe UI', 11),
-            height=10
-        )
-        
-        # Populate doctor combobox
-        doctor_values = []
-        self.doctor_map = {}
-        for doctor in self.doctors:
-            display_text = f"{doctor.name}"
-            if doctor.phone:
-                display_text += f" ({doctor.phone})"
-            doctor_values.append(display_text)
-            self.doctor_map[display_text] = doctor.id
-            
-        self.doctor_combo['values'] = doctor_values
-        self.doctor_combo.pack(fill='x', pady=(0, 20), ipady=8)
+        self.doctor_picker = SearchPicker(fields_frame, Doctor.search_prefix)
+        self.doctor_picker.combo.pack(fill='x', pady=(0, 20), ipady=8)
         
         # Patient field
         patient_label = ttk.Label(fields_frame, text=translations.get('patient_required'), font=('Segoe UI', 11, 'bold'))
         patient_label.pack(anchor='w', pady=(0, 8))
         
-        self.patient_var = tk.StringVar()
-        self.patient_combo = ttk.Combobox(
-            fields_frame, 
-            textvariable=self.patient_var,
-            state='readonly',
-            font=('Segoe UI', 11),
-            height=10
-        )
-        
-        # Populate patient combobox
-        patient_values = []
-        self.patient_map = {}
-        for patient in self.patients:
-            display_text = f"{patient.name}"
-            if patient.phone:
-                display_text += f" ({patient.phone})"
-            patient_values.append(display_text)
-            self.patient_map[display_text] = patient.id
-            
-        self.patient_combo['values'] = patient_values
-        self.patient_combo.pack(fill='x', pady=(0, 20), ipady=8)
+        self.patient_picker = SearchPicker(fields_frame, Patient.search_prefix)
+        self.patient_picker.combo.pack(fill='x', pady=(0, 20), ipady=8)
         
         # Info message
-        if not self.doctors or not self.patients:
+        if not self.has_doctors or not self.has_patients:
             info_frame = ttk.Frame(fields_frame, style='Card.TFrame', padding=15)
             info_frame.pack(fill='x', pady=(0, 20))
             
             info_text = "⚠️ "
-            if not self.doctors and not self.patients:
+            if not self.has_doctors and not self.has_patients:
                 info_text += translations.get('no_doctors_patients')
-            elif not self.doctors:
+            elif not self.has_doctors:
                 info_text += translations.get('no_doctors')
             else:
                 info_text += translations.get('no_patients')
@@ -182,7 +145,7 @@ class RecordForm:
         save_btn.pack(side='right', ipadx=20, ipady=8)
         
         # Disable save button if no data
-        if not self.doctors or not self.patients:
+        if not self.has_doctors or not self.has_patients:
             save_btn.config(state='disabled')
         
         # Bind Enter key to save
@@ -192,34 +155,28 @@ class RecordForm:
     def populate_fields(self):
         """Populate fields when editing"""
         if self.record:
-            # Find and set doctor
-            for display_text, doctor_id in self.doctor_map.items():
-                if doctor_id == self.record.doctor_id:
-                    self.doctor_var.set(display_text)
-                    break
-                    
-            # Find and set patient
-            for display_text, patient_id in self.patient_map.items():
-                if patient_id == self.record.patient_id:
-                    self.patient_var.set(display_text)
-                    break
+            doctor = Doctor.get_by_id(self.record.doctor_id)
+            if doctor:
+                self.doctor_picker.set_item(doctor)
+                
+            patient = Patient.get_by_id(self.record.patient_id)
+            if patient:
+                self.patient_picker.set_item(patient)
                     
     def validate_form(self):
         """Validate form data"""
         errors = []
         
         # Validate doctor selection
-        doctor_selection = self.doctor_var.get()
-        if not doctor_selection:
+        if not self.doctor_picker.get():
             errors.append(translations.get('select_doctor_msg'))
-        elif doctor_selection not in self.doctor_map:
+        elif self.doctor_picker.get_id() is None:
             errors.append("Invalid doctor selection")
             
         # Validate patient selection
-        patient_selection = self.patient_var.get()
-        if not patient_selection:
+        if not self.patient_picker.get():
             errors.append(translations.get('select_patient_msg'))
-        elif patient_selection not in self.patient_map:
+        elif self.patient_picker.get_id() is None:
             errors.append("Invalid patient selection")
             
         return errors
@@ -233,8 +190,8 @@ class RecordForm:
             return
             
         # Get selected IDs
-        doctor_id = self.doctor_map[self.doctor_var.get()]
-        patient_id = self.patient_map[self.patient_var.get()]
+        doctor_id = self.doctor_picker.get_id()
+        patient_id = self.patient_picker.get_id()
         
         # Set result
         self.result = {
@@ -0,0 +1,87 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class SearchPicker:
+    """Editable combobox that looks items up as the user types.
+
+    search(prefix, limit) returns model objects with id, name and phone; only the
+    current matches are held, so the picker costs the same for 50 rows or 50k.
+    """
+
+    LIMIT = 20
+    DEBOUNCE_MS = 200
+
+    # Keys that move through the list rather than change the text
+    NAVIGATION_KEYS = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab', 'Left', 'Right',
+                       'Home', 'End', 'Shift_L', 'Shift_R', 'Control_L', 'Control_R'}
+
+    def __init__(self, parent, search, font=('Segoe UI', 11), height=10):
+        self.search = search
+        self.matches = {}
+        self.pending = None
+
+        self.var = tk.StringVar()
+        self.combo = ttk.Combobox(
+            parent,
+            textvariable=self.var,
+            font=font,
+            height=height,
+            postcommand=self.refresh
+        )
+        self.combo.bind('<KeyRelease>', self.on_key)
+        self.combo.bind('<Destroy>', self.cancel_pending, add='+')
+
+    @staticmethod
+    def display(item):
+        text = f"{item.name}"
+        if item.phone:
+            text += f" ({item.phone})"
+        return text
+
+    def on_key(self, event):
+        """Search again once typing pauses"""
+        if event.keysym in self.NAVIGATION_KEYS:
+            return
+        self.cancel_pending()
+        self.pending = self.combo.after(self.DEBOUNCE_MS, self.refresh)
+
+    def cancel_pending(self, event=None):
+        if self.pending is not None:
+            self.combo.after_cancel(self.pending)
+            self.pending = None
+
+    def refresh(self):
+        """Replace the dropdown values with the matches for the current text"""
+        self.pending = None
+        text = self.var.get()
+        if text in self.matches:
+            # A chosen item's display text is not a useful prefix
+            text = text.split(' (')[0]
+        try:
+            items = self.search(text, self.LIMIT)
+        except Exception as e:
+            print(f"Error searching: {e}")
+            return
+        self.matches = {self.display(item): item.id for item in items}
+        self.combo['values'] = list(self.matches)
+
+    def set_item(self, item):
+        """Show item as the current choice"""
+        display = self.display(item)
+        self.matches[display] = item.id
+        self.var.set(display)
+
+    def get_id(self):
+        """Id of the chosen item, or None when the text does not name one"""
+        if self.var.get() not in self.matches:
+            # Typed faster than the debounce; look the text up now
+            self.cancel_pending()
+            self.refresh()
+        return self.matches.get(self.var.get())
+
+    def get(self):
+        return self.var.get()
+
+    def focus(self):
+        self.combo.focus()
@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
 from datetime import datetime, date
 import re
+from models.money import Money
 
 
 class TreatmentForm:
@@ -212,10 +213,10 @@ class TreatmentForm:
             errors.append("Cost is required")
         else:
             try:
-                cost = float(cost_str)
+                cost = Money.of(cost_str)
                 if cost < 0:
                     errors.append("Cost cannot be negative")
-                elif cost > 999999.99:
+                elif cost > Money.of('999999.99'):
                     errors.append("Cost is too large")
             except ValueError:
                 errors.append("Cost must be a valid number")
@@ -251,7 +252,7 @@ class TreatmentForm:
             
         # Prepare data
         name = self.name_var.get().strip()
-        cost = float(self.cost_var.get().strip())
+        cost = Money.of(self.cost_var.get())
         notes = self.notes_text.get('1.0', 'end-1c').strip() or None
         
         # Get date
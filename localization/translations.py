@@ -4,13 +4,16 @@ Supports English and Arabic languages with RTL/LTR support and persistence
 """
 import json
 import os
+import weakref
 from pathlib import Path
 
 class Translations:
     def __init__(self):
         self.config_file = Path.home() / '.dentasys_config.json'
         self.current_language = self.load_language_preference()
-        self.observers = []  # List of callbacks to notify when language changes
+        self.observers = []  # Weak references to callbacks to notify when language changes
+        self.scheduler = None  # e.g. root.after_idle; batches notifications into one idle pass
+        self.notify_pending = False
         
         # Translation dictionaries
         self.translations = {
@@ -24,6 +27,7 @@ class Translations:
                 'tab_doctors': '👨‍⚕️ Doctors',
                 'tab_patients': '👤 Patients',
                 'tab_records': '📋 Records',
+                'tab_reports': '📈 Reports',
                 
                 # Language Switch
                 'language_switch': '🌐 Language',
@@ -105,6 +109,7 @@ class Translations:
                 'btn_add': 'Add',
                 'btn_edit': 'Edit',
                 'btn_delete': 'Delete',
+                'btn_open': 'Open',
                 
                 # Form Labels
                 'doctor_name': 'Doctor Name',
@@ -150,6 +155,13 @@ class Translations:
                 'record_id': 'Record ID',
                 'treatments_tab': '🦷 Treatments',
                 'payments_tab': '💰 Payments',
+                'ledger_tab': '📒 Ledger',
+                'col_type': 'Type',
+                'col_description': 'Description',
+                'col_debit': 'Debit',
+                'col_credit': 'Credit',
+                'entry_treatment': 'Treatment',
+                'entry_payment': 'Payment',
                 'add_treatment': '➕ Add Treatment',
                 'edit_treatment': '✏️ Edit Treatment',
                 'delete_treatment': '🗑️ Delete Treatment',
@@ -168,6 +180,66 @@ class Translations:
                 'pdf_exported_success': 'PDF report "{filename}" exported successfully!',
                 'pdf_export_error': 'Failed to export PDF: {error}',
                 'generated_on': 'Generated on',
+                'exporting_pdf': 'Generating PDF report...',
+                'pdf_export_cancelled': 'PDF export cancelled',
+                'cancelling': 'Cancelling...',
+                'load_more': 'Load more',
+                'showing_rows': 'Showing {shown} of {total}',
+                
+                # Batch Export
+                'batch_export': '📑 Batch Export',
+                'batch_export_title': 'Export Statements',
+                'all_doctors': 'All doctors',
+                'unpaid_only': 'Only records with an outstanding balance',
+                'activity_date_range': 'Activity date range (optional)',
+                'date_from': 'From',
+                'date_to': 'To',
+                'export_output': 'Output',
+                'output_directory': 'One PDF per record in a folder',
+                'output_merged_pdf': 'A single merged PDF',
+                'browse': 'Browse...',
+                'btn_export': 'Export',
+                'invalid_date': 'Invalid date: {value}',
+                'invalid_date_range': 'The start date must be before the end date',
+                'output_required': 'Please choose where to save the export',
+                'batch_selecting': 'Selecting records...',
+                'batch_rendering': 'Rendering {count} statements...',
+                'batch_export_summary': 'Exported {exported} of {total} statements to {output}. Failed: {failed}',
+                
+                # Reports
+                'reports_title': 'Financial Reports',
+                'revenue_tab': 'Revenue',
+                'period': 'Period',
+                'period_day': 'Daily',
+                'period_month': 'Monthly',
+                'period_year': 'Yearly',
+                'btn_generate': 'Generate',
+                'export_csv': 'Export CSV',
+                'save_csv': 'Save CSV File',
+                'csv_exported_success': 'Report exported to "{filename}"',
+                'csv_export_error': 'Failed to export CSV: {error}',
+                'col_period': 'Period',
+                'col_billed': 'Billed',
+                'col_collected': 'Collected',
+                'col_outstanding': 'Outstanding',
+                'col_treatments': 'Treatments',
+                'col_payments': 'Payments',
+                'col_new_patients': 'New Patients',
+                'total_billed': 'Total Billed',
+                'total_collected': 'Total Collected',
+                'outstanding': 'Outstanding',
+                'new_patients': 'New Patients',
+                'aging_tab': 'Receivables Aging',
+                'as_of': 'As of',
+                'aging_0_30': '0-30 Days',
+                'aging_31_60': '31-60 Days',
+                'aging_61_90': '61-90 Days',
+                'aging_90_plus': 'Over 90 Days',
+                'total_receivable': 'Total Receivable',
+                'col_record': 'Record',
+                'col_oldest_unpaid': 'Oldest Unpaid',
+                'col_days': 'Days',
+                'col_bucket': 'Age',
                 
                 # Form Titles
                 'add_new_doctor': 'Add New Doctor',
@@ -223,6 +295,67 @@ class Translations:
                 # Format Hints
                 'date_format_hint': 'Format: YYYY-MM-DD (e.g., 2024-01-15)',
                 'birth_date_format_hint': 'Format: YYYY-MM-DD (e.g., 1990-01-15)',
+                
+                # Duplicate patients
+                'possible_duplicates': 'Possible existing patients',
+                'duplicate_same_phone': 'same phone number',
+                'duplicate_similar_name': 'similar name',
+                
+                # Bulk import
+                'import_patients': '📥 Import Patients',
+                'import_doctors': '📥 Import Doctors',
+                'btn_import': 'Import',
+                'import_file': 'CSV or Excel (.xlsx) file',
+                'import_mapping': 'Columns',
+                'import_not_mapped': '(not imported)',
+                'import_field_name': 'Name',
+                'import_field_phone': 'Phone',
+                'import_field_gender': 'Gender',
+                'import_field_birth_date': 'Birth Date',
+                'import_field_notes': 'Notes',
+                'import_file_required': 'Please choose a file to import',
+                'import_field_required': '{field} must be taken from a column',
+                'import_reading': 'Importing rows...',
+                'import_summary': 'Imported {imported} of {total} rows. Skipped: {skipped}',
+                'import_error_line': 'Line {line}: {error}',
+                'import_save_report': 'Save the list of skipped rows?',
+                'import_error': 'Import failed: {error}',
+                'import_missing_value': '{field} is empty',
+                'import_invalid_name': 'Name must be 2 to 100 characters: {value}',
+                'import_invalid_phone': 'Phone number must have 10 to 15 digits: {value}',
+                'import_invalid_gender': 'Unknown gender: {value}',
+                'import_invalid_date': 'Invalid or future birth date: {value}',
+                'import_duplicate_existing': '{field} already exists: {value}',
+                'import_duplicate_in_file': '{field} repeats an earlier row: {value}',
+                
+                # Data export
+                'export_data': '💾 Export Data',
+                'export_data_title': 'Export Data',
+                'export_datasets': 'Tables',
+                'dataset_doctors': 'Doctors',
+                'dataset_patients': 'Patients',
+                'dataset_records': 'Records',
+                'dataset_treatments': 'Treatments',
+                'dataset_payments': 'Payments',
+                'dataset_records_summary': 'Records with totals',
+                'export_format': 'Format',
+                'format_csv': 'CSV (spreadsheets)',
+                'format_jsonl': 'JSON Lines',
+                'export_gzip': 'Compress with gzip (.gz)',
+                'export_directory': 'Folder',
+                'export_datasets_required': 'Please choose at least one table',
+                'export_data_writing': 'Writing {dataset}...',
+                'export_data_summary': 'Wrote {rows} rows to {files} files in {output}',
+                'export_data_error': 'Data export failed: {error}',
+                
+                # Archive
+                'archive_records': '🗄 Archive Old Records',
+                'archive_years_prompt': 'Archive fully paid records with no activity for how many years?',
+                'archive_confirm': 'Move fully paid records with no treatments or payments in the last {years} years to the archive?',
+                'archive_running': 'Archiving records...',
+                'archive_summary': 'Archived {records} records with {treatments} treatments and {payments} payments (no activity since {cutoff})',
+                'archive_error': 'Archiving failed: {error}',
+                'show_archived': 'Show archived records',
             },
             
             'ar': {
@@ -235,6 +368,7 @@ class Translations:
                 'tab_doctors': '👨‍⚕️ الأطباء',
                 'tab_patients': '👤 المرضى',
                 'tab_records': '📋 السجلات',
+                'tab_reports': '📈 التقارير',
                 
                 # Language Switch
                 'language_switch': '🌐 اللغة',
@@ -316,6 +450,7 @@ class Translations:
                 'btn_add': 'إضافة',
                 'btn_edit': 'تعديل',
                 'btn_delete': 'حذف',
+                'btn_open': 'فتح',
                 
                 # Form Labels
                 'doctor_name': 'اسم الطبيب',
@@ -361,6 +496,13 @@ class Translations:
                 'record_id': 'رقم السجل',
                 'treatments_tab': '🦷 العلاجات',
                 'payments_tab': '💰 المدفوعات',
+                'ledger_tab': '📒 كشف الحساب',
+                'col_type': 'النوع',
+                'col_description': 'الوصف',
+                'col_debit': 'مدين',
+                'col_credit': 'دائن',
+                'entry_treatment': 'علاج',
+                'entry_payment': 'دفعة',
                 'add_treatment': '➕ إضافة علاج',
                 'edit_treatment': '✏️ تعديل علاج',
                 'delete_treatment': '🗑️ حذف علاج',
@@ -379,6 +521,66 @@ class Translations:
                 'pdf_exported_success': 'تم تصدير تقرير PDF "{filename}" بنجاح!',
                 'pdf_export_error': 'فشل في تصدير PDF: {error}',
                 'generated_on': 'تم الإنشاء في',
+                'exporting_pdf': 'جارٍ إنشاء تقرير PDF...',
+                'pdf_export_cancelled': 'تم إلغاء تصدير PDF',
+                'cancelling': 'جارٍ الإلغاء...',
+                'load_more': 'تحميل المزيد',
+                'showing_rows': 'عرض {shown} من {total}',
+                
+                # Batch Export
+                'batch_export': '📑 تصدير جماعي',
+                'batch_export_title': 'تصدير كشوف الحسابات',
+                'all_doctors': 'جميع الأطباء',
+                'unpaid_only': 'السجلات ذات الرصيد المستحق فقط',
+                'activity_date_range': 'نطاق تاريخ النشاط (اختياري)',
+                'date_from': 'من',
+                'date_to': 'إلى',
+                'export_output': 'الإخراج',
+                'output_directory': 'ملف PDF لكل سجل في مجلد',
+                'output_merged_pdf': 'ملف PDF واحد مدمج',
+                'browse': 'استعراض...',
+                'btn_export': 'تصدير',
+                'invalid_date': 'تاريخ غير صالح: {value}',
+                'invalid_date_range': 'يجب أن يكون تاريخ البداية قبل تاريخ النهاية',
+                'output_required': 'يرجى اختيار مكان حفظ التصدير',
+                'batch_selecting': 'جارٍ اختيار السجلات...',
+                'batch_rendering': 'جارٍ إنشاء {count} كشف حساب...',
+                'batch_export_summary': 'تم تصدير {exported} من {total} كشف حساب إلى {output}. فشل: {failed}',
+                
+                # Reports
+                'reports_title': 'التقارير المالية',
+                'revenue_tab': 'الإيرادات',
+                'period': 'الفترة',
+                'period_day': 'يومي',
+                'period_month': 'شهري',
+                'period_year': 'سنوي',
+                'btn_generate': 'إنشاء',
+                'export_csv': 'تصدير CSV',
+                'save_csv': 'حفظ ملف CSV',
+                'csv_exported_success': 'تم تصدير التقرير إلى "{filename}"',
+                'csv_export_error': 'فشل في تصدير CSV: {error}',
+                'col_period': 'الفترة',
+                'col_billed': 'المفوتر',
+                'col_collected': 'المحصل',
+                'col_outstanding': 'المستحق',
+                'col_treatments': 'العلاجات',
+                'col_payments': 'الدفعات',
+                'col_new_patients': 'المرضى الجدد',
+                'total_billed': 'إجمالي المفوتر',
+                'total_collected': 'إجمالي المحصل',
+                'outstanding': 'المستحق',
+                'new_patients': 'المرضى الجدد',
+                'aging_tab': 'أعمار الذمم',
+                'as_of': 'حتى تاريخ',
+                'aging_0_30': '0-30 يوم',
+                'aging_31_60': '31-60 يوم',
+                'aging_61_90': '61-90 يوم',
+                'aging_90_plus': 'أكثر من 90 يوم',
+                'total_receivable': 'إجمالي الذمم',
+                'col_record': 'السجل',
+                'col_oldest_unpaid': 'أقدم مستحق',
+                'col_days': 'الأيام',
+                'col_bucket': 'العمر',
                 
                 # Form Titles
                 'add_new_doctor': 'إضافة طبيب جديد',
@@ -434,6 +636,67 @@ class Translations:
                 # Format Hints
                 'date_format_hint': 'التنسيق: سنة-شهر-يوم (مثال: 2024-01-15)',
                 'birth_date_format_hint': 'التنسيق: سنة-شهر-يوم (مثال: 1990-01-15)',
+                
+                # Duplicate patients
+                'possible_duplicates': 'مرضى موجودون قد يكونون نفس المريض',
+                'duplicate_same_phone': 'نفس رقم الهاتف',
+                'duplicate_similar_name': 'اسم مشابه',
+                
+                # Bulk import
+                'import_patients': '📥 استيراد المرضى',
+                'import_doctors': '📥 استيراد الأطباء',
+                'btn_import': 'استيراد',
+                'import_file': 'ملف CSV أو Excel (.xlsx)',
+                'import_mapping': 'الأعمدة',
+                'import_not_mapped': '(لا يُستورد)',
+                'import_field_name': 'الاسم',
+                'import_field_phone': 'الهاتف',
+                'import_field_gender': 'الجنس',
+                'import_field_birth_date': 'تاريخ الميلاد',
+                'import_field_notes': 'ملاحظات',
+                'import_file_required': 'يرجى اختيار ملف للاستيراد',
+                'import_field_required': 'يجب اختيار عمود لحقل {field}',
+                'import_reading': 'جاري استيراد الصفوف...',
+                'import_summary': 'تم استيراد {imported} من {total} صف. تم تخطي: {skipped}',
+                'import_error_line': 'السطر {line}: {error}',
+                'import_save_report': 'هل تريد حفظ قائمة الصفوف التي تم تخطيها؟',
+                'import_error': 'فشل الاستيراد: {error}',
+                'import_missing_value': '{field} فارغ',
+                'import_invalid_name': 'يجب أن يكون الاسم من 2 إلى 100 حرف: {value}',
+                'import_invalid_phone': 'يجب أن يحتوي رقم الهاتف على 10 إلى 15 رقمًا: {value}',
+                'import_invalid_gender': 'جنس غير معروف: {value}',
+                'import_invalid_date': 'تاريخ ميلاد غير صالح أو في المستقبل: {value}',
+                'import_duplicate_existing': '{field} موجود مسبقًا: {value}',
+                'import_duplicate_in_file': '{field} مكرر في صف سابق: {value}',
+                
+                # Data export
+                'export_data': '💾 تصدير البيانات',
+                'export_data_title': 'تصدير البيانات',
+                'export_datasets': 'الجداول',
+                'dataset_doctors': 'الأطباء',
+                'dataset_patients': 'المرضى',
+                'dataset_records': 'السجلات',
+                'dataset_treatments': 'العلاجات',
+                'dataset_payments': 'المدفوعات',
+                'dataset_records_summary': 'السجلات مع الإجماليات',
+                'export_format': 'الصيغة',
+                'format_csv': 'CSV (جداول البيانات)',
+                'format_jsonl': 'JSON Lines',
+                'export_gzip': 'ضغط بصيغة gzip (.gz)',
+                'export_directory': 'المجلد',
+                'export_datasets_required': 'يرجى اختيار جدول واحد على الأقل',
+                'export_data_writing': 'جاري كتابة {dataset}...',
+                'export_data_summary': 'تمت كتابة {rows} صف في {files} ملفات داخل {output}',
+                'export_data_error': 'فشل تصدير البيانات: {error}',
+                
+                # Archive
+                'archive_records': '🗄 أرشفة السجلات القديمة',
+                'archive_years_prompt': 'أرشفة السجلات المسددة بالكامل التي لا نشاط فيها منذ كم سنة؟',
+                'archive_confirm': 'نقل السجلات المسددة بالكامل التي ليس بها علاجات أو مدفوعات خلال آخر {years} سنوات إلى الأرشيف؟',
+                'archive_running': 'جاري أرشفة السجلات...',
+                'archive_summary': 'تمت أرشفة {records} سجل مع {treatments} علاج و{payments} دفعة (لا نشاط منذ {cutoff})',
+                'archive_error': 'فشلت الأرشفة: {error}',
+                'show_archived': 'عرض السجلات المؤرشفة',
             }
         }
     
@@ -494,19 +757,56 @@ class Translations:
         """Check if current language is RTL"""
         return self.current_language == 'ar'
     
+    @staticmethod
+    def _ref(callback):
+        # Bound methods need WeakMethod; a plain weakref to one dies immediately
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            return weakref.WeakMethod(callback)
+        return weakref.ref(callback)
+    
     def add_observer(self, callback):
-        """Add a callback to be notified when language changes"""
-        if callback not in self.observers:
-            self.observers.append(callback)
+        """Add a callback to be notified when language changes.
+        
+        Only a weak reference is kept, so registering does not keep a page or
+        widget alive; it drops out once its owner is garbage collected.
+        """
+        if callback not in self.live_observers():
+            self.observers.append(self._ref(callback))
     
     def remove_observer(self, callback):
         """Remove a callback from observers"""
-        if callback in self.observers:
-            self.observers.remove(callback)
+        self.observers = [ref for ref in self.observers if ref() not in (None, callback)]
+    
+    def live_observers(self):
+        """Callbacks whose owners still exist; dead references are pruned"""
+        callbacks = []
+        live = []
+        for ref in self.observers:
+            callback = ref()
+            if callback is not None:
+                callbacks.append(callback)
+                live.append(ref)
+        self.observers = live
+        return callbacks
+    
+    def set_scheduler(self, scheduler):
+        """Route notifications through scheduler (such as root.after_idle) so they run in one batch"""
+        self.scheduler = scheduler
     
     def notify_observers(self):
         """Notify all observers that language has changed"""
-        for callback in self.observers:
+        if self.scheduler is None:
+            self.dispatch()
+            return
+        # Several changes before the next idle pass still produce a single update
+        if not self.notify_pending:
+            self.notify_pending = True
+            self.scheduler(self.dispatch)
+    
+    def dispatch(self):
+        """Call every live observer once"""
+        self.notify_pending = False
+        for callback in self.live_observers():
             try:
                 callback()
             except Exception as e:
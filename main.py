@@ -4,18 +4,34 @@ DentaSys - Dental Treatment Center Management System
 Main application entry point
 """
 
+import argparse
 import sys
 import os
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from api.client import SERVER_ENV, TOKEN_ENV, use_server
+from database.config import ENV_VAR, configure
 from gui.main_window import MainWindow
+from models.helper import register_converters
 
 
-def main():
+def main(argv=None):
     """Main application entry point"""
+    parser = argparse.ArgumentParser(prog='dentasys', description="DentaSys clinic management")
+    parser.add_argument('--db', help=f"Database file, or :memory: for a throwaway database "
+                                     f"(default: ${ENV_VAR}, then ~/.dentasys_config.json)")
+    parser.add_argument('--server', default=os.environ.get(SERVER_ENV),
+                        help=f"Work through a DentaSys server, e.g. 192.168.1.10:8765 (default: ${SERVER_ENV})")
+    parser.add_argument('--token', help=f"Token the server expects (default: ${TOKEN_ENV})")
+    args = parser.parse_args(argv)
     try:
+        register_converters()
+        if args.server:
+            use_server(args.server, args.token)
+        else:
+            configure(args.db)
         app = MainWindow()
         app.run()
     except KeyboardInterrupt:
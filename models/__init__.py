@@ -3,5 +3,8 @@ from .patient import Patient
 from .record import Record
 from .treatment import Treatment
 from .payment import Payment
+from .record_snapshot import RecordSnapshot
+from .money import Money
+from .ledger import Ledger, LedgerEntry
 
-__all__ = ['Doctor', 'Patient', 'Record', 'Treatment', 'Payment']
+__all__ = ['Doctor', 'Patient', 'Record', 'Treatment', 'Payment', 'RecordSnapshot', 'Money', 'Ledger', 'LedgerEntry']
@@ -1,15 +1,18 @@
 import sqlite3
 from database.connection import get_db_connection
-from models.helper import handle_date_time
+from models.helper import handle_date_time, prefix_search, normalize_phone, looks_like_phone
+from models.money import Money
 
 
 class Doctor:
-    def __init__(self, id=None, name=None, phone=None, created_at=None, deleted_at=None):
+    def __init__(self, id=None, name=None, phone=None, created_at=None, deleted_at=None,
+                 phone_normalized=None):
         self.id = id
         self.name = name
         self.phone = phone
         self.created_at = handle_date_time(created_at)
         self.deleted_at = handle_date_time(deleted_at)
+        self.phone_normalized = phone_normalized
 
     @classmethod
     def create(cls, name, phone=None):
@@ -17,8 +20,8 @@ class Doctor:
         cursor = conn.cursor()
         try:
             cursor.execute(
-                "INSERT INTO doctors (name, phone) VALUES (?, ?)",
-                (name, phone)
+                "INSERT INTO doctors (name, phone, phone_normalized) VALUES (?, ?, ?)",
+                (name, phone, normalize_phone(phone) or None)
             )
             conn.commit()
             return cls.get_by_id(cursor.lastrowid)
@@ -62,8 +65,8 @@ class Doctor:
             updates.append("name = ?")
             params.append(name)
         if phone is not None:
-            updates.append("phone = ?")
-            params.append(phone)
+            updates.append("phone = ?, phone_normalized = ?")
+            params.extend((phone, normalize_phone(phone) or None))
 
         if not updates:
             return cls.get_by_id(doctor_id)
@@ -127,17 +130,44 @@ class Doctor:
 
     @classmethod
     def search(cls, search_term):
+        """Active doctors whose name, or phone digits when the term is a number, contain search_term"""
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "SELECT * FROM doctors WHERE (name LIKE ? OR phone LIKE ?) AND deleted_at IS NULL",
-                (f"%{search_term}%", f"%{search_term}%")
-            )
+            if looks_like_phone(search_term):
+                cursor.execute(
+                    "SELECT * FROM doctors WHERE phone_normalized LIKE ? AND deleted_at IS NULL",
+                    (f"%{normalize_phone(search_term)}%",)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM doctors WHERE name LIKE ? AND deleted_at IS NULL",
+                    (f"%{search_term}%",)
+                )
             return [cls(**row) for row in cursor.fetchall()]
         finally:
             conn.close()
 
+    @classmethod
+    def get_by_phone(cls, phone):
+        """The doctor with this number in any formatting, or None; one probe of the phone_normalized index"""
+        digits = normalize_phone(phone)
+        if not digits:
+            return None
+        conn = get_db_connection()
+        try:
+            row = conn.execute(
+                "SELECT * FROM doctors WHERE phone_normalized = ?", (digits,)
+            ).fetchone()
+            return cls(**row) if row else None
+        finally:
+            conn.close()
+
+    @classmethod
+    def search_prefix(cls, prefix, limit=20):
+        """Type-ahead lookup: up to limit doctors whose name or phone starts with prefix"""
+        return prefix_search(cls, 'doctors', prefix, limit)
+
     @classmethod
     def records(cls, doctor_id):
         conn = get_db_connection()
@@ -172,7 +202,7 @@ class Doctor:
                 treatment_data = {
                     'id': row['treatment_id'],
                     'name': row['treatment_name'],
-                    'cost': row['cost'],
+                    'cost': Money.from_cents(row['cost']),
                     'date': row['treatment_date'],
                     'notes': row['treatment_notes'],
                     'record_id': row['id']
@@ -205,7 +235,7 @@ class Doctor:
                 record_data = {k: v for k, v in row.items() if not k.startswith('payment_')}
                 payment_data = {
                     'id': row['payment_id'],
-                    'amount': row['amount'],
+                    'amount': Money.from_cents(row['amount']),
                     'date': row['payment_date'],
                     'notes': row['payment_notes'],
                     'record_id': row['id']
@@ -1,13 +1,80 @@
+import re
+import sqlite3
 from datetime import datetime, date
+from functools import lru_cache
+
+from database.connection import get_db_connection
+
+
+def parse_date_time(text):
+    """Parse an ISO date/time string ('T' or space separator, optional fractions); None if invalid"""
+    try:
+        return datetime.fromisoformat(text)
+    except (ValueError, TypeError):
+        return None
+
+
+# Calendar dates repeat heavily across rows, so they are memoized; timestamps
+# are nearly all distinct and a cache would only add overhead
+@lru_cache(maxsize=8192)
+def parse_date(text):
+    """Parse an ISO date, or the date part of an ISO date/time string; None if invalid"""
+    try:
+        return date.fromisoformat(text)
+    except (ValueError, TypeError):
+        handled_date = parse_date_time(text)
+        return handled_date.date() if handled_date else None
+
+
+# Text that reads as a phone number rather than a name: digits and the formatting around them
+PHONE_LIKE = re.compile(r"^[\d+\-\s().\/]+$")
+
+
+def normalize_phone(phone):
+    """Digits of a phone number, as stored in phone_normalized; '' when there are none"""
+    return re.sub(r"\D", "", phone or "")
+
+
+def looks_like_phone(text):
+    return bool(text and PHONE_LIKE.match(text) and normalize_phone(text))
+
+
+def prefix_search(model, table, prefix, limit):
+    """Active rows whose name, or failing that phone, starts with prefix; at most limit rows.
+
+    Name matches use LIKE against the NOCASE name index and come back already in
+    name order. Phone matches compare digits only, with a GLOB on the
+    phone_normalized unique index, so "010-12" finds "0101 234 567". The two are
+    separate queries because an OR of them would scan the table.
+    """
+    prefix = (prefix or "").strip()
+    conn = get_db_connection()
+    try:
+        like = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = conn.execute(f"""
+            SELECT * FROM {table}
+            WHERE name LIKE ? ESCAPE '\\' AND deleted_at IS NULL
+            ORDER BY name COLLATE NOCASE
+            LIMIT ?
+        """, (like, limit)).fetchall()
+        digits = normalize_phone(prefix)
+        if digits and len(rows) < limit:
+            seen = {row['id'] for row in rows}
+            rows += [row for row in conn.execute(f"""
+                SELECT * FROM {table}
+                WHERE phone_normalized GLOB ? AND deleted_at IS NULL
+                ORDER BY phone_normalized
+                LIMIT ?
+            """, (digits + '*', limit)).fetchall() if row['id'] not in seen][:limit - len(rows)]
+        return [model(**row) for row in rows]
+    finally:
+        conn.close()
 
 
 # Handle date time conversion
 def handle_date_time(date_time_value):
     if isinstance(date_time_value, str):
-        try:
-            handled_date = datetime.strptime(date_time_value, "%Y-%m-%d %H:%M:%S")
-        except (ValueError, TypeError):
-            handled_date = None
+        handled_date = parse_date_time(date_time_value)
     elif isinstance(date_time_value, datetime):
         handled_date = date_time_value
     else:
@@ -18,10 +85,7 @@ def handle_date_time(date_time_value):
 # Handle date conversion
 def handle_date(date_value):
     if isinstance(date_value, str):
-        try:
-            handled_date = datetime.strptime(date_value, "%Y-%m-%d").date()
-        except (ValueError, TypeError):
-            handled_date = None
+        handled_date = parse_date(date_value)
     elif isinstance(date_value, datetime):
         handled_date = date_value.date()
     elif isinstance(date_value, date):
@@ -29,3 +93,39 @@ def handle_date(date_value):
     else:
         handled_date = None
     return handled_date
+
+
+def require_date(date_value):
+    """handle_date for a value that must be a date; raises ValueError otherwise"""
+    handled_date = handle_date(date_value)
+    if handled_date is None:
+        raise ValueError(f"Invalid date: {date_value!r}")
+    return handled_date
+
+
+def convert_date(value):
+    """sqlite3 converter for DATE columns; unparseable text is passed through"""
+    text = value.decode()
+    return parse_date(text) or text
+
+
+def convert_date_time(value):
+    """sqlite3 converter for DATETIME/TIMESTAMP columns; unparseable text is passed through"""
+    text = value.decode()
+    return parse_date_time(text) or text
+
+
+def register_converters():
+    """Register date adapters/converters and have new connections return typed date columns.
+
+    Replaces sqlite3's default "date"/"timestamp" converters, which reject the
+    'T' separator and raise on bad values instead of passing them through.
+    """
+    from database import connection
+
+    sqlite3.register_adapter(date, date.isoformat)
+    sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+    sqlite3.register_converter("DATE", convert_date)
+    sqlite3.register_converter("DATETIME", convert_date_time)
+    sqlite3.register_converter("TIMESTAMP", convert_date_time)
+    connection.DETECT_TYPES = sqlite3.PARSE_DECLTYPES
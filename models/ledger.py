@@ -0,0 +1,112 @@
+from database.connection import get_db_connection
+from models.helper import handle_date
+from models.money import Money
+
+# Position in the tuple is the tie-break on a shared date: treatments before payments
+KINDS = ('treatment', 'payment')
+
+LEDGER_PAGE_SQL = """
+    WITH entries AS (
+        SELECT 0 AS kind, id, COALESCE(date, '') AS date, name AS description,
+               cost AS debit, 0 AS credit, notes
+        FROM treatments
+        WHERE record_id = :record_id
+        UNION ALL
+        SELECT 1, id, COALESCE(date, ''), NULL, 0, amount, notes
+        FROM payments
+        WHERE record_id = :record_id
+    ),
+    page AS (
+        SELECT * FROM entries
+        WHERE (date, kind, id) > (:date, :kind, :id)
+        ORDER BY date, kind, id
+        LIMIT :limit
+    )
+    SELECT kind, id, date, description, debit, credit, notes,
+           :opening + SUM(debit - credit) OVER (ORDER BY date, kind, id
+                                                ROWS UNBOUNDED PRECEDING) AS balance
+    FROM page
+    ORDER BY date, kind, id
+"""
+
+
+class LedgerEntry:
+    """One treatment (debit) or payment (credit) with the balance after it"""
+
+    def __init__(self, kind=None, id=None, date=None, description=None, debit=0, credit=0,
+                 notes=None, balance=0):
+        self.kind = KINDS[kind] if isinstance(kind, int) else kind
+        self.id = id
+        # Sort key as the SQL sees it: the stored text, not the parsed date
+        day = date.isoformat() if hasattr(date, 'isoformat') else (date or '')
+        self.key = (day, KINDS.index(self.kind), id or 0)
+        self.date = handle_date(date)
+        self.description = description
+        self.debit = Money.from_cents(debit)
+        self.credit = Money.from_cents(credit)
+        self.notes = notes
+        self.balance = Money.from_cents(balance)
+
+
+class Ledger:
+    """A record's treatments and payments in date order with a running balance.
+
+    Rows are fetched a page at a time. Each page continues from the last loaded
+    entry, so the balance column only has to be summed over the new page.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, record_id):
+        self.record_id = record_id
+        self.entries = []
+        self.complete = False
+
+    @property
+    def balance(self):
+        return self.entries[-1].balance if self.entries else Money()
+
+    def fetch(self, limit=PAGE_SIZE):
+        """Load the next page of entries; returns the entries that were added"""
+        if self.complete:
+            return []
+        date, kind, id = self.entries[-1].key if self.entries else ('', -1, 0)
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(LEDGER_PAGE_SQL, {
+                'record_id': self.record_id,
+                'date': date,
+                'kind': kind,
+                'id': id,
+                'limit': limit,
+                'opening': self.balance.cents,
+            })
+            entries = [LedgerEntry(*row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+        self.entries.extend(entries)
+        self.complete = limit < 0 or len(entries) < limit
+        return entries
+
+    @classmethod
+    def load(cls, record_id):
+        """The whole ledger of a record; a negative LIMIT is no limit in SQLite"""
+        ledger = cls(record_id)
+        ledger.fetch(limit=-1)
+        return ledger
+
+    @classmethod
+    def from_rows(cls, record_id, treatments, payments):
+        """Build the ledger from rows already in memory, such as a complete RecordSnapshot"""
+        entries = [LedgerEntry('treatment', t.id, t.date, t.name, t.cost or 0, 0, t.notes) for t in treatments]
+        entries += [LedgerEntry('payment', p.id, p.date, None, 0, p.amount or 0, p.notes) for p in payments]
+        entries.sort(key=lambda entry: entry.key)
+        balance = Money()
+        for entry in entries:
+            balance += entry.debit - entry.credit
+            entry.balance = balance
+        ledger = cls(record_id)
+        ledger.entries = entries
+        ledger.complete = True
+        return ledger
@@ -0,0 +1,105 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+CENT = Decimal('0.01')
+
+
+class Money:
+    """An exact amount of money held as integer minor units (cents).
+
+    This is how cost and amount columns are stored, so SQL SUM() over them is exact.
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        if isinstance(cents, bool) or not isinstance(cents, int):
+            raise TypeError("Money takes integer cents; use Money.of() for decimal amounts")
+        self.cents = cents
+
+    @classmethod
+    def of(cls, value):
+        """Money from a decimal amount such as '12.50', 12.5 or Decimal('12.50')"""
+        if isinstance(value, Money):
+            return value
+        try:
+            amount = Decimal(str(value).strip())
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"Invalid amount: {value!r}")
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        return cls(int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    @classmethod
+    def from_cents(cls, value):
+        """Money from a stored cents column; None and Money pass through"""
+        if value is None or isinstance(value, Money):
+            return value
+        return cls(int(value))
+
+    @property
+    def amount(self):
+        return Decimal(self.cents) * CENT
+
+    def __str__(self):
+        return f"{self.amount:.2f}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        return format(self.amount, spec) if spec else str(self)
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    @staticmethod
+    def _cents_of(other):
+        if isinstance(other, Money):
+            return other.cents
+        if other == 0:
+            # Lets sum() start from 0 and balances compare against 0
+            return 0
+        return NotImplemented
+
+    def __add__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else Money(self.cents + cents)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else Money(self.cents - cents)
+
+    def __rsub__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else Money(cents - self.cents)
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __eq__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else self.cents == cents
+
+    def __lt__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else self.cents < cents
+
+    def __le__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else self.cents <= cents
+
+    def __gt__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else self.cents > cents
+
+    def __ge__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is NotImplemented else self.cents >= cents
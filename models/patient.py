@@ -1,12 +1,15 @@
+import difflib
 import sqlite3
 from database.connection import get_db_connection
-from models.helper import handle_date_time, handle_date
+from models.helper import handle_date_time, handle_date, prefix_search, normalize_phone, looks_like_phone
+from models.money import Money
 from datetime import date
 
 
 class Patient:
     def __init__(self, id=None, name=None, phone=None, gender=None,
-                 birth_date=None, notes=None, created_at=None, deleted_at=None):
+                 birth_date=None, notes=None, created_at=None, deleted_at=None,
+                 phone_normalized=None):
         self.id = id
         self.name = name
         self.phone = phone
@@ -15,6 +18,7 @@ class Patient:
         self.notes = notes
         self.created_at = handle_date_time(created_at)
         self.deleted_at = handle_date_time(deleted_at)
+        self.phone_normalized = phone_normalized
 
     @classmethod
     def create(cls, name, phone, gender=None, birth_date=None, notes=None):
@@ -24,9 +28,9 @@ class Patient:
             birth_date = handle_date(birth_date)
             cursor.execute(
                 """INSERT INTO patients 
-                (name, phone, gender, birth_date, notes) 
-                VALUES (?, ?, ?, ?, ?)""",
-                (name, phone, gender, birth_date, notes)
+                (name, phone, phone_normalized, gender, birth_date, notes) 
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (name, phone, normalize_phone(phone) or None, gender, birth_date, notes)
             )
             conn.commit()
             return cls.get_by_id(cursor.lastrowid)
@@ -71,8 +75,8 @@ class Patient:
             updates.append("name = ?")
             params.append(name)
         if phone is not None:
-            updates.append("phone = ?")
-            params.append(phone)
+            updates.append("phone = ?, phone_normalized = ?")
+            params.extend((phone, normalize_phone(phone) or None))
         if gender is not None:
             updates.append("gender = ?")
             params.append(gender)
@@ -148,17 +152,104 @@ class Patient:
 
     @classmethod
     def search(cls, search_term):
+        """Active patients whose name, or phone digits when the term is a number, contain search_term"""
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute(
-                "SELECT * FROM patients WHERE (name LIKE ? OR phone LIKE ?) AND deleted_at IS NULL",
-                (f"%{search_term}%", f"%{search_term}%")
-            )
+            if looks_like_phone(search_term):
+                cursor.execute(
+                    "SELECT * FROM patients WHERE phone_normalized LIKE ? AND deleted_at IS NULL",
+                    (f"%{normalize_phone(search_term)}%",)
+                )
+            else:
+                cursor.execute(
+                    "SELECT * FROM patients WHERE name LIKE ? AND deleted_at IS NULL",
+                    (f"%{search_term}%",)
+                )
             return [cls(**row) for row in cursor.fetchall()]
         finally:
             conn.close()
 
+    @classmethod
+    def get_by_phone(cls, phone):
+        """The patient with this number in any formatting, or None; one probe of the phone_normalized index"""
+        digits = normalize_phone(phone)
+        if not digits:
+            return None
+        conn = get_db_connection()
+        try:
+            row = conn.execute(
+                "SELECT * FROM patients WHERE phone_normalized = ?", (digits,)
+            ).fetchone()
+            return cls(**row) if row else None
+        finally:
+            conn.close()
+
+    @classmethod
+    def search_prefix(cls, prefix, limit=20):
+        """Type-ahead lookup: up to limit patients whose name or phone starts with prefix"""
+        return prefix_search(cls, 'patients', prefix, limit)
+
+    # Similarity (0-1) above which two names are reported as a possible duplicate
+    SIMILAR_NAME_RATIO = 0.85
+    # Names read on each side of the typed one when looking for similar names
+    NAME_NEIGHBOURS = 100
+
+    @classmethod
+    def find_duplicates(cls, name=None, phone=None, exclude_id=None, limit=5):
+        """Active patients that may be the one being entered, as (patient, reason) pairs.
+
+        reason is 'phone' when the number matches once formatting is ignored, or
+        'name' for a close spelling of the name. Both lookups go through indexes:
+        the phone_normalized unique index, and a range scan of the NOCASE name
+        index around the typed name.
+        """
+        matches = []
+        seen = {exclude_id}
+        conn = get_db_connection()
+        try:
+            digits = normalize_phone(phone)
+            if len(digits) >= 7:
+                for row in conn.execute("""
+                    SELECT * FROM patients
+                    WHERE phone_normalized = ? AND deleted_at IS NULL
+                """, (digits,)):
+                    if row['id'] not in seen:
+                        seen.add(row['id'])
+                        matches.append((cls(**row), 'phone'))
+
+            name = " ".join((name or "").split())
+            if len(name) >= 3:
+                # Candidates are the names either side of the typed one in NOCASE
+                # order, which is where a misspelling after the first letters lands
+                candidates = conn.execute(f"""
+                    SELECT * FROM (
+                        SELECT * FROM patients
+                        WHERE name >= ? COLLATE NOCASE AND deleted_at IS NULL
+                        ORDER BY name COLLATE NOCASE
+                        LIMIT {cls.NAME_NEIGHBOURS}
+                    )
+                    UNION ALL
+                    SELECT * FROM (
+                        SELECT * FROM patients
+                        WHERE name < ? COLLATE NOCASE AND deleted_at IS NULL
+                        ORDER BY name COLLATE NOCASE DESC
+                        LIMIT {cls.NAME_NEIGHBOURS}
+                    )
+                """, (name, name)).fetchall()
+                scored = []
+                for row in candidates:
+                    if row['id'] in seen:
+                        continue
+                    matcher = difflib.SequenceMatcher(None, name.lower(), " ".join(row['name'].split()).lower())
+                    if matcher.quick_ratio() >= cls.SIMILAR_NAME_RATIO and matcher.ratio() >= cls.SIMILAR_NAME_RATIO:
+                        scored.append((matcher.ratio(), row))
+                scored.sort(key=lambda item: item[0], reverse=True)
+                matches += [(cls(**row), 'name') for ratio, row in scored]
+            return matches[:limit]
+        finally:
+            conn.close()
+
     @classmethod
     def records(cls, patient_id):
         conn = get_db_connection()
@@ -193,7 +284,7 @@ class Patient:
                 treatment_data = {
                     'id': row['treatment_id'],
                     'name': row['treatment_name'],
-                    'cost': row['cost'],
+                    'cost': Money.from_cents(row['cost']),
                     'date': row['treatment_date'],
                     'notes': row['treatment_notes'],
                     'record_id': row['id']
@@ -226,7 +317,7 @@ class Patient:
                 record_data = {k: v for k, v in row.items() if not k.startswith('payment_')}
                 payment_data = {
                     'id': row['payment_id'],
-                    'amount': row['amount'],
+                    'amount': Money.from_cents(row['amount']),
                     'date': row['payment_date'],
                     'notes': row['payment_notes'],
                     'record_id': row['id']
@@ -1,13 +1,14 @@
 import sqlite3
 from database.connection import get_db_connection
-from models.helper import handle_date
+from models.helper import handle_date, require_date
+from models.money import Money
 
 
 class Payment:
     def __init__(self, id=None, record_id=None, amount=None, date=None, notes=None):
         self.id = id
         self.record_id = record_id
-        self.amount = amount
+        self.amount = Money.from_cents(amount)
         self.date = handle_date(date)
         self.notes = notes
 
@@ -17,11 +18,12 @@ class Payment:
         cursor = conn.cursor()
         try:
             payment_date = handle_date(payment_date)
+            amount = Money.of(amount)
             cursor.execute(
                 """INSERT INTO payments 
                 (record_id, amount, date, notes) 
-                VALUES (?, ?, ?, ?)""",
-                (record_id, amount, payment_date, notes)
+                VALUES (?, ?, COALESCE(?, CURRENT_DATE), ?)""",
+                (record_id, amount.cents, payment_date, notes)
             )
             conn.commit()
             return cls.get_by_id(cursor.lastrowid)
@@ -56,6 +58,38 @@ class Payment:
         conn.close()
         return payments
 
+    @classmethod
+    def between(cls, start=None, end=None, record_id=None, batch_size=500):
+        """Yield payments dated from start to end inclusive, oldest first.
+
+        Either bound may be None. Rows are streamed in batches, so the whole
+        range is never held in memory.
+        """
+        conditions = []
+        params = []
+        if record_id is not None:
+            conditions.append("record_id = ?")
+            params.append(record_id)
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(require_date(start).isoformat())
+        if end is not None:
+            conditions.append("date <= ?")
+            params.append(require_date(end).isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute(f"SELECT * FROM payments {where} ORDER BY date, id", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield cls(**row)
+        finally:
+            conn.close()
+
     @classmethod
     def update(cls, payment_id, amount=None, payment_date=None, notes=None):
         conn = get_db_connection()
@@ -65,8 +99,9 @@ class Payment:
 
         if amount is not None:
             updates.append("amount = ?")
-            params.append(amount)
+            params.append(Money.of(amount).cents)
         if payment_date is not None:
+            payment_date = handle_date(payment_date)
             updates.append("date = ?")
             params.append(payment_date)
         if notes is not None:
@@ -1,8 +1,10 @@
 import sqlite3
 from database.connection import get_db_connection
+from database.archive import archive_connection, archive_exists
 from models.doctor import Doctor
 from models.patient import Patient
 from models.helper import handle_date_time
+from models.money import Money
 
 
 class Record:
@@ -65,11 +67,18 @@ class Record:
     def get_all(cls):
         conn = get_db_connection()
         cursor = conn.cursor()
+        # Totals are aggregated in the same query instead of once per record
         cursor.execute("""
-            SELECT r.*, d.name as doctor_name, p.name as patient_name 
+            SELECT r.*, d.name as doctor_name, p.name as patient_name,
+                   COALESCE(t.total_cost, 0) as total_cost,
+                   COALESCE(pay.total_amount, 0) as total_amount
             FROM records r
             JOIN doctors d ON r.doctor_id = d.id
             JOIN patients p ON r.patient_id = p.id
+            LEFT JOIN (SELECT record_id, SUM(cost) as total_cost
+                       FROM treatments GROUP BY record_id) t ON t.record_id = r.id
+            LEFT JOIN (SELECT record_id, SUM(amount) as total_amount
+                       FROM payments GROUP BY record_id) pay ON pay.record_id = r.id
             ORDER BY r.created_at DESC
         """)
         records = []
@@ -78,14 +87,46 @@ class Record:
                             if k in ['id', 'doctor_id', 'patient_id', 'created_at']})
             record.doctor_name = row['doctor_name']
             record.patient_name = row['patient_name']
-            # Calculate financial data
-            record._total_amount = record.get_total_amount()
-            record._total_cost = record.get_total_cost()
-            record._balance = record.get_balance()
+            # Financial data
+            record._total_amount = Money(row['total_amount'])
+            record._total_cost = Money(row['total_cost'])
+            record._balance = record._total_cost - record._total_amount
             records.append(record)
         conn.close()
         return records
 
+    @classmethod
+    def get_archived(cls):
+        """Records moved to the archive, with their totals; read only"""
+        if not archive_exists():
+            return []
+        with archive_connection() as conn:
+            rows = conn.execute("""
+                SELECT r.id, r.doctor_id, r.patient_id, r.created_at,
+                       d.name as doctor_name, p.name as patient_name,
+                       COALESCE(t.total_cost, 0) as total_cost,
+                       COALESCE(pay.total_amount, 0) as total_amount
+                FROM archive.records r
+                JOIN main.doctors d ON r.doctor_id = d.id
+                JOIN main.patients p ON r.patient_id = p.id
+                LEFT JOIN (SELECT record_id, SUM(cost) as total_cost
+                           FROM archive.treatments GROUP BY record_id) t ON t.record_id = r.id
+                LEFT JOIN (SELECT record_id, SUM(amount) as total_amount
+                           FROM archive.payments GROUP BY record_id) pay ON pay.record_id = r.id
+                -- a copy left by an interrupted archive run; the live record is the real one
+                WHERE r.id NOT IN (SELECT id FROM main.records)
+                ORDER BY r.created_at DESC
+            """).fetchall()
+        records = []
+        for row in rows:
+            record = cls(**{k: row[k] for k in ['id', 'doctor_id', 'patient_id', 'created_at',
+                                                 'doctor_name', 'patient_name']})
+            record.archived = True
+            record._total_amount = Money(row['total_amount'])
+            record._total_cost = Money(row['total_cost'])
+            records.append(record)
+        return records
+
     @classmethod
     def get_by_doctor(cls, doctor_id):
         conn = get_db_connection()
@@ -205,15 +246,28 @@ class Record:
         conn.close()
         return payments
 
+    def _sum(self, column, table):
+        conn = get_db_connection()
+        try:
+            row = conn.execute(
+                f"SELECT COALESCE(SUM({column}), 0) FROM {table} WHERE record_id = ?",
+                (self.id,)
+            ).fetchone()
+            return Money(row[0])
+        finally:
+            conn.close()
+
     def get_total_amount(self):
         """Get total amount paid for this record"""
-        payments = self.payments()
-        return sum(p.amount for p in payments if p.amount)
+        if hasattr(self, '_total_amount'):
+            return self._total_amount
+        return self._sum('amount', 'payments')
 
     def get_total_cost(self):
         """Get total cost of treatments for this record"""
-        treatments = self.treatments()
-        return sum(t.cost for t in treatments if t.cost)
+        if hasattr(self, '_total_cost'):
+            return self._total_cost
+        return self._sum('cost', 'treatments')
 
     def get_balance(self):
         """Get balance (cost - amount paid)"""
@@ -0,0 +1,203 @@
+from datetime import date
+from database.connection import get_db_connection
+from models.record import Record
+from models.treatment import Treatment
+from models.payment import Payment
+from models.money import Money
+from models.ledger import Ledger
+
+
+def _newest_first(item):
+    # Matches ORDER BY date DESC, id DESC when sorted in reverse
+    return (item.date or date.min, item.id or 0)
+
+
+class RecordSnapshot:
+    """A record with its treatments, payments and totals, read in one transaction.
+
+    Totals are kept in memory and patched as rows are added, changed or removed,
+    so callers never need to re-query the record after an edit. A snapshot from
+    load_summary() starts with empty lists and fetches rows a page at a time.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, record, treatments, payments):
+        self.record = record
+        self.treatments = sorted(treatments, key=_newest_first, reverse=True)
+        self.payments = sorted(payments, key=_newest_first, reverse=True)
+        self.total_cost = sum((t.cost for t in self.treatments if t.cost), Money())
+        self.total_paid = sum((p.amount for p in self.payments if p.amount), Money())
+        self.treatment_count = len(self.treatments)
+        self.payment_count = len(self.payments)
+
+    @property
+    def balance(self):
+        return self.total_cost - self.total_paid
+
+    @property
+    def treatments_complete(self):
+        return len(self.treatments) >= self.treatment_count
+
+    @property
+    def payments_complete(self):
+        return len(self.payments) >= self.payment_count
+
+    @property
+    def complete(self):
+        return self.treatments_complete and self.payments_complete
+
+    @classmethod
+    def load_summary(cls, record_id):
+        """Record header and aggregate totals in one query, without any rows"""
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT r.*, d.name as doctor_name, p.name as patient_name,
+                       (SELECT COALESCE(SUM(cost), 0) FROM treatments WHERE record_id = r.id) as total_cost,
+                       (SELECT COUNT(*) FROM treatments WHERE record_id = r.id) as treatment_count,
+                       (SELECT COALESCE(SUM(amount), 0) FROM payments WHERE record_id = r.id) as total_paid,
+                       (SELECT COUNT(*) FROM payments WHERE record_id = r.id) as payment_count
+                FROM records r
+                JOIN doctors d ON r.doctor_id = d.id
+                JOIN patients p ON r.patient_id = p.id
+                WHERE r.id = ?
+                """, (record_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            data = dict(row)
+            snapshot = cls(Record(**{key: data[key] for key in
+                                     ('id', 'doctor_id', 'patient_id', 'created_at', 'doctor_name', 'patient_name')}),
+                           [], [])
+            snapshot.total_cost = Money(data['total_cost'])
+            snapshot.total_paid = Money(data['total_paid'])
+            snapshot.treatment_count = data['treatment_count']
+            snapshot.payment_count = data['payment_count']
+            return snapshot
+        finally:
+            conn.close()
+
+    def fetch_treatments(self, limit=PAGE_SIZE):
+        """Load the next page of treatments; returns the rows that were added"""
+        rows = self._fetch_page('treatments', Treatment, len(self.treatments), limit)
+        self.treatments.extend(rows)
+        return rows
+
+    def fetch_payments(self, limit=PAGE_SIZE):
+        """Load the next page of payments; returns the rows that were added"""
+        rows = self._fetch_page('payments', Payment, len(self.payments), limit)
+        self.payments.extend(rows)
+        return rows
+
+    def _fetch_page(self, table, model, offset, limit):
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT * FROM {table}
+                WHERE record_id = ?
+                ORDER BY date DESC, id DESC
+                LIMIT ? OFFSET ?
+            """, (self.record.id, limit, offset))
+            return [model(**row) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    @classmethod
+    def load(cls, record_id):
+        conn = get_db_connection()
+        try:
+            # One read transaction so the rows and totals are mutually consistent
+            conn.execute("BEGIN")
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT r.*, d.name as doctor_name, p.name as patient_name
+                FROM records r
+                JOIN doctors d ON r.doctor_id = d.id
+                JOIN patients p ON r.patient_id = p.id
+                WHERE r.id = ?
+                """, (record_id,))
+            record_data = cursor.fetchone()
+            if not record_data:
+                return None
+
+            cursor.execute("""
+                SELECT * FROM treatments
+                WHERE record_id = ?
+                ORDER BY date DESC, id DESC
+            """, (record_id,))
+            treatments = [Treatment(**row) for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT * FROM payments
+                WHERE record_id = ?
+                ORDER BY date DESC, id DESC
+            """, (record_id,))
+            payments = [Payment(**row) for row in cursor.fetchall()]
+            conn.commit()
+            return cls(Record(**record_data), treatments, payments)
+        finally:
+            conn.close()
+
+    def copy(self):
+        """Shallow copy that is safe to hand to a worker thread"""
+        snapshot = RecordSnapshot(self.record, list(self.treatments), list(self.payments))
+        snapshot.total_cost, snapshot.total_paid = self.total_cost, self.total_paid
+        snapshot.treatment_count, snapshot.payment_count = self.treatment_count, self.payment_count
+        return snapshot
+
+    def ledger(self):
+        """The loaded rows as a chronological ledger with running balances"""
+        return Ledger.from_rows(self.record.id, self.treatments, self.payments)
+
+    def get_treatment(self, treatment_id):
+        return next((t for t in self.treatments if t.id == treatment_id), None)
+
+    def get_payment(self, payment_id):
+        return next((p for p in self.payments if p.id == payment_id), None)
+
+    def put_treatment(self, treatment):
+        """Insert or replace a treatment.
+
+        Returns its position in the list, or None when it sorts into a page that
+        has not been fetched yet.
+        """
+        self.remove_treatment(treatment.id)
+        self.total_cost += treatment.cost or 0
+        self.treatment_count += 1
+        return self._insert_sorted(self.treatments, treatment, self.treatment_count)
+
+    def remove_treatment(self, treatment_id):
+        treatment = self.get_treatment(treatment_id)
+        if treatment:
+            self.treatments.remove(treatment)
+            self.total_cost -= treatment.cost or 0
+            self.treatment_count -= 1
+        return treatment
+
+    def put_payment(self, payment):
+        """Insert or replace a payment; returns its position or None, as put_treatment"""
+        self.remove_payment(payment.id)
+        self.total_paid += payment.amount or 0
+        self.payment_count += 1
+        return self._insert_sorted(self.payments, payment, self.payment_count)
+
+    def remove_payment(self, payment_id):
+        payment = self.get_payment(payment_id)
+        if payment:
+            self.payments.remove(payment)
+            self.total_paid -= payment.amount or 0
+            self.payment_count -= 1
+        return payment
+
+    @staticmethod
+    def _insert_sorted(items, item, total):
+        key = _newest_first(item)
+        index = next((i for i, other in enumerate(items) if _newest_first(other) < key), len(items))
+        if index == len(items) and len(items) < total - 1:
+            # Past the loaded pages; it will arrive with a later fetch
+            return None
+        items.insert(index, item)
+        return index
@@ -1,6 +1,7 @@
 import sqlite3
 from database.connection import get_db_connection
-from models.helper import handle_date
+from models.helper import handle_date, require_date
+from models.money import Money
 
 
 class Treatment:
@@ -8,7 +9,7 @@ class Treatment:
         self.id = id
         self.record_id = record_id
         self.name = name
-        self.cost = cost
+        self.cost = Money.from_cents(cost)
         self.date = handle_date(date)
         self.notes = notes
 
@@ -18,11 +19,12 @@ class Treatment:
         cursor = conn.cursor()
         try:
             treatment_date = handle_date(treatment_date)
+            cost = Money.of(cost)
             cursor.execute(
                 """INSERT INTO treatments 
                 (record_id, name, cost, date, notes) 
-                VALUES (?, ?, ?, ?, ?)""",
-                (record_id, name, cost, treatment_date, notes)
+                VALUES (?, ?, ?, COALESCE(?, CURRENT_DATE), ?)""",
+                (record_id, name, cost.cents, treatment_date, notes)
             )
             conn.commit()
             return cls.get_by_id(cursor.lastrowid)
@@ -57,6 +59,38 @@ class Treatment:
         conn.close()
         return treatments
 
+    @classmethod
+    def between(cls, start=None, end=None, record_id=None, batch_size=500):
+        """Yield treatments dated from start to end inclusive, oldest first.
+
+        Either bound may be None. Rows are streamed in batches, so the whole
+        range is never held in memory.
+        """
+        conditions = []
+        params = []
+        if record_id is not None:
+            conditions.append("record_id = ?")
+            params.append(record_id)
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(require_date(start).isoformat())
+        if end is not None:
+            conditions.append("date <= ?")
+            params.append(require_date(end).isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute(f"SELECT * FROM treatments {where} ORDER BY date, id", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield cls(**row)
+        finally:
+            conn.close()
+
     @classmethod
     def update(cls, treatment_id, name=None, cost=None, treatment_date=None, notes=None):
         conn = get_db_connection()
@@ -69,7 +103,7 @@ class Treatment:
             params.append(name)
         if cost is not None:
             updates.append("cost = ?")
-            params.append(cost)
+            params.append(Money.of(cost).cents)
         if treatment_date is not None:
             treatment_date = handle_date(treatment_date)
             updates.append("date = ?")
@@ -0,0 +1,157 @@
+"""
+Accounts-receivable aging for DentaSys
+Buckets each record's outstanding balance by the age of its oldest unpaid
+treatment. Payments are applied to treatments oldest first (FIFO), which is
+computed in SQL with a running sum over each owing record's treatments
+"""
+import csv
+from datetime import date
+
+from database.connection import get_db_connection
+from models.helper import handle_date
+from models.money import Money
+
+# (key, first day, last day); the last bucket is open ended
+BUCKETS = (
+    ('0_30', 0, 30),
+    ('31_60', 31, 60),
+    ('61_90', 61, 90),
+    ('90_plus', 91, None),
+)
+
+BUCKET_SQL = "CASE " + " ".join(
+    f"WHEN age_days <= {last} THEN '{key}'" for key, first, last in BUCKETS if last is not None
+) + f" ELSE '{BUCKETS[-1][0]}' END"
+
+# One row per record with a positive balance. Cost and payments are totalled in
+# one grouped pass over treatments, and paid-up records are dropped before any
+# running sum is taken. For the rest, the oldest unpaid treatment is the first
+# date at which the cost to date passes the amount paid; records have only a
+# few treatments, so walking them through the covering (record_id, date, cost)
+# index is cheaper than a window over the whole treatments table.
+AGING_SQL = """
+    WITH totals AS MATERIALIZED (
+        SELECT t.record_id, SUM(t.cost) AS total,
+               (SELECT COALESCE(SUM(amount), 0) FROM payments
+                WHERE payments.record_id = t.record_id) AS paid
+        FROM treatments t
+        {doctor_filter}
+        GROUP BY t.record_id
+    ),
+    unpaid AS MATERIALIZED (
+        SELECT totals.record_id,
+               (SELECT t.date FROM treatments t
+                WHERE t.record_id = totals.record_id
+                  AND (SELECT SUM(earlier.cost) FROM treatments earlier
+                       WHERE earlier.record_id = totals.record_id
+                         AND earlier.date <= t.date) > totals.paid
+                ORDER BY t.date
+                LIMIT 1) AS oldest_unpaid,
+               totals.total - totals.paid AS balance
+        FROM totals
+        WHERE totals.total > totals.paid
+    ),
+    aged AS (
+        SELECT unpaid.*, MAX(0, CAST(julianday(:as_of) - julianday(oldest_unpaid) AS INTEGER)) AS age_days
+        FROM unpaid
+    )
+"""
+
+
+class AgingRow:
+    def __init__(self, record_id=None, doctor_id=None, doctor_name=None, patient_name=None,
+                 balance=0, oldest_unpaid=None, age_days=0, bucket=None):
+        self.record_id = record_id
+        self.doctor_id = doctor_id
+        self.doctor_name = doctor_name
+        self.patient_name = patient_name
+        self.balance = Money.from_cents(balance)
+        self.oldest_unpaid = handle_date(oldest_unpaid)
+        self.age_days = age_days
+        self.bucket = bucket
+
+
+class AgingSummary:
+    def __init__(self):
+        self.totals = {key: Money() for key, first, last in BUCKETS}
+        self.counts = {key: 0 for key, first, last in BUCKETS}
+
+    @property
+    def total(self):
+        return sum(self.totals.values(), Money())
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+
+def _params(doctor_id, as_of):
+    as_of = handle_date(as_of) or date.today()
+    params = {'as_of': as_of.isoformat()}
+    doctor_filter = ""
+    if doctor_id is not None:
+        doctor_filter = "JOIN records r ON r.id = t.record_id WHERE r.doctor_id = :doctor_id"
+        params['doctor_id'] = doctor_id
+    return AGING_SQL.format(doctor_filter=doctor_filter), params
+
+
+def aging(doctor_id=None, as_of=None, limit=None):
+    """Records with an outstanding balance, oldest debt first"""
+    ctes, params = _params(doctor_id, as_of)
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT :limit"
+        params['limit'] = limit
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(f"""
+            {ctes}
+            SELECT aged.record_id, r.doctor_id, d.name, p.name,
+                   aged.balance, aged.oldest_unpaid, aged.age_days, {BUCKET_SQL}
+            FROM aged
+            JOIN records r ON r.id = aged.record_id
+            JOIN doctors d ON d.id = r.doctor_id
+            JOIN patients p ON p.id = r.patient_id
+            ORDER BY aged.age_days DESC, aged.balance DESC
+            {limit_sql}
+        """, params)
+        return [AgingRow(*row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def summary(doctor_id=None, as_of=None):
+    """Outstanding totals and record counts per bucket"""
+    ctes, params = _params(doctor_id, as_of)
+    result = AgingSummary()
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(f"""
+            {ctes}
+            SELECT {BUCKET_SQL} AS bucket, SUM(balance), COUNT(*)
+            FROM aged
+            GROUP BY bucket
+        """, params)
+        for bucket, total, count in cursor.fetchall():
+            result.totals[bucket] = Money(total)
+            result.counts[bucket] = count
+        return result
+    finally:
+        conn.close()
+
+
+def write_csv(rows, filename):
+    """Write aging rows to a CSV file"""
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:  # BOM so Excel reads Arabic names
+        writer = csv.writer(f)
+        writer.writerow(['record_id', 'doctor', 'patient', 'balance', 'oldest_unpaid', 'age_days', 'bucket'])
+        for row in rows:
+            writer.writerow([
+                row.record_id,
+                row.doctor_name or "",
+                row.patient_name or "",
+                str(row.balance),
+                row.oldest_unpaid.isoformat() if row.oldest_unpaid else "",
+                row.age_days,
+                row.bucket,
+            ])
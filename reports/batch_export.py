@@ -0,0 +1,225 @@
+"""
+Batch statement export for DentaSys
+Selects records, prefetches their data in bulk and renders the PDFs across CPU cores
+"""
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, PageBreak
+
+from database.connection import get_db_connection
+from localization.translations import translations
+from models.helper import handle_date
+from reports.record_pdf import ExportCancelled, build_record_pdf, build_story
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+
+class BatchExportSummary:
+    def __init__(self, output, total):
+        self.output = output
+        self.total = total
+        self.exported = 0
+        self.failures = []  # (record, error message) pairs
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+
+def select_records(doctor_id=None, unpaid_only=False, start_date=None, end_date=None):
+    """Find the records to export with a single query.
+
+    A date range keeps records that have a treatment or payment dated inside it.
+    """
+    from models.record import Record
+
+    conditions = []
+    params = []
+    if doctor_id is not None:
+        conditions.append("r.doctor_id = ?")
+        params.append(doctor_id)
+    if unpaid_only:
+        conditions.append("COALESCE(t.total_cost, 0) - COALESCE(p.total_paid, 0) > 0")
+
+    start_date = handle_date(start_date)
+    end_date = handle_date(end_date)
+    if start_date or end_date:
+        range_sql = []
+        range_params = []
+        if start_date:
+            range_sql.append("date >= ?")
+            range_params.append(start_date.isoformat())
+        if end_date:
+            range_sql.append("date <= ?")
+            range_params.append(end_date.isoformat())
+        range_clause = " AND ".join(range_sql)
+        conditions.append(f"""(
+            EXISTS (SELECT 1 FROM treatments WHERE record_id = r.id AND {range_clause})
+            OR EXISTS (SELECT 1 FROM payments WHERE record_id = r.id AND {range_clause})
+        )""")
+        params.extend(range_params + range_params)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(f"""
+            SELECT r.id, r.doctor_id, r.patient_id, r.created_at,
+                   d.name AS doctor_name, pt.name AS patient_name
+            FROM records r
+            JOIN doctors d ON r.doctor_id = d.id
+            JOIN patients pt ON r.patient_id = pt.id
+            LEFT JOIN (SELECT record_id, SUM(cost) AS total_cost
+                       FROM treatments GROUP BY record_id) t ON t.record_id = r.id
+            LEFT JOIN (SELECT record_id, SUM(amount) AS total_paid
+                       FROM payments GROUP BY record_id) p ON p.record_id = r.id
+            {where}
+            ORDER BY d.name, pt.name
+        """, params)
+        return [Record(**row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def prefetch(records):
+    """Load treatments and payments for all records in two bulk queries"""
+    from models.treatment import Treatment
+    from models.payment import Payment
+    from models.record_snapshot import RecordSnapshot
+
+    treatments = {record.id: [] for record in records}
+    payments = {record.id: [] for record in records}
+
+    conn = get_db_connection()
+    try:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS batch_record_ids (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM batch_record_ids")
+        conn.executemany("INSERT INTO batch_record_ids (id) VALUES (?)",
+                         ((record.id,) for record in records))
+
+        for row in conn.execute("""
+            SELECT t.* FROM treatments t
+            JOIN batch_record_ids b ON b.id = t.record_id
+            ORDER BY t.record_id, t.date DESC
+        """):
+            treatments[row['record_id']].append(Treatment(**row))
+
+        for row in conn.execute("""
+            SELECT p.* FROM payments p
+            JOIN batch_record_ids b ON b.id = p.record_id
+            ORDER BY p.record_id, p.date DESC
+        """):
+            payments[row['record_id']].append(Payment(**row))
+    finally:
+        conn.close()
+
+    return [RecordSnapshot(record, treatments[record.id], payments[record.id]) for record in records]
+
+
+def statement_filename(record):
+    """File-system safe PDF name for a record"""
+    name = f"Record_{record.id}_{record.doctor_name}_{record.patient_name}.pdf"
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', name)
+
+
+def render_statement(filename, data, language):
+    """Process-pool worker: render one record's PDF"""
+    translations.current_language = language
+    build_record_pdf(filename, data)
+    return filename
+
+
+def build_merged_pdf(filename, items, progress=None, cancel_event=None):
+    """Render all statements into one document, one record per page run"""
+    story = []
+    for index, data in enumerate(items):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        if index:
+            story.append(PageBreak())
+        story.extend(build_story(data))
+        if progress:
+            progress(0.5 * (index + 1) / len(items))
+
+    doc = SimpleDocTemplate(filename, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
+
+    def on_progress(typ, value):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        if typ == 'PROGRESS' and progress:
+            progress(0.5 + 0.5 * value / max(len(story), 1))
+
+    doc.setProgressCallBack(on_progress)
+    doc.build(story)
+
+
+def export_batch(items, output, merge=False, progress=None, cancel_event=None, max_workers=None):
+    """Render statements for prefetched items into a directory or a single merged PDF.
+
+    Returns a BatchExportSummary; per-record failures are collected rather than raised.
+    """
+    summary = BatchExportSummary(output, len(items))
+    if not items:
+        return summary
+
+    if merge and PdfWriter is None:
+        # Without a PDF merger the whole batch is laid out as one document
+        build_merged_pdf(output, items, progress=progress, cancel_event=cancel_event)
+        summary.exported = len(items)
+        return summary
+
+    if merge:
+        target_dir = tempfile.mkdtemp(prefix='dentasys_batch_')
+    else:
+        target_dir = output
+        os.makedirs(target_dir, exist_ok=True)
+
+    rendered = {}
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(render_statement,
+                                os.path.join(target_dir, statement_filename(data.record)),
+                                data,
+                                translations.get_current_language()): data
+                for data in items
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), start=1):
+                    data = futures[future]
+                    try:
+                        rendered[data.record.id] = future.result()
+                        summary.exported += 1
+                    except Exception as e:
+                        summary.failures.append((data.record, str(e)))
+
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    if progress:
+                        progress((0.9 if merge else 1.0) * done / len(items))
+            except ExportCancelled:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        if merge:
+            writer = PdfWriter()
+            for data in items:
+                if data.record.id in rendered:
+                    writer.append(rendered[data.record.id])
+            with open(output, 'wb') as f:
+                writer.write(f)
+            if progress:
+                progress(1.0)
+    finally:
+        if merge:
+            shutil.rmtree(target_dir, ignore_errors=True)
+
+    return summary
@@ -0,0 +1,134 @@
+"""
+Financial reports for DentaSys
+Revenue, collections and new-patient figures read from the daily_revenue rollup,
+so a report costs one row per day and doctor regardless of how many treatments
+and payments fall in the range
+"""
+import csv
+
+from database.connection import get_db_connection
+from models.helper import handle_date
+from models.money import Money
+
+PERIODS = ('day', 'month', 'year')
+
+# SQL that turns the YYYY-MM-DD day column into the grouping period
+PERIOD_SQL = {
+    'day': "d.day",
+    'month': "substr(d.day, 1, 7)",
+    'year': "substr(d.day, 1, 4)",
+}
+
+
+class RevenueRow:
+    def __init__(self, period=None, doctor_id=None, doctor_name=None, billed=0, collected=0,
+                 treatment_count=0, payment_count=0, new_patients=0):
+        self.period = period
+        self.doctor_id = doctor_id
+        self.doctor_name = doctor_name
+        self.billed = Money.from_cents(billed)
+        self.collected = Money.from_cents(collected)
+        self.treatment_count = treatment_count
+        self.payment_count = payment_count
+        self.new_patients = new_patients
+
+    @property
+    def outstanding(self):
+        """Billed minus collected over the period"""
+        return self.billed - self.collected
+
+
+def _range_filter(start_date, end_date, doctor_id):
+    conditions = []
+    params = []
+    start_date = handle_date(start_date)
+    end_date = handle_date(end_date)
+    if start_date:
+        conditions.append("d.day >= ?")
+        params.append(start_date.isoformat())
+    if end_date:
+        conditions.append("d.day <= ?")
+        params.append(end_date.isoformat())
+    if doctor_id is not None:
+        conditions.append("d.doctor_id = ?")
+        params.append(doctor_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def revenue(start_date=None, end_date=None, period='day', doctor_id=None, by_doctor=True):
+    """Billings, collections and new patients per period (and per doctor), oldest first"""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period: {period}")
+    where, params = _range_filter(start_date, end_date, doctor_id)
+    doctor_columns = "d.doctor_id, doc.name" if by_doctor else "NULL, NULL"
+    group_by = "period, d.doctor_id" if by_doctor else "period"
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.execute(f"""
+            SELECT {PERIOD_SQL[period]} AS period, {doctor_columns},
+                   SUM(d.billed), SUM(d.collected), SUM(d.treatment_count),
+                   SUM(d.payment_count), SUM(d.new_patients)
+            FROM daily_revenue d
+            JOIN doctors doc ON doc.id = d.doctor_id
+            {where}
+            GROUP BY {group_by}
+            ORDER BY period, doc.name
+        """, params)
+        return [RevenueRow(*row) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def summary(start_date=None, end_date=None, doctor_id=None):
+    """Totals over the whole range as a single RevenueRow"""
+    where, params = _range_filter(start_date, end_date, doctor_id)
+    conn = get_db_connection()
+    try:
+        row = conn.execute(f"""
+            SELECT COALESCE(SUM(d.billed), 0), COALESCE(SUM(d.collected), 0),
+                   COALESCE(SUM(d.treatment_count), 0), COALESCE(SUM(d.payment_count), 0),
+                   COALESCE(SUM(d.new_patients), 0)
+            FROM daily_revenue d
+            {where}
+        """, params).fetchone()
+        return RevenueRow(None, doctor_id, None, *row)
+    finally:
+        conn.close()
+
+
+def rebuild():
+    """Recompute the rollup from treatments, payments and records"""
+    from database.migrations import rebuild_daily_revenue
+
+    conn = get_db_connection()
+    try:
+        conn.execute("BEGIN")
+        rebuild_daily_revenue(conn)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def write_csv(rows, filename, headers=None):
+    """Write revenue rows to a CSV file; amounts are written as decimals"""
+    headers = headers or ['period', 'doctor', 'billed', 'collected', 'outstanding',
+                          'treatments', 'payments', 'new_patients']
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:  # BOM so Excel reads Arabic names
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow([
+                row.period,
+                row.doctor_name or "",
+                str(row.billed),
+                str(row.collected),
+                str(row.outstanding),
+                row.treatment_count,
+                row.payment_count,
+                row.new_patients,
+            ])
@@ -0,0 +1,238 @@
+"""
+Record statement PDF generation for DentaSys
+Builds the record details PDF from pre-fetched data so it can run off the Tk thread
+"""
+import os
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from localization.translations import translations
+
+
+class ExportCancelled(Exception):
+    """Raised inside the PDF build when the user cancels the export"""
+
+
+def default_filename(record):
+    """Suggested file name for a record's PDF"""
+    return f"Record_{record.doctor_name}_{record.patient_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+
+def build_record_pdf(filename, data, progress=None, cancel_event=None):
+    """Write the record PDF for a RecordSnapshot to filename.
+
+    progress, if given, is called with a fraction between 0 and 1. Setting
+    cancel_event aborts the build with ExportCancelled and removes the partial file.
+    """
+    def report(fraction):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        if progress:
+            progress(min(max(fraction, 0.0), 1.0))
+
+    try:
+        report(0.0)
+        story = build_story(data, report)
+
+        doc = SimpleDocTemplate(filename, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
+        flowable_total = {'count': len(story) or 1}
+
+        def on_progress(typ, value):
+            # Story preparation covers the first 30%, layout the rest
+            if typ == 'SIZE_EST':
+                flowable_total['count'] = value or 1
+            elif typ == 'PROGRESS':
+                report(0.3 + 0.7 * value / flowable_total['count'])
+            elif typ == 'PAGE':
+                report(0.3)
+
+        doc.setProgressCallBack(on_progress)
+        doc.build(story)
+        report(1.0)
+    except ExportCancelled:
+        if os.path.exists(filename):
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+        raise
+
+
+def build_story(data, report=None):
+    """Build the list of flowables for a RecordSnapshot"""
+    record = data.record
+    story = []
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=20,
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#2c3e50')
+    )
+
+    header_style = ParagraphStyle(
+        'CustomHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        textColor=colors.HexColor('#3498db')
+    )
+
+    # Title
+    story.append(Paragraph(translations.get('record_details'), title_style))
+    story.append(Spacer(1, 0.2*inch))
+
+    # Record Information
+    story.append(Paragraph(translations.get('record_information'), header_style))
+
+    record_info = [
+        [translations.get('col_doctor'), record.doctor_name],
+        [translations.get('col_patient'), record.patient_name],
+        [translations.get('col_created'), record.created_at.strftime("%Y-%m-%d %H:%M") if record.created_at else ""],
+        [translations.get('record_id'), str(record.id)]
+    ]
+
+    record_table = Table(record_info, colWidths=[2*inch, 4*inch])
+    record_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ]))
+
+    story.append(record_table)
+    story.append(Spacer(1, 0.3*inch))
+
+    # Account Summary
+    story.append(Paragraph(translations.get('account_summary'), header_style))
+
+    total_cost = data.total_cost
+    total_paid = data.total_paid
+    balance = data.balance
+
+    summary_info = [
+        [translations.get('total_cost'), f"${total_cost:.2f}"],
+        [translations.get('total_paid'), f"${total_paid:.2f}"],
+        [translations.get('balance'), f"${balance:.2f}"]
+    ]
+
+    summary_table = Table(summary_info, colWidths=[2*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ]))
+
+    # Color code the balance
+    if balance > 0:
+        balance_color = '#e74c3c'
+    elif balance == 0:
+        balance_color = '#27ae60'
+    else:
+        balance_color = '#f39c12'
+    summary_table.setStyle(TableStyle([
+        ('TEXTCOLOR', (1, 2), (1, 2), colors.HexColor(balance_color))
+    ]))
+
+    story.append(summary_table)
+    story.append(Spacer(1, 0.3*inch))
+
+    if report:
+        report(0.1)
+
+    # Ledger: treatments and payments in date order with the balance after each
+    entries = data.ledger().entries
+    if entries:
+        story.append(Paragraph(translations.get('ledger_tab'), header_style))
+
+        ledger_data = [[
+            translations.get('col_date'),
+            translations.get('col_type'),
+            translations.get('col_description'),
+            translations.get('col_debit'),
+            translations.get('col_credit'),
+            translations.get('col_balance'),
+            translations.get('col_notes')
+        ]]
+
+        for entry in entries:
+            ledger_data.append([
+                entry.date.strftime("%Y-%m-%d") if entry.date else "",
+                translations.get(f'entry_{entry.kind}'),
+                entry.description or "",
+                f"${entry.debit:.2f}" if entry.kind == 'treatment' else "",
+                f"${entry.credit:.2f}" if entry.kind == 'payment' else "",
+                f"${entry.balance:.2f}",
+                entry.notes or ""
+            ])
+
+        ledger_table = Table(ledger_data, colWidths=[0.9*inch, 0.8*inch, 1.5*inch, 0.85*inch, 0.85*inch,
+                                                     0.9*inch, 1.4*inch],
+                             repeatRows=1)
+        ledger_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (0, 0), (1, -1), 'CENTER'),  # Date and type columns center
+            ('ALIGN', (3, 0), (5, -1), 'RIGHT'),   # Money columns right
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTNAME', (5, 1), (5, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')])
+        ]))
+
+        story.append(ledger_table)
+
+    if report:
+        report(0.2)
+
+    # Footer
+    story.append(Spacer(1, 0.3*inch))
+    footer_text = f"{translations.get('generated_on')}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    story.append(Paragraph(footer_text, ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#7f8c8d')
+    )))
+
+    if report:
+        report(0.3)
+
+    return story
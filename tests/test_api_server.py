@@ -0,0 +1,64 @@
+"""
+Tests for the DentaSys server
+Starts ApiServer on a free localhost port over an in-memory database and
+calls it through ApiClient, as a GUI client would
+"""
+import asyncio
+import threading
+import unittest
+
+from api.client import ApiClient
+from api.server import ApiServer, prepare_database
+from database import config
+from models.doctor import Doctor
+
+
+class ApiServerTest(unittest.TestCase):
+    def setUp(self):
+        self.database = config.database_at(config.MEMORY)
+        self.database.__enter__()
+        prepare_database()
+
+        self.loop = asyncio.new_event_loop()
+        self.server = ApiServer(port=0)
+        self.loop.run_until_complete(self.server.start())
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.client = ApiClient(f"127.0.0.1:{self.server.port}", timeout=10)
+
+    def tearDown(self):
+        self.client.close()
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+        self.loop.close()
+        self.database.__exit__(None, None, None)
+
+    def test_write_then_read(self):
+        doctor, _ = self.client.call('Doctor.create', ("Dr. Salma Haddad", "0944 123 456"))
+        self.assertIsInstance(doctor, Doctor)
+        self.assertIsNotNone(doctor.id)
+
+        found, _ = self.client.call('Doctor.get_by_id', (doctor.id,))
+        self.assertEqual(found.name, "Dr. Salma Haddad")
+        self.assertEqual(found.phone_normalized, "0944123456")
+        by_phone, _ = self.client.call('Doctor.get_by_phone', ("+0944-123-456",))
+        self.assertEqual(by_phone.id, doctor.id)
+
+    def test_value_error_is_raised_again_on_the_client(self):
+        self.client.call('Doctor.create', ("Dr. Omar Nasser", "0933 000 111"))
+        with self.assertRaises(ValueError):
+            self.client.call('Doctor.create', ("Dr. Omar Nasser", "0933 000 222"))
+
+        # The failed write must not keep the write lock
+        doctor, _ = self.client.call('Doctor.create', ("Dr. Lina Saleh", "0933 000 333"))
+        self.assertEqual(doctor.name, "Dr. Lina Saleh")
+
+    def test_unknown_operation(self):
+        status, data = self.client.request('POST', '/api/Doctor.drop_everything')
+        self.assertEqual(status, 404)
+        self.assertIn('Unknown operation', data['error']['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
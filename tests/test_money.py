@@ -0,0 +1,157 @@
+"""
+Tests for models.money and the money_to_cents migration
+The migration runs on an in-memory database laid out as before it, with
+REAL cost and amount columns
+"""
+import unittest
+from decimal import Decimal
+
+from database import config
+from database.connection import get_db_connection
+from database.migrations import column_type
+from database.schema import create_schema
+from models.money import Money
+
+# treatments and payments as they were before money_to_cents
+REAL_MONEY_SCHEMA_SQL = """
+CREATE TABLE doctors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    phone TEXT UNIQUE,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    deleted_at DATETIME
+);
+CREATE TABLE patients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    phone TEXT UNIQUE NOT NULL,
+    gender TEXT CHECK(gender IN ('Male', 'Female')),
+    birth_date DATE,
+    notes TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    deleted_at DATETIME
+);
+CREATE TABLE records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doctor_id INTEGER NOT NULL,
+    patient_id INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (doctor_id) REFERENCES doctors(id),
+    FOREIGN KEY (patient_id) REFERENCES patients(id),
+    UNIQUE(doctor_id, patient_id)
+);
+CREATE TABLE treatments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    cost REAL NOT NULL,
+    date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT,
+    FOREIGN KEY (record_id) REFERENCES records(id)
+);
+CREATE TABLE payments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT,
+    FOREIGN KEY (record_id) REFERENCES records(id)
+);
+"""
+
+
+class MoneyTest(unittest.TestCase):
+    def test_of_rounds_half_up_to_cents(self):
+        self.assertEqual(Money.of('100.555').cents, 10056)
+        self.assertEqual(Money.of('100.554').cents, 10055)
+        self.assertEqual(Money.of('-1.005').cents, -101)
+        self.assertEqual(Money.of(0.1).cents, 10)
+        self.assertEqual(Money.of(Decimal('12.50')).cents, 1250)
+        self.assertEqual(Money.of(' 7 ').cents, 700)
+
+    def test_of_rejects_what_is_not_an_amount(self):
+        for value in ('', 'abc', '12,50', 'NaN', 'Infinity', None):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                Money.of(value)
+
+    def test_takes_only_integer_cents(self):
+        for value in (1.5, '150', True):
+            with self.subTest(value=value), self.assertRaises(TypeError):
+                Money(value)
+
+    def test_comparison(self):
+        self.assertEqual(Money.of('10.00'), Money(1000))
+        self.assertEqual(hash(Money.of('10.00')), hash(Money(1000)))
+        self.assertLess(Money(999), Money(1000))
+        self.assertGreater(Money(1), 0)
+        self.assertLessEqual(Money(0), 0)
+        self.assertEqual(Money(), 0)
+        # Only zero compares with plain numbers; 1 could mean a unit or a cent
+        self.assertNotEqual(Money(100), 1)
+        with self.assertRaises(TypeError):
+            Money(100) < 1
+
+    def test_arithmetic(self):
+        self.assertEqual(sum([Money(1), Money(2), Money(3)]), Money(6))
+        self.assertEqual(Money(500) - Money(125), Money(375))
+        self.assertEqual(-Money(5), Money(-5))
+        self.assertFalse(Money(0))
+        self.assertEqual(float(Money(150)), 1.5)
+
+    def test_formatting(self):
+        self.assertEqual(str(Money(10056)), '100.56')
+        self.assertEqual(str(Money(5)), '0.05')
+        self.assertEqual(str(Money(-5)), '-0.05')
+        self.assertEqual(repr(Money(10056)), "Money('100.56')")
+        self.assertEqual(f"{Money(123456)}", '1234.56')
+        self.assertEqual(f"{Money(123456):,.2f}", '1,234.56')
+        self.assertEqual(Money(10056).amount, Decimal('100.56'))
+
+
+class MoneyToCentsMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.database = config.database_at(config.MEMORY)
+        self.database.__enter__()
+
+    def tearDown(self):
+        self.database.__exit__(None, None, None)
+
+    def test_real_amounts_become_integer_cents(self):
+        conn = get_db_connection()
+        try:
+            conn.executescript(REAL_MONEY_SCHEMA_SQL)
+            conn.execute("INSERT INTO doctors (name, phone) VALUES ('Dr. Rami Khoury', '0944 111 222')")
+            conn.execute("INSERT INTO patients (name, phone) VALUES ('Hala Aziz', '0933 333 444')")
+            conn.execute("INSERT INTO records (doctor_id, patient_id) VALUES (1, 1)")
+            # 0.29 * 100 is 28.999999999999996 as a float: truncating would lose a cent
+            conn.executemany("INSERT INTO treatments (record_id, name, cost, date) VALUES (1, ?, ?, '2024-03-01 10:00:00')",
+                             [('Filling', 0.29), ('Crown', 1250.5), ('Cleaning', 19.99)])
+            conn.executemany("INSERT INTO payments (record_id, amount, date) VALUES (1, ?, '2024-03-02 09:30:00')",
+                             [(100.1,), (0.3,)])
+            conn.commit()
+        finally:
+            conn.close()
+
+        create_schema()
+
+        conn = get_db_connection()
+        try:
+            self.assertEqual(column_type(conn, 'treatments', 'cost'), 'INTEGER')
+            self.assertEqual(column_type(conn, 'payments', 'amount'), 'INTEGER')
+            costs = conn.execute("SELECT cost, typeof(cost) FROM treatments ORDER BY id").fetchall()
+            amounts = conn.execute("SELECT amount, typeof(amount) FROM payments ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        self.assertEqual([tuple(row) for row in costs],
+                         [(29, 'integer'), (125050, 'integer'), (1999, 'integer')])
+        self.assertEqual([tuple(row) for row in amounts], [(10010, 'integer'), (30, 'integer')])
+
+        from models.record import Record
+        record = Record.get_by_id(1)
+        self.assertEqual(record.cost(), Money.of('1270.78'))
+        self.assertEqual(record.amount(), Money.of('100.40'))
+        self.assertEqual(record.balance(), Money.of('1170.38'))
+
+
+if __name__ == '__main__':
+    unittest.main()